@@ -0,0 +1,78 @@
+"""
+Benchmark of `protobuf_to_pydantic.contrib.proto_parser`.
+
+Report the fixed overhead of each parsed file and the parse time per KB of the
+Protobuf files in the example dir, run it in the root dir of the project:
+
+    python benchmark/proto_parser_benchmark.py
+"""
+
+import pathlib
+import timeit
+from typing import List, Tuple
+
+from lark import Lark
+
+from protobuf_to_pydantic.contrib.proto_parser import (
+    BNF,
+    ProtoTransformer,
+    get_parser,
+    parse,
+)
+
+EMPTY_PROTO = 'syntax = "proto3";\n'
+NUMBER = 20
+
+
+def _get_proto_list() -> List[Tuple[str, str]]:
+    proto_list = []
+    for path in sorted(pathlib.Path("example").glob("**/*.proto")):
+        content = path.read_text()
+        try:
+            parse(content)
+        except Exception:
+            # The grammar does not support all the syntax of Protobuf
+            continue
+        proto_list.append((str(path), content))
+    return proto_list
+
+
+def _timeit(func: object, number: int = NUMBER) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number  # type: ignore
+
+
+def _parse_without_cache(content: str) -> None:
+    # The way of parsing before the parser was cached
+    tree = Lark(BNF, start="proto", parser="lalr").parse(content)
+    ProtoTransformer().transform(tree)
+
+
+def main() -> None:
+    get_parser()
+    proto_list = _get_proto_list()
+    content_list = [content for _, content in proto_list]
+    total_kb = sum(len(content.encode()) for content in content_list) / 1024
+
+    uncached_fixed_time = _timeit(lambda: _parse_without_cache(EMPTY_PROTO), 2)
+    uncached_total_time = _timeit(
+        lambda: [_parse_without_cache(content) for content in content_list], 2
+    )
+    fixed_time = _timeit(lambda: parse(EMPTY_PROTO))
+    total_time = _timeit(lambda: [parse(content) for content in content_list])
+
+    print(f"{len(proto_list)} files, {total_kb:.1f} KB")
+    print(f"{'':<28}{'uncached (ms)':>16}{'cached (ms)':>16}")
+    for name, uncached_time, cached_time in (
+        ("fixed overhead per file", uncached_fixed_time, fixed_time),
+        ("all files", uncached_total_time, total_time),
+        (
+            "parse time per KB",
+            (uncached_total_time - uncached_fixed_time * len(proto_list)) / total_kb,
+            (total_time - fixed_time * len(proto_list)) / total_kb,
+        ),
+    ):
+        print(f"{name:<28}{uncached_time * 1000:>16.3f}{cached_time * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,9 +28,6 @@ from protobuf_to_pydantic.customer_validator.v2 import (
     duration_lt_validator,
     duration_not_in_validator,
     in_validator,
-    len_validator,
-    map_max_pairs_validator,
-    map_min_pairs_validator,
     not_contains_validator,
     not_in_validator,
     prefix_validator,
@@ -1139,8 +1136,8 @@ class MapTest(ProtobufCompatibleBaseModel):
         alias_priority=1,
         validation_alias="pairTest",
         serialization_alias="pairTest",
-        map_min_pairs=1,
-        map_max_pairs=5,
+        min_length=1,
+        max_length=5,
     )
     keys_test: typing.Dict[typing_extensions.Annotated[str, MinLen(min_length=1), MaxLen(max_length=5)], int] = Field(
         default_factory=dict, alias_priority=1, validation_alias="keysTest", serialization_alias="keysTest"
@@ -1206,13 +1203,6 @@ class MapTest(ProtobufCompatibleBaseModel):
         customer_int=1,
     )
 
-    pair_test_map_min_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_min_pairs_validator
-    )
-    pair_test_map_max_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_max_pairs_validator
-    )
-
 
 class MessageIgnoredTest(ProtobufCompatibleBaseModel):
     model_config = ConfigDict(
@@ -1267,7 +1257,12 @@ class StringTest(ProtobufCompatibleBaseModel):
         default="", alias_priority=1, validation_alias="constTest", serialization_alias="constTest"
     )
     len_test: str = Field(
-        default="", alias_priority=1, validation_alias="lenTest", serialization_alias="lenTest", len=3
+        default="",
+        alias_priority=1,
+        validation_alias="lenTest",
+        serialization_alias="lenTest",
+        min_length=3,
+        max_length=3,
     )
     s_range_len_test: str = Field(
         default="",
@@ -1278,10 +1273,10 @@ class StringTest(ProtobufCompatibleBaseModel):
         max_length=3,
     )
     pattern_test: str = Field(
-        default="", alias_priority=1, validation_alias="patternTest", serialization_alias="patternTest"
+        default="", alias_priority=1, validation_alias="patternTest", serialization_alias="patternTest", pattern="^test"
     )
     prefix_test: str = Field(
-        default="", alias_priority=1, validation_alias="prefixTest", serialization_alias="prefixTest", prefix="prefix"
+        default="", alias_priority=1, validation_alias="prefixTest", serialization_alias="prefixTest", pattern="^prefix"
     )
     suffix_test: str = Field(
         default="", alias_priority=1, validation_alias="suffixTest", serialization_alias="suffixTest", suffix="suffix"
@@ -1291,7 +1286,7 @@ class StringTest(ProtobufCompatibleBaseModel):
         alias_priority=1,
         validation_alias="containsTest",
         serialization_alias="containsTest",
-        contains="contains",
+        pattern="contains",
     )
     not_contains_test: str = Field(
         default="",
@@ -1386,12 +1381,7 @@ class StringTest(ProtobufCompatibleBaseModel):
         customer_int=1,
     )
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
-    prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
-    contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
-        contains_validator
-    )
     not_contains_test_not_contains_validator = field_validator("not_contains_test", mode="after", check_fields=None)(
         not_contains_validator
     )
@@ -25,9 +25,6 @@ from protobuf_to_pydantic.customer_validator.v2 import (
     duration_lt_validator,
     duration_not_in_validator,
     in_validator,
-    len_validator,
-    map_max_pairs_validator,
-    map_min_pairs_validator,
     not_contains_validator,
     not_in_validator,
     prefix_validator,
@@ -131,7 +128,12 @@ class BytesTest(ProtobufCompatibleBaseModel):
         default=b"", alias_priority=1, validation_alias="constTest", serialization_alias="constTest"
     )
     len_test: bytes = Field(
-        default=b"", alias_priority=1, validation_alias="lenTest", serialization_alias="lenTest", len=4
+        default=b"",
+        alias_priority=1,
+        validation_alias="lenTest",
+        serialization_alias="lenTest",
+        min_length=4,
+        max_length=4,
     )
     range_len_test: bytes = Field(
         default=b"",
@@ -168,7 +170,6 @@ class BytesTest(ProtobufCompatibleBaseModel):
         not_in=[b"a", b"b", b"c"],
     )
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
     prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
     contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
@@ -527,8 +528,8 @@ class MapTest(ProtobufCompatibleBaseModel):
         alias_priority=1,
         validation_alias="pairTest",
         serialization_alias="pairTest",
-        map_min_pairs=1,
-        map_max_pairs=5,
+        min_length=1,
+        max_length=5,
     )
     no_parse_test: typing.Dict[str, int] = Field(
         default_factory=dict, alias_priority=1, validation_alias="noParseTest", serialization_alias="noParseTest"
@@ -549,13 +550,6 @@ class MapTest(ProtobufCompatibleBaseModel):
         default_factory=dict, alias_priority=1, validation_alias="ignoreTest", serialization_alias="ignoreTest"
     )
 
-    pair_test_map_min_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_min_pairs_validator
-    )
-    pair_test_map_max_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_max_pairs_validator
-    )
-
 
 class MessageDisabledTest(ProtobufCompatibleBaseModel):
     model_config = ConfigDict(
@@ -619,7 +613,12 @@ class StringTest(ProtobufCompatibleBaseModel):
         default="", alias_priority=1, validation_alias="constTest", serialization_alias="constTest"
     )
     len_test: str = Field(
-        default="", alias_priority=1, validation_alias="lenTest", serialization_alias="lenTest", len=3
+        default="",
+        alias_priority=1,
+        validation_alias="lenTest",
+        serialization_alias="lenTest",
+        min_length=3,
+        max_length=3,
     )
     s_range_len_test: str = Field(
         default="",
@@ -633,10 +632,10 @@ class StringTest(ProtobufCompatibleBaseModel):
         default="", alias_priority=1, validation_alias="bRangeLenTest", serialization_alias="bRangeLenTest"
     )
     pattern_test: str = Field(
-        default="", alias_priority=1, validation_alias="patternTest", serialization_alias="patternTest"
+        default="", alias_priority=1, validation_alias="patternTest", serialization_alias="patternTest", pattern="^test"
     )
     prefix_test: str = Field(
-        default="", alias_priority=1, validation_alias="prefixTest", serialization_alias="prefixTest", prefix="prefix"
+        default="", alias_priority=1, validation_alias="prefixTest", serialization_alias="prefixTest", pattern="^prefix"
     )
     suffix_test: str = Field(
         default="", alias_priority=1, validation_alias="suffixTest", serialization_alias="suffixTest", suffix="suffix"
@@ -646,7 +645,7 @@ class StringTest(ProtobufCompatibleBaseModel):
         alias_priority=1,
         validation_alias="containsTest",
         serialization_alias="containsTest",
-        contains="contains",
+        pattern="contains",
     )
     not_contains_test: str = Field(
         default="",
@@ -692,12 +691,7 @@ class StringTest(ProtobufCompatibleBaseModel):
         default="", alias_priority=1, validation_alias="ignoreTest", serialization_alias="ignoreTest"
     )
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
-    prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
-    contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
-        contains_validator
-    )
     not_contains_test_not_contains_validator = field_validator("not_contains_test", mode="after", check_fields=None)(
         not_contains_validator
     )
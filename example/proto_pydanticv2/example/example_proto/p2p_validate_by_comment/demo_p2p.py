@@ -31,9 +31,6 @@ from protobuf_to_pydantic.customer_validator.v2 import (
     duration_lt_validator,
     duration_not_in_validator,
     in_validator,
-    len_validator,
-    map_max_pairs_validator,
-    map_min_pairs_validator,
     not_contains_validator,
     not_in_validator,
     prefix_validator,
@@ -362,12 +359,12 @@ class BoolTest(ProtobufCompatibleBaseModel):
 
 class StringTest(ProtobufCompatibleBaseModel):
     const_test: typing.Literal["aaa"] = Field(default="")
-    len_test: str = Field(default="", len=3)
+    len_test: str = Field(default="", min_length=3, max_length=3)
     s_range_len_test: str = Field(default="", min_length=1, max_length=3)
     pattern_test: str = Field(default="", pattern="^test")
-    prefix_test: str = Field(default="", prefix="prefix")
+    prefix_test: str = Field(default="", pattern="^prefix")
     suffix_test: str = Field(default="", suffix="suffix")
-    contains_test: str = Field(default="", contains="contains")
+    contains_test: str = Field(default="", pattern="contains")
     not_contains_test: str = Field(default="", not_contains="not_contains")
     in_test: str = Field(default="", in_=["a", "b", "c"])
     not_in_test: str = Field(default="", not_in=["a", "b", "c"])
@@ -393,12 +390,7 @@ class StringTest(ProtobufCompatibleBaseModel):
     type_test: typing_extensions.Annotated[str, StringConstraints()] = Field(default="")
     extra_test: str = Field(default="", customer_string="c1", customer_int=1)
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
-    prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
-    contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
-        contains_validator
-    )
     not_contains_test_not_contains_validator = field_validator("not_contains_test", mode="after", check_fields=None)(
         not_contains_validator
     )
@@ -454,7 +446,7 @@ class EnumTest(ProtobufCompatibleBaseModel):
 
 
 class MapTest(ProtobufCompatibleBaseModel):
-    pair_test: "typing.Dict[str, int]" = Field(default_factory=dict, map_min_pairs=1, map_max_pairs=5)
+    pair_test: "typing.Dict[str, int]" = Field(default_factory=dict, min_length=1, max_length=5)
     keys_test: typing.Dict[typing_extensions.Annotated[str, MinLen(min_length=1), MaxLen(max_length=5)], int] = Field(
         default_factory=dict
     )
@@ -473,13 +465,6 @@ class MapTest(ProtobufCompatibleBaseModel):
     type_test: dict = Field(default_factory=dict)
     extra_test: "typing.Dict[str, int]" = Field(default_factory=dict, customer_string="c1", customer_int=1)
 
-    pair_test_map_min_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_min_pairs_validator
-    )
-    pair_test_map_max_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_max_pairs_validator
-    )
-
 
 class MessageTest(ProtobufCompatibleBaseModel):
     skip_test: str = Field(default="")
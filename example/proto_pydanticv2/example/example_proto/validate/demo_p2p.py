@@ -29,9 +29,6 @@ from protobuf_to_pydantic.customer_validator.v2 import (
     duration_lt_validator,
     duration_not_in_validator,
     in_validator,
-    len_validator,
-    map_max_pairs_validator,
-    map_min_pairs_validator,
     not_contains_validator,
     not_in_validator,
     prefix_validator,
@@ -208,13 +205,13 @@ class BoolTest(ProtobufCompatibleBaseModel):
 
 class StringTest(ProtobufCompatibleBaseModel):
     const_test: typing.Literal["aaa"] = Field(default="")
-    len_test: str = Field(default="", len=3)
+    len_test: str = Field(default="", min_length=3, max_length=3)
     s_range_len_test: str = Field(default="", min_length=1, max_length=3)
     b_range_len_test: str = Field(default="")
     pattern_test: str = Field(default="", pattern="^test")
-    prefix_test: str = Field(default="", prefix="prefix")
+    prefix_test: str = Field(default="", pattern="^prefix")
     suffix_test: str = Field(default="", suffix="suffix")
-    contains_test: str = Field(default="", contains="contains")
+    contains_test: str = Field(default="", pattern="contains")
     not_contains_test: str = Field(default="", not_contains="not_contains")
     in_test: str = Field(default="", in_=["a", "b", "c"])
     not_in_test: str = Field(default="", not_in=["a", "b", "c"])
@@ -229,12 +226,7 @@ class StringTest(ProtobufCompatibleBaseModel):
     uuid_test: UUID = Field(default="")
     ignore_test: str = Field(default="")
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
-    prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
-    contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
-        contains_validator
-    )
     not_contains_test_not_contains_validator = field_validator("not_contains_test", mode="after", check_fields=None)(
         not_contains_validator
     )
@@ -244,7 +236,7 @@ class StringTest(ProtobufCompatibleBaseModel):
 
 class BytesTest(ProtobufCompatibleBaseModel):
     const_test: typing.Literal[b"demo"] = Field(default=b"")
-    len_test: bytes = Field(default=b"", len=4)
+    len_test: bytes = Field(default=b"", min_length=4, max_length=4)
     range_len_test: bytes = Field(default=b"", min_length=1, max_length=4)
     pattern_test: bytes = Field(default=b"")
     prefix_test: bytes = Field(default=b"", prefix=b"prefix")
@@ -253,7 +245,6 @@ class BytesTest(ProtobufCompatibleBaseModel):
     in_test: bytes = Field(default=b"", in_=[b"a", b"b", b"c"])
     not_in_test: bytes = Field(default=b"", not_in=[b"a", b"b", b"c"])
 
-    len_test_len_validator = field_validator("len_test", mode="after", check_fields=None)(len_validator)
     prefix_test_prefix_validator = field_validator("prefix_test", mode="after", check_fields=None)(prefix_validator)
     suffix_test_suffix_validator = field_validator("suffix_test", mode="after", check_fields=None)(suffix_validator)
     contains_test_contains_validator = field_validator("contains_test", mode="after", check_fields=None)(
@@ -275,7 +266,7 @@ class EnumTest(ProtobufCompatibleBaseModel):
 
 
 class MapTest(ProtobufCompatibleBaseModel):
-    pair_test: "typing.Dict[str, int]" = Field(default_factory=dict, map_min_pairs=1, map_max_pairs=5)
+    pair_test: "typing.Dict[str, int]" = Field(default_factory=dict, min_length=1, max_length=5)
     no_parse_test: "typing.Dict[str, int]" = Field(default_factory=dict)
     keys_test: typing.Dict[typing_extensions.Annotated[str, MinLen(min_length=1), MaxLen(max_length=5)], int] = Field(
         default_factory=dict
@@ -287,13 +278,6 @@ class MapTest(ProtobufCompatibleBaseModel):
     ] = Field(default_factory=dict)
     ignore_test: "typing.Dict[str, int]" = Field(default_factory=dict)
 
-    pair_test_map_min_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_min_pairs_validator
-    )
-    pair_test_map_max_pairs_validator = field_validator("pair_test", mode="after", check_fields=None)(
-        map_max_pairs_validator
-    )
-
 
 class MessageTest(ProtobufCompatibleBaseModel):
     skip_test: str = Field(default="")
@@ -1,3 +1,7 @@
 from .__version__ import __version__
-from .gen_code import pydantic_model_to_py_code, pydantic_model_to_py_file
+from .gen_code import (
+    pydantic_model_to_py_code,
+    pydantic_model_to_py_file,
+    pydantic_model_to_py_files,
+)
 from .gen_model import msg_to_pydantic_model
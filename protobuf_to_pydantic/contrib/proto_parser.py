@@ -9,10 +9,10 @@
 #   https://github.com/khadgarmage/protoparser/pull/6/commits/973c0456ae360379ff4b4955c7e5ca8dcfdd1905
 import json
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from lark import Lark, Token, Transformer, Tree
-from lark.tree import ParseTree  # type: ignore
 
 # BNF doc url:https://protobuf.dev/reference/protobuf/proto3-spec/
 BNF = r"""
@@ -429,10 +429,21 @@ def parse_from_file(file: str) -> Optional[ProtoFile]:
     return None
 
 
+@lru_cache(maxsize=None)
+def get_parser() -> Lark:
+    """
+    Return the parser of the Protobuf file, it is built once per process.
+
+    The LALR tables of the grammar are cached on disk by Lark (in the temp dir),
+    and `ProtoTransformer` is applied while parsing, without building the parse tree.
+    """
+    return Lark(
+        BNF, start="proto", parser="lalr", transformer=ProtoTransformer(), cache=True
+    )
+
+
 def parse(data: str) -> ProtoFile:
-    parser: Lark = Lark(BNF, start="proto", parser="lalr")
-    tree: ParseTree = parser.parse(data)
-    trans_tree: Tree = ProtoTransformer().transform(tree)
+    trans_tree: Tree = get_parser().parse(data)
     enums: Dict[str, Enum] = {}
     messages: Dict[str, Message] = {}
     services: Dict[str, Service] = {}
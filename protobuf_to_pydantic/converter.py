@@ -0,0 +1,514 @@
+"""Convert between protobuf messages and pydantic models by reading and writing the message fields directly"""
+
+from datetime import timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from google.protobuf import json_format
+from pydantic import BaseModel
+from typing_extensions import Annotated, get_args, get_origin
+
+from protobuf_to_pydantic.grpc_types import (
+    Descriptor,
+    FieldDescriptor,
+    Message,
+    MessageToDict,
+)
+from protobuf_to_pydantic.type_adapter import get_type_adapter
+
+ValueConverter = Callable[[Any], Any]
+FieldStep = Callable[[Message, Dict[str, Any]], None]
+FromProtobufFunc = Callable[[Message], BaseModel]
+ToProtobufStep = Callable[[BaseModel, Message], None]
+ToProtobufFunc = Callable[[BaseModel, Message], None]
+
+# Key: (model class, message descriptor, validate)
+_from_protobuf_func_dict: Dict[
+    Tuple[Type[BaseModel], Descriptor, bool], FromProtobufFunc
+] = {}
+# Key: (model class, message descriptor)
+_to_protobuf_func_dict: Dict[Tuple[Type[BaseModel], Descriptor], ToProtobufFunc] = {}
+
+
+def _unwrap_annotation(annotation: Any) -> Any:
+    """Remove `Annotated` and `Optional` from the annotation"""
+    while True:
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation = get_args(annotation)[0]
+        elif origin is Union:
+            arg_list = [i for i in get_args(annotation) if i is not type(None)]
+            if len(arg_list) != 1:
+                return annotation
+            annotation = arg_list[0]
+        else:
+            return annotation
+
+
+def _get_item_annotation(annotation: Any, index: int) -> Any:
+    arg_list = get_args(_unwrap_annotation(annotation))
+    if len(arg_list) > index:
+        return arg_list[index]
+    return Any
+
+
+def _copy_message(message_class: Type[Message]) -> ValueConverter:
+    def _copy(value: Message) -> Message:
+        new_value = message_class()
+        new_value.CopyFrom(value)
+        return new_value
+
+    return _copy
+
+
+def _to_dict(value: Message) -> Any:
+    return MessageToDict(value, preserving_proto_field_name=True)
+
+
+class _LazyFromProtobuf(object):
+    """Resolve the converter of the nested model on the first call, so that self-referencing messages are supported"""
+
+    __slots__ = ("model_class", "descriptor", "validate", "func")
+
+    def __init__(
+        self, model_class: Type[BaseModel], descriptor: Descriptor, validate: bool
+    ) -> None:
+        self.model_class = model_class
+        self.descriptor = descriptor
+        self.validate = validate
+        self.func: Optional[FromProtobufFunc] = None
+
+    def __call__(self, value: Message) -> BaseModel:
+        if self.func is None:
+            self.func = get_from_protobuf_func(
+                self.model_class, self.descriptor, self.validate
+            )
+        return self.func(value)
+
+
+def _compile_value_converter(
+    annotation: Any, field: FieldDescriptor, validate: bool
+) -> Optional[ValueConverter]:
+    """Return the converter of the single value of the field, None means the value can be used directly"""
+    annotation = _unwrap_annotation(annotation)
+    if field.message_type is None:
+        if (
+            not validate
+            and isinstance(annotation, type)
+            and issubclass(annotation, Enum)
+        ):
+            return annotation
+        return None
+
+    full_name = field.message_type.full_name
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _LazyFromProtobuf(annotation, field.message_type, validate)
+    elif isinstance(annotation, type) and issubclass(annotation, Message):
+        return _copy_message(annotation)
+    elif full_name == "google.protobuf.Timestamp":
+        return lambda value: value.ToDatetime(tzinfo=timezone.utc)
+    elif full_name == "google.protobuf.Duration":
+        return lambda value: value.ToTimedelta()
+
+    # Other messages are converted to the same value as `MessageToDict`
+    if validate or annotation is Any:
+        return _to_dict
+    type_adapter = get_type_adapter(annotation)
+    return lambda value: type_adapter.validate_python(_to_dict(value))
+
+
+def _compile_field_step(
+    field_name: str, annotation: Any, field: FieldDescriptor, validate: bool
+) -> FieldStep:
+    """Compile the step of reading the field from the message and writing it to the data of the model"""
+    name = field.name
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        if field.message_type and field.message_type.GetOptions().map_entry:
+            value_converter = _compile_value_converter(
+                _get_item_annotation(annotation, 1),
+                field.message_type.fields_by_name["value"],
+                validate,
+            )
+
+            def _map_step(message: Message, data: Dict[str, Any]) -> None:
+                value = getattr(message, name)
+                if value:
+                    if value_converter is None:
+                        data[field_name] = dict(value)
+                    else:
+                        data[field_name] = {
+                            k: value_converter(v) for k, v in value.items()
+                        }
+
+            return _map_step
+
+        item_converter = _compile_value_converter(
+            _get_item_annotation(annotation, 0), field, validate
+        )
+        container: Callable[[Any], Any] = list
+        if not validate and get_origin(_unwrap_annotation(annotation)) in (
+            set,
+            frozenset,
+        ):
+            container = get_origin(_unwrap_annotation(annotation))
+
+        def _repeated_step(message: Message, data: Dict[str, Any]) -> None:
+            value = getattr(message, name)
+            if value:
+                if item_converter is None:
+                    data[field_name] = container(value)
+                else:
+                    data[field_name] = container(item_converter(i) for i in value)
+
+        return _repeated_step
+
+    value_converter = _compile_value_converter(annotation, field, validate)
+    if field.has_presence:
+
+        def _presence_step(message: Message, data: Dict[str, Any]) -> None:
+            if message.HasField(name):
+                value = getattr(message, name)
+                data[field_name] = (
+                    value if value_converter is None else value_converter(value)
+                )
+
+        return _presence_step
+
+    def _step(message: Message, data: Dict[str, Any]) -> None:
+        # Same as `MessageToDict`, the field with default value is not set
+        value = getattr(message, name)
+        if value:
+            data[field_name] = (
+                value if value_converter is None else value_converter(value)
+            )
+
+    return _step
+
+
+def _compile_oneof_step(
+    oneof_name: str, annotation: Any, field_list: List[FieldDescriptor], validate: bool
+) -> FieldStep:
+    """
+    Compile the step of the oneof that is generated as a discriminated union, e.g:
+        class OptionalMessageAX(BaseModel):
+            a_case: Literal["x"] = Field(default="x", exclude=True)
+            x: str
+
+        class OptionalMessage(BaseModel):
+            a: Annotated[Union[OptionalMessageAX, OptionalMessageAY], Field(discriminator="a_case")]
+    """
+    case_field_name = f"{oneof_name}_case"
+    variant_dict: Dict[str, Type[BaseModel]] = {}
+    for variant in get_args(_unwrap_annotation(annotation)):
+        if not (isinstance(variant, type) and issubclass(variant, BaseModel)):
+            continue
+        case_field = variant.model_fields.get(case_field_name)
+        if case_field is not None and isinstance(case_field.default, str):
+            variant_dict[case_field.default] = variant
+
+    converter_dict: Dict[str, Optional[ValueConverter]] = {}
+    for field in field_list:
+        variant = variant_dict.get(field.name)
+        field_annotation: Any = Any
+        if variant is not None and field.name in variant.model_fields:
+            field_annotation = variant.model_fields[field.name].annotation
+        converter_dict[field.name] = _compile_value_converter(
+            field_annotation, field, validate
+        )
+
+    def _oneof_step(message: Message, data: Dict[str, Any]) -> None:
+        case = message.WhichOneof(oneof_name)
+        if not case:
+            return
+        value = getattr(message, case)
+        value_converter = converter_dict.get(case)
+        if value_converter is not None:
+            value = value_converter(value)
+        if not validate and case in variant_dict:
+            data[oneof_name] = variant_dict[case].model_construct(**{case: value})
+        else:
+            data[oneof_name] = {case: value, case_field_name: case}
+
+    return _oneof_step
+
+
+def _compile_from_protobuf_func(
+    model_class: Type[BaseModel], descriptor: Descriptor, validate: bool
+) -> FromProtobufFunc:
+    if not model_class.__pydantic_complete__:
+        model_class.model_rebuild()
+    model_fields = model_class.model_fields
+
+    step_list: List[FieldStep] = []
+    for oneof in descriptor.oneofs:
+        if oneof.name in model_fields and oneof.name not in descriptor.fields_by_name:
+            step_list.append(
+                _compile_oneof_step(
+                    oneof.name,
+                    model_fields[oneof.name].annotation,
+                    list(oneof.fields),
+                    validate,
+                )
+            )
+    for field in descriptor.fields:
+        if field.name not in model_fields:
+            continue
+        step_list.append(
+            _compile_field_step(
+                field.name, model_fields[field.name].annotation, field, validate
+            )
+        )
+
+    if validate:
+
+        def _from_protobuf(message: Message) -> BaseModel:
+            data: Dict[str, Any] = {}
+            for step in step_list:
+                step(message, data)
+            return model_class.model_validate(data)
+
+    else:
+
+        def _from_protobuf(message: Message) -> BaseModel:
+            data: Dict[str, Any] = {}
+            for step in step_list:
+                step(message, data)
+            return model_class.model_construct(**data)
+
+    return _from_protobuf
+
+
+def get_from_protobuf_func(
+    model_class: Type[BaseModel], descriptor: Descriptor, validate: bool = True
+) -> FromProtobufFunc:
+    """
+    Get the function that converts the message of the descriptor to the model.
+
+    The function is compiled on the first call by the model fields and the message descriptor,
+    and then cached, so that the message fields are read directly without `MessageToDict`
+    """
+    key = (model_class, descriptor, validate)
+    func = _from_protobuf_func_dict.get(key)
+    if func is None:
+        func = _compile_from_protobuf_func(model_class, descriptor, validate)
+        _from_protobuf_func_dict[key] = func
+    return func
+
+
+def get_message_class(descriptor: Descriptor) -> Type[Message]:
+    try:
+        from google.protobuf.message_factory import GetMessageClass  # type: ignore
+    except ImportError:
+        from google.protobuf.message_factory import MessageFactory  # type: ignore
+
+        return MessageFactory().GetPrototype(descriptor)
+    return GetMessageClass(descriptor)
+
+
+def _enum_to_int(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _compile_message_writer(
+    annotation: Any, field: FieldDescriptor
+) -> Callable[[Any, Message], None]:
+    """Return the writer that writes the value to the (sub) message of the field"""
+    annotation = _unwrap_annotation(annotation)
+    full_name = field.message_type.full_name
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _LazyToProtobuf(field.message_type)
+    elif isinstance(annotation, type) and issubclass(annotation, Message):
+        return lambda value, message: message.CopyFrom(value)
+    elif full_name == "google.protobuf.Timestamp":
+        return lambda value, message: message.FromDatetime(value)
+    elif full_name == "google.protobuf.Duration":
+        return lambda value, message: message.FromTimedelta(value)
+
+    # Other messages (e.g. Struct, Value, wrappers) are parsed from the json value
+    def _parse_json_value(value: Any, message: Message) -> None:
+        if isinstance(value, Message):
+            message.CopyFrom(value)
+        else:
+            json_format.ParseDict(value, message)
+
+    return _parse_json_value
+
+
+class _LazyToProtobuf(object):
+    """Resolve the writer of the nested model on the first call, so that self-referencing messages are supported"""
+
+    __slots__ = ("descriptor",)
+
+    def __init__(self, descriptor: Descriptor) -> None:
+        self.descriptor = descriptor
+
+    def __call__(self, value: BaseModel, message: Message) -> None:
+        get_to_protobuf_func(type(value), self.descriptor)(value, message)
+
+
+def _compile_field_writer(
+    field_name: str, annotation: Any, field: FieldDescriptor
+) -> ToProtobufStep:
+    name = field.name
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        if field.message_type and field.message_type.GetOptions().map_entry:
+            value_field = field.message_type.fields_by_name["value"]
+            if value_field.message_type is None:
+                is_enum = value_field.enum_type is not None
+
+                def _scalar_map_writer(model: BaseModel, message: Message) -> None:
+                    value = getattr(model, field_name)
+                    if value:
+                        if is_enum:
+                            value = {k: _enum_to_int(v) for k, v in value.items()}
+                        getattr(message, name).update(value)
+
+                return _scalar_map_writer
+
+            map_value_writer = _compile_message_writer(
+                _get_item_annotation(annotation, 1), value_field
+            )
+
+            def _message_map_writer(model: BaseModel, message: Message) -> None:
+                value = getattr(model, field_name)
+                if value:
+                    container = getattr(message, name)
+                    for k, v in value.items():
+                        map_value_writer(v, container[k])
+
+            return _message_map_writer
+
+        if field.message_type is None:
+            is_enum = field.enum_type is not None
+
+            def _scalar_repeated_writer(model: BaseModel, message: Message) -> None:
+                value = getattr(model, field_name)
+                if value:
+                    if is_enum:
+                        value = [_enum_to_int(i) for i in value]
+                    getattr(message, name).extend(value)
+
+            return _scalar_repeated_writer
+
+        item_writer = _compile_message_writer(
+            _get_item_annotation(annotation, 0), field
+        )
+
+        def _message_repeated_writer(model: BaseModel, message: Message) -> None:
+            value = getattr(model, field_name)
+            if value:
+                container = getattr(message, name)
+                for item in value:
+                    item_writer(item, container.add())
+
+        return _message_repeated_writer
+
+    if field.message_type is None:
+        is_enum = field.enum_type is not None
+
+        def _scalar_writer(model: BaseModel, message: Message) -> None:
+            value = getattr(model, field_name)
+            if value is not None:
+                setattr(message, name, _enum_to_int(value) if is_enum else value)
+
+        return _scalar_writer
+
+    value_writer = _compile_message_writer(annotation, field)
+
+    def _message_writer(model: BaseModel, message: Message) -> None:
+        value = getattr(model, field_name)
+        if value is not None:
+            sub_message = getattr(message, name)
+            # The field is set even if the value is an empty model
+            sub_message.SetInParent()
+            value_writer(value, sub_message)
+
+    return _message_writer
+
+
+def _compile_oneof_writer(
+    oneof_name: str, annotation: Any, field_list: List[FieldDescriptor]
+) -> ToProtobufStep:
+    """Compile the writer of the oneof that is generated as a discriminated union"""
+    case_field_name = f"{oneof_name}_case"
+    field_dict = {field.name: field for field in field_list}
+    writer_dict: Dict[Tuple[Type[BaseModel], str], ToProtobufStep] = {}
+
+    def _oneof_writer(model: BaseModel, message: Message) -> None:
+        variant = getattr(model, oneof_name)
+        if variant is None:
+            return
+        case = getattr(variant, case_field_name, None)
+        if case not in field_dict:
+            return
+        key = (type(variant), case)
+        writer = writer_dict.get(key)
+        if writer is None:
+            writer = _compile_field_writer(
+                case,
+                type(variant).model_fields[case].annotation,
+                field_dict[case],
+            )
+            writer_dict[key] = writer
+        writer(variant, message)
+
+    return _oneof_writer
+
+
+def _compile_to_protobuf_func(
+    model_class: Type[BaseModel], descriptor: Descriptor
+) -> ToProtobufFunc:
+    model_fields = model_class.model_fields
+
+    writer_list: List[Tuple[str, ToProtobufStep]] = []
+    for oneof in descriptor.oneofs:
+        if oneof.name in model_fields and oneof.name not in descriptor.fields_by_name:
+            writer_list.append(
+                (
+                    oneof.name,
+                    _compile_oneof_writer(
+                        oneof.name,
+                        model_fields[oneof.name].annotation,
+                        list(oneof.fields),
+                    ),
+                )
+            )
+    for field in descriptor.fields:
+        if field.name not in model_fields:
+            continue
+        writer_list.append(
+            (
+                field.name,
+                _compile_field_writer(
+                    field.name, model_fields[field.name].annotation, field
+                ),
+            )
+        )
+
+    def _to_protobuf(model: BaseModel, message: Message) -> None:
+        # Same as `model_dump(exclude_unset=True)`, the fields that are not set are skipped
+        fields_set = model.model_fields_set
+        for field_name, writer in writer_list:
+            if field_name in fields_set:
+                writer(model, message)
+
+    return _to_protobuf
+
+
+def get_to_protobuf_func(
+    model_class: Type[BaseModel], descriptor: Descriptor
+) -> ToProtobufFunc:
+    """
+    Get the function that writes the fields of the model to the message of the descriptor.
+
+    The function is compiled on the first call by the model fields and the message descriptor,
+    and then cached, so that the message fields are set directly without `model_dump` and `ParseDict`
+    """
+    key = (model_class, descriptor)
+    func = _to_protobuf_func_dict.get(key)
+    if func is None:
+        if not model_class.__pydantic_complete__:
+            model_class.model_rebuild()
+        func = _compile_to_protobuf_func(model_class, descriptor)
+        _to_protobuf_func_dict[key] = func
+    return func
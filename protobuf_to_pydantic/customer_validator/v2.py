@@ -1,7 +1,8 @@
+import operator
 from datetime import datetime
-from typing import Any, Callable, Dict, Tuple, Type, Union
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, FieldValidationInfo
+from pydantic import AliasChoices, BaseModel, FieldValidationInfo
 from pydantic.fields import ModelPrivateAttr
 
 from protobuf_to_pydantic.grpc_types import AnyMessage
@@ -14,6 +15,20 @@ from protobuf_to_pydantic.field_info_rule.types import OneOfTypedDict  # isort:s
 ################
 # requirements #
 ################
+CheckFunc = Callable[[Any], Any]
+# Bind the field name and the rule value of the field to the check function
+CheckFuncBuilder = Callable[[str, Any], CheckFunc]
+
+
+def _to_datetime(field_value: Any) -> Any:
+    if not isinstance(field_value, datetime):
+        if isinstance(field_value, (list, tuple)):
+            field_value = [datetime.fromtimestamp(i) for i in field_value]
+        else:
+            field_value = datetime.fromtimestamp(field_value)
+    return field_value
+
+
 def _get_name_and_value(
     cls: Type[BaseModel],
     key: str,
@@ -22,42 +37,189 @@ def _get_name_and_value(
 ) -> Tuple[str, Any]:
     field_name: str = info.field_name
     field_value = cls.model_fields[field_name].json_schema_extra[key]
-    if enable_timestamp_to_datetime and not isinstance(field_value, datetime):
-        if isinstance(field_value, (list, tuple)):
-            field_value = [datetime.fromtimestamp(i) for i in field_value]
-        else:
-            field_value = datetime.fromtimestamp(field_value)
+    if enable_timestamp_to_datetime:
+        field_value = _to_datetime(field_value)
 
     return field_name, field_value
 
 
+def _return_value(v: Any) -> Any:
+    return v
+
+
+def _get_check_func(
+    cls: Type[BaseModel], key: str, info: FieldValidationInfo, builder: CheckFuncBuilder
+) -> CheckFunc:
+    """
+    Get the check function of the field rule.
+
+    The rule value is read from `json_schema_extra` when the field is validated for the first time,
+    then the check function bound to it is cached in the model class,
+    so the next validation only does the comparison.
+    """
+    check_func_dict: Optional[Dict[Tuple[str, str], CheckFunc]] = cls.__dict__.get(
+        "__rule_check_func_dict__", None
+    )
+    if check_func_dict is None:
+        check_func_dict = {}
+        setattr(cls, "__rule_check_func_dict__", check_func_dict)
+    cache_key = (key, info.field_name)
+    check_func = check_func_dict.get(cache_key, None)
+    if check_func is None:
+        field_name, field_value = _get_name_and_value(cls, key, info)
+        # All rules are skipped when the rule value is None
+        if field_value is None:
+            check_func = _return_value
+        else:
+            check_func = builder(field_name, field_value)
+        check_func_dict[cache_key] = check_func
+    return check_func
+
+
+def _bind_rule(rule_func: Callable[[Any, str, Any], Any]) -> CheckFuncBuilder:
+    def builder(field_name: str, field_value: Any) -> CheckFunc:
+        return lambda v: rule_func(v, field_name, field_value)
+
+    return builder
+
+
+def _bind_contain_rule(
+    rule_func: Callable[[Any, str, Any], Any], is_in: bool
+) -> CheckFuncBuilder:
+    """The value is looked up in the frozenset of the rule value, the rule is only called to raise the error"""
+
+    def builder(field_name: str, field_value: Any) -> CheckFunc:
+        if not isinstance(field_value, (list, tuple, set, frozenset)):
+            return _bind_rule(rule_func)(field_name, field_value)
+        try:
+            value_set = frozenset(field_value)
+        except TypeError:
+            return _bind_rule(rule_func)(field_name, field_value)
+
+        def check_func(v: Any) -> Any:
+            try:
+                if (v in value_set) is is_in:
+                    return v
+            except TypeError:
+                # The value can not be hashed, use the rule
+                pass
+            return rule_func(v, field_name, field_value)
+
+        return check_func
+
+    return builder
+
+
+def _bind_timestamp_rule(
+    rule_func: Callable[[Any, str, Any], Any], check: Callable[[Any, Any], bool]
+) -> CheckFuncBuilder:
+    """
+    The rule value is converted to datetime when the value is datetime (see `_get_name_and_value`),
+    both the rule value and its timestamp are computed once for each kind of value
+    """
+
+    def builder(field_name: str, field_value: Any) -> CheckFunc:
+        bound_dict: Dict[bool, Tuple[Any, Any]] = {}
+
+        def check_func(v: Any) -> Any:
+            is_datetime = isinstance(v, datetime)
+            bound = bound_dict.get(is_datetime, None)
+            if bound is None:
+                value = _to_datetime(field_value) if is_datetime else field_value
+                bound = bound_dict[is_datetime] = (value, rule.to_timestamp(value))
+            if not check(rule.to_timestamp(v), bound[1]):
+                rule_func(v, field_name, bound[0])
+            return v
+
+        return check_func
+
+    return builder
+
+
 #################
 # pre validator #
 #################
-def check_one_of(cls: Type[BaseModel], values: tuple) -> tuple:
-    """validatorValidator for supporting protobuf one_of"""
+# (one_of_name, required, fields, field name and alias set, field name and alias -> field name)
+OneOfGroup = Tuple[str, bool, Any, FrozenSet[str], Dict[str, str]]
+
+
+def _get_field_key_list(cls: Type[BaseModel], field_name: str) -> List[str]:
+    """Return the field name and the aliases that can be used to set the field"""
+    key_list = [field_name]
+    field_info = cls.model_fields.get(field_name, None)
+    if field_info is None:
+        return key_list
+    for alias in (field_info.alias, field_info.validation_alias):
+        if isinstance(alias, str):
+            key_list.append(alias)
+        elif isinstance(alias, AliasChoices):
+            key_list.extend(i for i in alias.choices if isinstance(i, str))
+    return key_list
+
+
+def _get_one_of_group_list(cls: Type[BaseModel]) -> Optional[List[OneOfGroup]]:
+    """Compile the `_one_of_dict` of the model class once, and cache it in the model class"""
+    cache: Optional[Tuple[Any, Optional[List[OneOfGroup]]]] = cls.__dict__.get(
+        "__one_of_group_cache__", None
+    )
+    # The `_one_of_dict` of the dynamic model is a class attribute set after the model is created,
+    # so the cache is bound to it
+    one_of_class_attr = cls.__dict__.get("_one_of_dict", None)
+    if cache is not None and cache[0] is one_of_class_attr:
+        return cache[1]
+
     _one_of_private_attr: Union[ModelPrivateAttr, Dict[str, Any], None] = getattr(
         cls, "_one_of_dict", None
     )
     if not _one_of_private_attr:
-        return values
+        setattr(cls, "__one_of_group_cache__", (one_of_class_attr, None))
+        return None
+
+    one_of_dict_dict = _one_of_private_attr
     # if model is dynamic gen, _one_of_dict is a dict, else model code run, _one_of_dict is a ModelPrivateAttr
-    if isinstance(_one_of_private_attr, ModelPrivateAttr):
-        _one_of_private_attr = _one_of_private_attr.default
-
-    for one_of_name, one_of_dict in _one_of_private_attr.items():  # type: str, OneOfTypedDict
-        have_value_name = sum(
-            [
-                1
-                for one_of_field_name in one_of_dict["fields"]
-                if one_of_field_name in values
-            ]
+    if isinstance(one_of_dict_dict, ModelPrivateAttr):
+        one_of_dict_dict = one_of_dict_dict.default
+
+    one_of_group_list: List[OneOfGroup] = []
+    for one_of_name, one_of_dict in one_of_dict_dict.items():  # type: str, OneOfTypedDict
+        key_dict: Dict[str, str] = {}
+        for one_of_field_name in one_of_dict["fields"]:
+            for key in _get_field_key_list(cls, one_of_field_name):
+                key_dict.setdefault(key, one_of_field_name)
+        one_of_group_list.append(
+            (
+                one_of_name,
+                one_of_dict.get("required", False),
+                one_of_dict["fields"],
+                frozenset(key_dict),
+                key_dict,
+            )
         )
+    setattr(cls, "__one_of_group_cache__", (one_of_class_attr, one_of_group_list))
+    return one_of_group_list
+
+
+def check_one_of(cls: Type[BaseModel], values: tuple) -> tuple:
+    """validatorValidator for supporting protobuf one_of"""
+    one_of_group_list = _get_one_of_group_list(cls)
+    if not one_of_group_list:
+        return values
+    key_view = values.keys() if isinstance(values, dict) else None
+
+    for one_of_name, required, fields, key_set, key_dict in one_of_group_list:
+        if key_view is not None:
+            present_key_set = key_set.intersection(key_view)
+        else:
+            present_key_set = {key for key in key_set if key in values}
+        have_value_name = len(present_key_set)
+        if have_value_name >= 2:
+            # The field name and the alias of the same field are counted once
+            have_value_name = len({key_dict[key] for key in present_key_set})
         if have_value_name >= 2:
             raise ValueError(f"OneOf:{one_of_name} has {have_value_name} value")
-        if one_of_dict.get("required", False) and have_value_name == 0:
+        if required and have_value_name == 0:
             raise ValueError(
-                f"OneOf:{one_of_name} must set value (Choose one of :{one_of_dict['fields']})"
+                f"OneOf:{one_of_name} must set value (Choose one of :{fields})"
             )
     return values
 
@@ -65,107 +227,111 @@ def check_one_of(cls: Type[BaseModel], values: tuple) -> tuple:
 ##################
 # data validator #
 ##################
+_in_builder = _bind_contain_rule(rule.in_validator, True)
+_not_in_builder = _bind_contain_rule(rule.not_in_validator, False)
+_any_in_builder = _bind_rule(rule.any_in_validator)
+_any_not_in_builder = _bind_rule(rule.any_not_in_validator)
+_len_builder = _bind_rule(rule.len_validator)
+_prefix_builder = _bind_rule(rule.prefix_validator)
+_suffix_builder = _bind_rule(rule.suffix_validator)
+_contains_builder = _bind_rule(rule.contains_validator)
+_not_contains_builder = _bind_rule(rule.not_contains_validator)
+
+
 def in_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "in_", info)
-    return rule.in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "in_", info, _in_builder)(v)
 
 
 def not_in_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "not_in", info)
-    return rule.not_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "not_in", info, _not_in_builder)(v)
 
 
 def any_in_validator(
     cls: Type[BaseModel], v: AnyMessage, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "any_in", info)
-    return rule.any_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "any_in", info, _any_in_builder)(v)
 
 
 def any_not_in_validator(
     cls: Type[BaseModel], v: AnyMessage, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "any_not_in", info)
-    return rule.any_not_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "any_not_in", info, _any_not_in_builder)(v)
 
 
 def len_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "len", info)
-    return rule.len_validator(v, field_name, field_value)
+    return _get_check_func(cls, "len", info, _len_builder)(v)
 
 
 def prefix_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "prefix", info)
-    return rule.prefix_validator(v, field_name, field_value)
+    return _get_check_func(cls, "prefix", info, _prefix_builder)(v)
 
 
 def suffix_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "suffix", info)
-    return rule.suffix_validator(v, field_name, field_value)
+    return _get_check_func(cls, "suffix", info, _suffix_builder)(v)
 
 
 def contains_validator(cls: Type[BaseModel], v: Any, info: FieldValidationInfo) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "contains", info)
-    return rule.contains_validator(v, field_name, field_value)
+    return _get_check_func(cls, "contains", info, _contains_builder)(v)
 
 
 def not_contains_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "not_contains", info)
-    return rule.not_contains_validator(v, field_name, field_value)
+    return _get_check_func(cls, "not_contains", info, _not_contains_builder)(v)
 
 
 ####################
 # duration support #
 ####################
+_duration_lt_builder = _bind_rule(rule.duration_lt_validator)
+_duration_le_builder = _bind_rule(rule.duration_le_validator)
+_duration_gt_builder = _bind_rule(rule.duration_gt_validator)
+_duration_ge_builder = _bind_rule(rule.duration_ge_validator)
+_duration_const_builder = _bind_rule(rule.duration_const_validator)
+_duration_in_builder = _bind_contain_rule(rule.duration_in_validator, True)
+_duration_not_in_builder = _bind_contain_rule(rule.duration_not_in_validator, False)
+
+
 def duration_lt_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_lt", info)
-    return rule.duration_lt_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_lt", info, _duration_lt_builder)(v)
 
 
 def duration_le_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_le", info)
-    return rule.duration_le_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_le", info, _duration_le_builder)(v)
 
 
 def duration_gt_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_gt", info)
-    return rule.duration_gt_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_gt", info, _duration_gt_builder)(v)
 
 
 def duration_ge_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_ge", info)
-    return rule.duration_ge_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_ge", info, _duration_ge_builder)(v)
 
 
 def duration_const_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_const", info)
-    return rule.duration_const_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_const", info, _duration_const_builder)(v)
 
 
 def duration_in_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_in", info)
-    return rule.duration_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_in", info, _duration_in_builder)(v)
 
 
 def duration_not_in_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "duration_not_in", info)
-    return rule.duration_not_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "duration_not_in", info, _duration_not_in_builder)(v)
 
 
 #####################
@@ -179,111 +345,101 @@ def set_now_default_factory(now_default_factory: Callable[[], datetime]) -> None
     _now_default_factory = now_default_factory
 
 
+_timestamp_lt_builder = _bind_timestamp_rule(rule.timestamp_lt_validator, operator.lt)
+_timestamp_lt_now_builder = _bind_rule(rule.timestamp_lt_now_validator)
+_timestamp_le_builder = _bind_timestamp_rule(rule.timestamp_le_validator, operator.le)
+_timestamp_gt_builder = _bind_timestamp_rule(rule.timestamp_gt_validator, operator.gt)
+_timestamp_gt_now_builder = _bind_rule(rule.timestamp_gt_now_validator)
+_timestamp_within_builder = _bind_rule(rule.timestamp_within_validator)
+_timestamp_ge_builder = _bind_timestamp_rule(rule.timestamp_ge_validator, operator.ge)
+_timestamp_const_builder = _bind_timestamp_rule(
+    rule.timestamp_const_validator, operator.eq
+)
+_timestamp_in_builder = _bind_timestamp_rule(
+    rule.timestamp_in_validator, lambda v, b: v in b
+)
+_timestamp_not_in_builder = _bind_timestamp_rule(
+    rule.timestamp_not_in_validator, lambda v, b: v not in b
+)
+
+
 def timestamp_lt_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls, "timestamp_lt", info, enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    return rule.timestamp_lt_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_lt", info, _timestamp_lt_builder)(v)
 
 
 def timestamp_lt_now_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "timestamp_lt_now", info)
-    return rule.timestamp_lt_now_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_lt_now", info, _timestamp_lt_now_builder)(v)
 
 
 def timestamp_le_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls, "timestamp_le", info, enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    return rule.timestamp_le_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_le", info, _timestamp_le_builder)(v)
 
 
 def timestamp_gt_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls, "timestamp_gt", info, enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    return rule.timestamp_gt_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_gt", info, _timestamp_gt_builder)(v)
 
 
 def timestamp_gt_now_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "timestamp_gt_now", info)
-    return rule.timestamp_gt_now_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_gt_now", info, _timestamp_gt_now_builder)(v)
 
 
 def timestamp_within_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "timestamp_within", info)
-    return rule.timestamp_within_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_within", info, _timestamp_within_builder)(v)
 
 
 def timestamp_ge_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls, "timestamp_ge", info, enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    return rule.timestamp_ge_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_ge", info, _timestamp_ge_builder)(v)
 
 
 def timestamp_const_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls,
-        "timestamp_const",
-        info,
-        enable_timestamp_to_datetime=isinstance(v, datetime),
-    )
-    return rule.timestamp_const_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_const", info, _timestamp_const_builder)(v)
 
 
 def timestamp_in_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls, "timestamp_in", info, enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    return rule.timestamp_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_in", info, _timestamp_in_builder)(v)
 
 
 def timestamp_not_in_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(
-        cls,
-        "timestamp_not_in",
-        info,
-        enable_timestamp_to_datetime=isinstance(v, datetime),
-    )
-    return rule.timestamp_not_in_validator(v, field_name, field_value)
+    return _get_check_func(cls, "timestamp_not_in", info, _timestamp_not_in_builder)(v)
 
 
 ###############
 # map support #
 ###############
+_map_min_pairs_builder = _bind_rule(rule.map_min_pairs_validator)
+_map_max_pairs_builder = _bind_rule(rule.map_max_pairs_validator)
+
+
 def map_min_pairs_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "map_min_pairs", info)
-    return rule.map_min_pairs_validator(v, field_name, field_value)
+    return _get_check_func(cls, "map_min_pairs", info, _map_min_pairs_builder)(v)
 
 
 def map_max_pairs_validator(
     cls: Type[BaseModel], v: Any, info: FieldValidationInfo
 ) -> Any:
-    field_name, field_value = _get_name_and_value(cls, "map_max_pairs", info)
-    return rule.map_max_pairs_validator(v, field_name, field_value)
+    return _get_check_func(cls, "map_max_pairs", info, _map_max_pairs_builder)(v)
 
 
 validate_validator_dict: Dict[str, Callable] = globals()
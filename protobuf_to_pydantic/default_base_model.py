@@ -1,19 +1,69 @@
 """Default base model for protobuf_to_pydantic generated models."""
 
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    Dict,
+    ForwardRef,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import (
     AliasGenerator,
     BaseModel,
     ConfigDict,
     FieldSerializationInfo,
+    GetCoreSchemaHandler,
     SerializerFunctionWrapHandler,
     field_serializer,
     model_serializer,
     model_validator,
 )
 from pydantic.alias_generators import to_camel
+from pydantic_core import CoreSchema
+from typing_extensions import Annotated, get_args, get_origin
+
+from protobuf_to_pydantic.converter import (
+    get_from_protobuf_func,
+    get_message_class,
+    get_to_protobuf_func,
+)
+from protobuf_to_pydantic.grpc_types import Message
+from protobuf_to_pydantic.type_adapter import ValidateManyResult, validate_many
+
+ModelT = TypeVar("ModelT", bound="ProtobufCompatibleBaseModel")
+MessageT = TypeVar("MessageT", bound=Message)
+
+
+def _may_be_enum(annotation: Any) -> bool:
+    """Whether the value of the field with this annotation may be an enum member"""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _may_be_enum(get_args(annotation)[0])
+    if origin is Union:
+        return any(_may_be_enum(arg) for arg in get_args(annotation))
+    if origin is not None:
+        # Containers, the enum members in them are not serialized by `_serialize_enums`
+        return False
+    if annotation is Any:
+        return True
+    if isinstance(annotation, type):
+        return issubclass(annotation, Enum) or annotation is object
+    # TypeVar, unresolved forward reference...
+    return annotation is not None and annotation is not type(None)
+
+
+def _is_resolved(annotation: Any) -> bool:
+    if isinstance(annotation, (str, ForwardRef)):
+        return False
+    if get_origin(annotation) is Union:
+        return all(_is_resolved(arg) for arg in get_args(annotation))
+    return True
 
 
 class ProtobufCompatibleBaseModel(BaseModel):
@@ -31,6 +81,44 @@ class ProtobufCompatibleBaseModel(BaseModel):
         populate_by_name=True,
     )
 
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Type[BaseModel], handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        """
+        Only keep the wrap serializers when the model needs them.
+
+        The wrap serializers are Python callbacks called by pydantic-core for every field (or model) on dump,
+        so `_serialize_enums` is dropped by the model without enum fields and `serialize_model` is dropped
+        by the model without `_oneof_fields`, then the model is serialized entirely in pydantic-core
+        """
+        if not cls.__dict__.get("__protobuf_serializer_resolved__", False):
+            decorators = cls.__pydantic_decorators__
+            annotation_list = [
+                field.annotation for field in cls.__pydantic_fields__.values()
+            ]
+            # The serializers are always kept by the class that defines (or overrides) them
+            if (
+                "_serialize_enums" not in cls.__dict__
+                and _get_decorator_func(
+                    decorators.field_serializers, "_serialize_enums"
+                )
+                is _serialize_enums_func
+                and not any(_may_be_enum(annotation) for annotation in annotation_list)
+            ):
+                decorators.field_serializers.pop("_serialize_enums")
+            if (
+                "serialize_model" not in cls.__dict__
+                and _get_decorator_func(decorators.model_serializers, "serialize_model")
+                is _serialize_model_func
+                and not hasattr(cls, "_oneof_fields")
+            ):
+                decorators.model_serializers.pop("serialize_model")
+            # Models with unresolved annotations are checked again when they are rebuilt
+            if all(_is_resolved(annotation) for annotation in annotation_list):
+                cls.__protobuf_serializer_resolved__ = True
+        return handler(source)
+
     @model_serializer(mode="wrap")
     def serialize_model(self, nxt):
         output = nxt(self)
@@ -56,60 +144,115 @@ class ProtobufCompatibleBaseModel(BaseModel):
             return value.name
         return nxt(value)
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        # Index the aliases of the oneof fields once, `_deserialize_oneofs` only looks up the input keys in it
+        union_fields = getattr(cls, "_oneof_fields", None)
+        # Get the actual value from ModelPrivateAttr if needed
+        if hasattr(union_fields, "default"):
+            union_fields = union_fields.default
+        oneof_alias_index: Dict[str, Tuple[str, str]] = {}
+        for field_name, field_info in (union_fields or {}).items():
+            for alias, actual_field in field_info.get("aliases", {}).items():
+                oneof_alias_index[alias] = (field_name, actual_field)
+        cls.__protobuf_oneof_alias_index__ = oneof_alias_index
+
     @model_validator(mode="before")
     @classmethod
     def _deserialize_oneofs(cls, data):
         """Handle oneof field deserialization from flat JSON."""
-        if not isinstance(data, dict):
-            return data
-
-        if not hasattr(cls, "_oneof_fields"):
+        oneof_alias_index: Dict[str, Tuple[str, str]] = cls.__dict__.get(
+            "__protobuf_oneof_alias_index__", None
+        )
+        if not oneof_alias_index or not isinstance(data, dict):
             return data
 
-        # Get the actual value from ModelPrivateAttr if needed
-        union_fields = cls._oneof_fields  # type: ignore
-        if hasattr(union_fields, "default"):
-            union_fields = union_fields.default
+        # Collect the oneof fields present in flat format with a single pass over the input keys
+        present_field_dict: Dict[str, Dict[str, str]] = {}
+        for key, value in data.items():
+            if value is None or key not in oneof_alias_index:
+                continue
+            field_name, actual_field = oneof_alias_index[key]
+            if field_name in data:
+                continue
+            field_mapping = present_field_dict.setdefault(field_name, {})
+            if actual_field in field_mapping:
+                # Same field specified via different alias
+                raise ValueError(
+                    f"Field '{actual_field}' specified multiple times in oneof '{field_name}' "
+                    f"using different aliases: '{field_mapping[actual_field]}' and '{key}'. "
+                    f"Only one field allowed."
+                )
+            field_mapping[actual_field] = key
 
         # Process each discriminated union field
-        for field_name, field_info in union_fields.items():
-            if field_name not in data:
-                field_aliases = field_info.get("aliases", {})
-
-                # Check if any oneof field is present in flat format
-                present_fields = []
-                field_mapping = {}
-                for key in data:
-                    if data[key] is None:
-                        continue
-                    if key in field_aliases:
-                        actual_field = field_aliases[key]
-                        if actual_field in field_mapping:
-                            # Same field specified via different alias
-                            raise ValueError(
-                                f"Field '{actual_field}' specified multiple times in oneof '{field_name}' "
-                                f"using different aliases: '{field_mapping[actual_field]}' and '{key}'. "
-                                f"Only one field allowed."
-                            )
-
-                        present_fields.append(actual_field)
-                        field_mapping[actual_field] = key
-
-                if len(present_fields) > 1:
-                    raise ValueError(
-                        f"Multiple fields from oneof '{field_name}' specified: {', '.join(present_fields)}. "
-                        f"Only one field allowed."
-                    )
-                if present_fields:
-                    actual_field = present_fields[0]
-                    data_key = field_mapping[actual_field]
-                    data[field_name] = {
-                        actual_field: data.pop(data_key),
-                        f"{field_name}_case": actual_field,
-                    }
+        for field_name, field_mapping in present_field_dict.items():
+            if len(field_mapping) > 1:
+                raise ValueError(
+                    f"Multiple fields from oneof '{field_name}' specified: {', '.join(field_mapping)}. "
+                    f"Only one field allowed."
+                )
+            for actual_field, data_key in field_mapping.items():
+                data[field_name] = {
+                    actual_field: data.pop(data_key),
+                    f"{field_name}_case": actual_field,
+                }
 
         return data
 
+    @classmethod
+    def from_protobuf(
+        cls: Type[ModelT], message: Message, validate: bool = True
+    ) -> ModelT:
+        """
+        Create the model from the protobuf message.
+
+        Similar to `cls.model_validate(MessageToDict(message, preserving_proto_field_name=True))`,
+        but the message fields are read directly through the precompiled converter of the class,
+        without building the intermediate dict.
+        Unlike `MessageToDict`, the scalar values are not converted to their JSON representation,
+        e.g: the bytes fields are kept as raw bytes (not base64 strings) and the 64-bit integer fields
+        are kept as int (not strings), so `from_protobuf(message).to_protobuf()` returns the same message.
+        If validate is False, the model is built by `model_construct` and the validation is skipped
+        """
+        return get_from_protobuf_func(cls, message.DESCRIPTOR, validate)(message)  # type: ignore
+
+    @classmethod
+    def validate_many(
+        cls,
+        data: Union[Iterable[Any], str, bytes, bytearray],
+        *,
+        strict: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> ValidateManyResult:
+        """
+        Validate a batch of data (or a JSON array) into the models of the class in one pydantic-core call.
+
+        The invalid items do not abort the batch, see `protobuf_to_pydantic.type_adapter.validate_many`
+        """
+        return validate_many(cls, data, strict=strict, context=context)
+
+    def to_protobuf(self, message_class: Optional[Type[MessageT]] = None) -> MessageT:
+        """
+        Create the protobuf message from the model.
+
+        Same as `ParseDict(self.model_dump(mode="json"), message_class())`, but the fields of the message
+        are set directly through the precompiled writer of the class, without `model_dump` and `ParseDict`.
+        The fields that are not set or are None are skipped.
+        If message_class is None, the message class of the model created by `msg_to_pydantic_model` is used
+        """
+        if message_class is None:
+            descriptor = getattr(type(self), "_protobuf_descriptor", None)
+            if descriptor is None:
+                raise TypeError(
+                    f"{type(self).__name__} is not created from protobuf message, message_class must be specified"
+                )
+            message_class = get_message_class(descriptor)  # type: ignore
+        message = message_class()  # type: ignore
+        get_to_protobuf_func(type(self), message.DESCRIPTOR)(self, message)
+        return message
+
     # ------------------------------------------------------------
     # Don't serialize unset fields, or fields with default values
     # ------------------------------------------------------------
@@ -174,5 +317,20 @@ class ProtobufCompatibleBaseModel(BaseModel):
         )
 
 
+def _get_decorator_func(decorator_dict: Dict[str, Any], name: str) -> Any:
+    decorator = decorator_dict.get(name, None)
+    return decorator and decorator.func
+
+
+# Used to check that the serializers are not overridden by the subclass
+_serialize_enums_func = _get_decorator_func(
+    ProtobufCompatibleBaseModel.__pydantic_decorators__.field_serializers,
+    "_serialize_enums",
+)
+_serialize_model_func = _get_decorator_func(
+    ProtobufCompatibleBaseModel.__pydantic_decorators__.model_serializers,
+    "serialize_model",
+)
+
 # Default base model to use if none is specified
 default_base_model = ProtobufCompatibleBaseModel
@@ -1,5 +1,6 @@
 import inspect
 import logging
+import re
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from google.protobuf.descriptor import FieldDescriptor
@@ -51,6 +52,52 @@ special_type_rule_name_set = {
 }
 
 
+# The rules that conflict with the native constraint translated from the rule
+_pattern_rule_name_set = {"pattern", "regex", "prefix", "suffix", "contains"}
+_length_rule_name_set = {
+    "len",
+    "len_bytes",
+    "min_len",
+    "max_len",
+    "min_bytes",
+    "max_bytes",
+    "min_length",
+    "max_length",
+}
+
+
+def get_native_constraint_dict(
+    type_name: str, rule_name: str, rule_value: Any, rule_dict: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Translate the rule that is validated by the Python validator into the native constraint of pydantic-core,
+    return None if the semantics of the native constraint are not equivalent to the rule.
+
+    Only one `pattern` and one `min_length`/`max_length` can be set for each field,
+    so the rule is translated only when no other rule needs the same constraint.
+    """
+    if rule_value is None:
+        return None
+    if type_name == "string" and rule_name in ("prefix", "contains"):
+        # The `suffix` rule is not translated, the end of the text can not be matched in the same way
+        # by both regex engines: `$` of python-re also matches before the trailing newline,
+        # and `\z` (rust regex) and `\Z` (python-re) are not supported by the other engine
+        if len(_pattern_rule_name_set.intersection(rule_dict)) != 1:
+            return None
+        # Both regex engines search the pattern, `^` only matches the start of the text
+        pattern = re.escape(rule_value)
+        if rule_name == "prefix":
+            pattern = "^" + pattern
+        return {"regex": pattern}
+    elif type_name in ("string", "bytes") and rule_name == "len":
+        if len(_length_rule_name_set.intersection(rule_dict)) != 1:
+            return None
+        return {"min_length": rule_value, "max_length": rule_value}
+    elif type_name == "map" and rule_name in ("min_pairs", "max_pairs"):
+        return {"min_length" if rule_name == "min_pairs" else "max_length": rule_value}
+    return None
+
+
 def get_con_type_func_from_type_name(type_name: str) -> Optional[Callable]:
     if type_name == "string":
         return constr
@@ -128,7 +175,14 @@ class BaseProtobufOptionToFieldInfo(object):
                 # Field Conversion
                 rule_name = pgv_column_to_pydantic_dict[rule_name]
 
-            if (
+            native_constraint_dict = get_native_constraint_dict(
+                type_name, rule_name, rule_value, rule_dict
+            )
+            if native_constraint_dict:
+                # Validated by pydantic-core, no need to call back into Python
+                field_info_type_dict.update(native_constraint_dict)  # type: ignore[typeddict-item]
+                continue
+            elif (
                 type_name in ("duration", "any", "timestamp", "map")
                 and rule_name in special_type_rule_name_set
             ):
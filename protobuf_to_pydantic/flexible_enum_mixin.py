@@ -4,9 +4,17 @@
 from enum import Enum
 from typing import Any
 
+from pydantic_core import ValidationError
 from pydantic_core import core_schema as cs
 
 
+class _MemberDict(dict):
+    """Map each member to itself, a missing key is the error of the fallback"""
+
+    def __missing__(self, error: ValidationError) -> Any:
+        raise error
+
+
 class FlexibleEnumMixin(Enum):
     """Accept enum member, name or int when used in Pydantic models.
 
@@ -25,24 +33,63 @@ class FlexibleEnumMixin(Enum):
 
     @classmethod
     def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> Any:
-        """Pydantic V2 core schema for flexible enum validation."""
+        """Pydantic V2 core schema for flexible enum validation.
+
+        The members and integer values are validated by the enum schema without
+        calling Python. Only the other values (e.g. the names) go to the fallback:
+        the names are looked up in a dict, the numeric strings (e.g. "1") are not
+        accepted. The invalid value reports a single value error.
+        """
         # Get the default Enum schema first
         enum_schema = handler(cls)
+        name_dict = dict(cls.__members__)
+        member_dict = _MemberDict((member, member) for member in cls)
+
+        def fallback(v: Any) -> Any:
+            # The error is returned instead of raised, so that the union does not
+            # add the errors of the other choices. `member_dict` raises it.
+            try:
+                if isinstance(v, str):
+                    try:
+                        return name_dict[v]  # Get enum by name
+                    except KeyError as exc:
+                        raise ValueError(
+                            f"{v!r} is not a valid name for {cls.__name__}"
+                        ) from exc
+                return cls(v)  # Let Enum raise ValueError if invalid value
+            except ValueError as exc:
+                return ValidationError.from_exception_data(
+                    cls.__name__,
+                    [
+                        {
+                            "type": "value_error",
+                            "loc": (),
+                            "input": v,
+                            "ctx": {"error": exc},
+                        }
+                    ],
+                )
+
+        def json_schema(schema: Any, json_schema_handler: Any) -> Any:
+            return {
+                "anyOf": [
+                    {"enum": list(name_dict), "type": "string"},
+                    # The chain lets the handler put the enum schema in `$defs`
+                    json_schema_handler(cs.chain_schema([enum_schema])),
+                ]
+            }
 
-        # Convert before default validation
-        def before(v: Any, info: Any = None) -> Any:
-            if isinstance(v, cls):
-                return v
-            if isinstance(v, str):
-                try:
-                    return cls[v]  # Get enum by name
-                except KeyError as exc:
-                    raise ValueError(
-                        f"{v!r} is not a valid name for {cls.__name__}"
-                    ) from exc
-            return cls(v)  # Let Enum raise ValueError if invalid int
-
-        # Use chain validator to run our validator first, then the enum validator
         return cs.chain_schema(
-            [cs.with_info_plain_validator_function(before), enum_schema]
+            [
+                cs.union_schema(
+                    [
+                        cs.is_instance_schema(cls),
+                        cs.chain_schema([cs.int_schema(strict=True), enum_schema]),
+                        cs.no_info_plain_validator_function(fallback),
+                    ],
+                    mode="left_to_right",
+                ),
+                cs.no_info_plain_validator_function(member_dict.__getitem__),
+            ],
+            metadata={"pydantic_js_functions": [json_schema]},
         )
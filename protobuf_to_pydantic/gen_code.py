@@ -15,6 +15,7 @@ from typing import (  # type: ignore
     ForwardRef,
     List,
     Optional,
+    Sequence,
     Set,
     Type,
     TypeVar,
@@ -37,8 +38,10 @@ from protobuf_to_pydantic.grpc_types import (
     RepeatedCompositeContainer,
     RepeatedScalarContainer,
 )
+from protobuf_to_pydantic.profiler import get_profile_output, profile_in_ctx, profiler
 from protobuf_to_pydantic.util import (
-    format_content,
+    Formatter,
+    get_formatter,
     replace_protobuf_type_to_python_type,
 )
 
@@ -62,6 +65,19 @@ def _is_optional_typing(type_: Any) -> bool:
     )
 
 
+def _get_metadata_attr_dict(metadata: Any) -> Dict[str, Any]:
+    """Get the attributes of the metadata, the metadata may use `__slots__` without `__dict__`"""
+    attr_dict: Dict[str, Any] = dict(getattr(metadata, "__dict__", {}))
+    for class_ in type(metadata).__mro__:
+        slot_list = class_.__dict__.get("__slots__", ())
+        if isinstance(slot_list, str):
+            slot_list = (slot_list,)
+        for slot in slot_list:
+            if slot not in attr_dict and hasattr(metadata, slot):
+                attr_dict[slot] = getattr(metadata, slot)
+    return attr_dict
+
+
 class BaseFormatContainer(object):
     def to_text(self) -> str:
         raise NotImplementedError
@@ -96,12 +112,15 @@ class BaseP2C(object):
         module_path: str = "",
         code_indent: Optional[int] = None,
         pyproject_file_path: str = "",
+        formatter: Optional[Formatter] = None,
     ):
         self._import_set: Set[str] = customer_import_set or set()
         self._content_deque: Deque = customer_deque or deque()
         self._create_set: Set[Type[BaseModel]] = set()
         self.code_indent: int = code_indent or 4
         self.pyproject_file_path: str = pyproject_file_path
+        # The formatter of the same pyproject file is shared, so the config of formatters is only resolved once
+        self.formatter: Formatter = formatter or get_formatter(pyproject_file_path)
 
         # init module_path
         if module_path:
@@ -120,10 +139,11 @@ class BaseP2C(object):
         self._module_path: str = module_path
 
     def format_content(self, content_str: str) -> str:
-        return format_content(content_str, pyproject_file_path=self.pyproject_file_path)
+        return self.formatter.format(content_str)
 
     @property
-    def content(self) -> str:
+    def raw_content(self) -> str:
+        """The content that has not been formatted"""
         # Regardless of the order of import, you can sort through isort (if installed)
         content_str: str = "\n".join(sorted(self._import_set))
 
@@ -135,7 +155,11 @@ class BaseP2C(object):
                     continue
                 _content_set.add(content)
                 content_str += f"\n{content}"
-        return self.format_content(self.head_content + content_str + self.tail_content)
+        return self.head_content + content_str + self.tail_content
+
+    @property
+    def content(self) -> str:
+        return self.format_content(self.raw_content)
 
     def _add_import_code(
         self, module_name: str, class_name: str = "", extra_str: str = ""
@@ -697,6 +721,20 @@ class BaseP2C(object):
                 for metadata in v:
                     if not metadata:
                         continue
+                    if not hasattr(metadata, "__dataclass_fields__"):
+                        # The general metadata of pydantic (e.g. pattern) is not a dataclass,
+                        # its values are stored in `__dict__` (or `__slots__`)
+                        for (
+                            metadata_key,
+                            metadata_value,
+                        ) in _get_metadata_attr_dict(metadata).items():
+                            if (
+                                metadata_key in field_info.metadata_lookup
+                                and metadata_value is not None
+                                and metadata_key not in field_param_dict
+                            ):
+                                field_param_dict[metadata_key] = metadata_value
+                        continue
                     for metadata_key in getattr(metadata, "__annotations__", []):
                         if metadata_key not in field_info.metadata_lookup:
                             continue
@@ -829,15 +867,23 @@ def pydantic_model_to_py_code(
     :param pyproject_file_path: pyproject.toml path
     :param p2c_class:  The class that actually executes
     :return:
+
+    If the `P2P_PROFILE` environment variable is set, the time of each phase is reported,
+    see `protobuf_to_pydantic.profiler`
     """
-    return p2c_class(
-        *model,
-        customer_import_set=customer_import_set,
-        customer_deque=customer_deque,
-        module_path=module_path,
-        code_indent=code_indent,
-        pyproject_file_path=pyproject_file_path,
-    ).content
+    with profile_in_ctx(get_profile_output(), "pydantic_model_to_py_code"):
+        with profiler.phase("model walk"):
+            p2c = p2c_class(
+                *model,
+                customer_import_set=customer_import_set,
+                customer_deque=customer_deque,
+                module_path=module_path,
+                code_indent=code_indent,
+                pyproject_file_path=pyproject_file_path,
+            )
+        # The formatting is recorded as the child phases of the code assembly
+        with profiler.phase("code assembly"):
+            return p2c.content
 
 
 def pydantic_model_to_py_file(
@@ -862,3 +908,39 @@ def pydantic_model_to_py_file(
     )
     with open(filename, mode=open_mode) as f:
         f.write(py_code_content)
+
+
+def pydantic_model_to_py_files(
+    file_model_dict: Dict[str, Sequence[Type[BaseModel]]],
+    customer_import_set: Optional[Set[str]] = None,
+    customer_deque: Optional[Deque] = None,
+    open_mode: str = "w",
+    module_path: str = "",
+    code_indent: Optional[int] = None,
+    pyproject_file_path: str = "",
+    p2c_class: Type[P2C] = P2C,
+) -> None:
+    """
+    Same as `pydantic_model_to_py_file`, but generate multiple files at once,
+    the code of all files is generated first and then formatted in one batch
+
+    :param file_model_dict: the key is the filename, and the value is the model(s) to generate code for
+    """
+    raw_content_dict: Dict[str, str] = {
+        filename: p2c_class(
+            *model_list,
+            # Each file has its own import set and content
+            customer_import_set=set(customer_import_set or ()),
+            customer_deque=deque(customer_deque or ()),
+            module_path=module_path,
+            code_indent=code_indent,
+            pyproject_file_path=pyproject_file_path,
+        ).raw_content
+        for filename, model_list in file_model_dict.items()
+    }
+    content_list = get_formatter(pyproject_file_path).format_many(
+        list(raw_content_dict.values())
+    )
+    for filename, py_code_content in zip(raw_content_dict, content_list):
+        with open(filename, mode=open_mode) as f:
+            f.write(py_code_content)
@@ -1,12 +1,30 @@
 import dataclasses
 import datetime
+import hashlib
 import importlib
 import inspect
 import logging
 import os
+import sys
+import types
+from collections.abc import Mapping
 from enum import IntEnum
+from functools import lru_cache
+from itertools import count
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from pydantic import AliasGenerator, BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
@@ -15,6 +33,7 @@ from typing_extensions import Annotated, get_origin
 
 from protobuf_to_pydantic import _pydantic_adapter, constant
 from protobuf_to_pydantic.constant import protobuf_common_type_dict
+from protobuf_to_pydantic.converter import _get_item_annotation, _unwrap_annotation
 from protobuf_to_pydantic.customer_validator.v2 import check_one_of
 from protobuf_to_pydantic.default_base_model import ProtobufCompatibleBaseModel
 from protobuf_to_pydantic.exceptions import WaitingToCompleteException
@@ -37,8 +56,11 @@ from protobuf_to_pydantic.grpc_types import (
     Descriptor,
     FieldDescriptor,
     FieldMask,
+    FileDescriptorProto,
     Message,
 )
+from protobuf_to_pydantic.model_cache import ModelCache
+from protobuf_to_pydantic.plugin.cache import GenCodeCache, stable_repr
 from protobuf_to_pydantic.template import Template
 from protobuf_to_pydantic.util import (
     create_pydantic_model,
@@ -124,10 +146,96 @@ class FieldDataClass(object):
     nested_message_dict: Dict[str, Type[Union[BaseModel, IntEnum]]]
     descriptor: Descriptor
     validators: Dict[str, classmethod]
+    # The lazy models referenced by the fields of the message, only used in lazy mode
+    lazy_model_ref_list: List["LazyModelRef"] = dataclasses.field(default_factory=list)
+    # The full names of the fields whose message model can not be referenced
+    unresolved_ref_list: List[str] = dataclasses.field(default_factory=list)
+
+
+class LazyModelRef(object):
+    """
+    The reference of the model that is built on first use, it is used as the forward reference
+    of the field type and the default_factory of the field in lazy mode
+    """
+
+    _name_counter: Iterator[int] = count()
+
+    def __init__(self, m2p: "M2P", parse_kwargs: Dict[str, Any]) -> None:
+        self.name: str = (
+            f"_{parse_kwargs['descriptor'].full_name.replace('.', '_')}"
+            f"_{next(self._name_counter)}"
+        )
+        self._m2p = m2p
+        self._parse_kwargs = parse_kwargs
+        self._model: Optional[Type[BaseModel]] = None
+
+    @property
+    def model(self) -> Type[BaseModel]:
+        if self._model is None:
+            self._model = self._m2p._parse_msg_to_pydantic_model(**self._parse_kwargs)
+        return self._model
+
+    def __call__(self) -> BaseModel:
+        return self.model()
+
+
+class LazyModelNamespace(Mapping):
+    """
+    The namespace used by pydantic to resolve the forward references of the lazy model.
+
+    The referenced models, and the models referenced by them, are built on the first lookup,
+    that is, when the lazy model is first used or `model_rebuild` is called
+    """
+
+    def __init__(self, ref_list: List[LazyModelRef]) -> None:
+        self._ref_list = ref_list
+        self._namespace: Optional[Dict[str, Type[BaseModel]]] = None
+
+    def _get_namespace(self) -> Dict[str, Type[BaseModel]]:
+        if self._namespace is None:
+            namespace: Dict[str, Type[BaseModel]] = {}
+            ref_list = list(self._ref_list)
+            while ref_list:
+                ref = ref_list.pop()
+                if ref.name in namespace:
+                    continue
+                namespace[ref.name] = ref.model
+                ref_list.extend(getattr(ref.model, "_lazy_model_ref_list", []))
+            self._namespace = namespace
+        return self._namespace
+
+    def __getitem__(self, key: str) -> Type[BaseModel]:
+        return self._get_namespace()[key]
 
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_namespace())
 
-CREATE_MODEL_CACHE_T = Dict[Union[str, tuple], Optional[Type[BaseModel]]]
-_create_model_cache: CREATE_MODEL_CACHE_T = {}
+    def __len__(self) -> int:
+        return len(self._get_namespace())
+
+
+@lru_cache(maxsize=None)
+def _get_reachable_message_set(descriptor: Descriptor) -> FrozenSet[str]:
+    """Return the full names of the messages reachable from the singular message fields"""
+    reachable_message_set: Set[str] = set()
+    descriptor_list = [descriptor]
+    while descriptor_list:
+        for field in descriptor_list.pop().fields:
+            if (
+                field.message_type is None
+                or field.label == FieldDescriptor.LABEL_REPEATED
+                or field.message_type.full_name in reachable_message_set
+            ):
+                continue
+            reachable_message_set.add(field.message_type.full_name)
+            descriptor_list.append(field.message_type)
+    return frozenset(reachable_message_set)
+
+
+CREATE_MODEL_CACHE_T = Union[
+    Dict[Union[str, tuple], Optional[Type[BaseModel]]], ModelCache
+]
+_create_model_cache: CREATE_MODEL_CACHE_T = ModelCache()
 
 
 def clear_create_model_cache() -> None:
@@ -149,6 +257,7 @@ class M2P(object):
         message_default_factory_dict_by_type_name: Optional[Dict[str, Any]] = None,
         use_discriminated_unions_for_oneofs: bool = False,
         create_model_cache: Optional[CREATE_MODEL_CACHE_T] = None,
+        lazy: bool = False,
     ):
         proto_file_name = msg.DESCRIPTOR.file.name  # type: ignore
         global_message_option_dict: Dict[str, "MessageOptionTypedDict"] = {}
@@ -195,12 +304,13 @@ class M2P(object):
         self._use_discriminated_unions_for_oneofs: bool = (
             use_discriminated_unions_for_oneofs
         )
+        self._lazy: bool = lazy
         self._parse_msg_desc_method = parse_msg_desc_method
         self._message_option_dict = global_message_option_dict
         self._default_field = default_field
         self._comment_prefix = comment_prefix
         self._creat_cache: CREATE_MODEL_CACHE_T = (
-            create_model_cache or _create_model_cache
+            _create_model_cache if create_model_cache is None else create_model_cache
         )
         self._pydantic_base: Type["BaseModel"] = (
             pydantic_base or ProtobufCompatibleBaseModel
@@ -346,6 +456,39 @@ class M2P(object):
             pydantic_base = self._pydantic_base
         return pydantic_base
 
+    def _get_message_model(
+        self, field_dataclass: Optional[FieldDataClass] = None, **kwargs: Any
+    ) -> Any:
+        """
+        Return the model of the message.
+        In lazy mode, the model is not built, the `LazyModelRef` of it is returned
+        (or its name, i.e. the forward reference, if field_dataclass is specified)
+        """
+        if not self._lazy:
+            return self._parse_msg_to_pydantic_model(**kwargs)
+        lazy_model_ref = LazyModelRef(self, kwargs)
+        if field_dataclass is None:
+            return lazy_model_ref
+        return self._use_lazy_model_ref(field_dataclass, lazy_model_ref)
+
+    @staticmethod
+    def _use_lazy_model_ref(
+        field_dataclass: FieldDataClass, lazy_model_ref: LazyModelRef
+    ) -> str:
+        """Register the lazy model referenced by the field, and return its forward reference"""
+        field_dataclass.lazy_model_ref_list.append(lazy_model_ref)
+        protobuf_field = field_dataclass.protobuf_field
+        if not (
+            protobuf_field.label == FieldDescriptor.LABEL_REPEATED
+            or field_dataclass.descriptor.full_name
+            in _get_reachable_message_set(protobuf_field.message_type)
+            or protobuf_field.message_type.full_name
+            == field_dataclass.descriptor.full_name
+        ):
+            # The default value of the recursive message can not be created
+            field_dataclass.field_default_factory = lazy_model_ref
+        return lazy_model_ref.name
+
     def get_nested_message_dict_by_message(
         self, descriptor: Descriptor
     ) -> Dict[str, Type[Union[BaseModel, IntEnum]]]:
@@ -354,7 +497,7 @@ class M2P(object):
         for message in descriptor.nested_types:
             if self._is_type_a_mapping(message):
                 continue
-            nested_type: Any = self._parse_msg_to_pydantic_model(
+            nested_type: Any = self._get_message_model(
                 descriptor=message, root_descriptor=descriptor
             )
             nested_message_dict[message.full_name] = nested_type
@@ -406,7 +549,8 @@ class M2P(object):
                         k_v_field.message_type.name
                     ]
                 else:
-                    k_v_type = self._parse_msg_to_pydantic_model(
+                    k_v_type = self._get_message_model(
+                        field_dataclass,
                         descriptor=k_v_field.message_type,
                         root_descriptor=protobuf_field.message_type,
                     )
@@ -447,7 +591,7 @@ class M2P(object):
                         for i in field_dataclass.descriptor.nested_types
                         if i.full_name == full_name
                     ][0]
-                    nested_type: Any = self._parse_msg_to_pydantic_model(
+                    nested_type: Any = self._get_message_model(
                         descriptor=nested_message,
                         class_name=protobuf_field.message_type.name
                         + SKIP_RULE_MESSAGE_SUFFIX,
@@ -461,9 +605,14 @@ class M2P(object):
                     field_dataclass.field_type = field_dataclass.nested_message_dict[
                         full_name
                     ]
-                # Facilitate the analysis of `gen code`
-                setattr(field_dataclass.field_type, "_is_nested", True)
-                field_dataclass.field_default_factory = field_dataclass.field_type
+                if isinstance(field_dataclass.field_type, LazyModelRef):
+                    field_dataclass.field_type = self._use_lazy_model_ref(
+                        field_dataclass, field_dataclass.field_type
+                    )
+                else:
+                    # Facilitate the analysis of `gen code`
+                    setattr(field_dataclass.field_type, "_is_nested", True)
+                    field_dataclass.field_default_factory = field_dataclass.field_type
             else:
                 # Python Protobuf does not solve the namespace problem of modules,
                 # so there is no uniform cross-module reference
@@ -473,12 +622,16 @@ class M2P(object):
                     == protobuf_field.message_type.file.name
                 )
                 if not is_same_pkg:
-                    field_dataclass.field_type = self._parse_msg_to_pydantic_model(
+                    field_dataclass.field_type = self._get_message_model(
+                        field_dataclass,
                         descriptor=protobuf_field.message_type,
                         skip_validate_rule=skip_validate_rule,
                         root_descriptor=field_dataclass.descriptor,
                     )
-                    field_dataclass.field_default_factory = field_dataclass.field_type
+                    if not self._lazy:
+                        field_dataclass.field_default_factory = (
+                            field_dataclass.field_type
+                        )
                     # _class_name = replace_file_name_to_class_name(protobuf_field.message_type.file.name) + _class_name
                     # field_dataclass.field_type = self._parse_msg_to_pydantic_model(
                     #     descriptor=protobuf_field.message_type,
@@ -490,6 +643,15 @@ class M2P(object):
                     #     f"{_class_name} protobuf path:{protobuf_field.message_type.file.name}"
                     # )
                     # setattr(field_dataclass.field_type, "__doc__", _class_doc)
+                elif self._lazy:
+                    # The self-referencing and circular references are resolved on first use
+                    field_dataclass.field_type = self._get_message_model(
+                        field_dataclass,
+                        descriptor=protobuf_field.message_type,
+                        class_name=protobuf_field.message_type.name
+                        + ("OnlyUseSkipRule" if skip_validate_rule else ""),
+                        skip_validate_rule=skip_validate_rule,
+                    )
                 else:
                     # if self-referencing, need use Python type hints postponed annotations
                     _class_name: str = protobuf_field.message_type.name
@@ -512,6 +674,9 @@ class M2P(object):
                         except WaitingToCompleteException:
                             pass
                     if isinstance(field_dataclass.field_type, str):
+                        field_dataclass.unresolved_ref_list.append(
+                            field_dataclass.protobuf_field.full_name
+                        )
                         logger.warning(
                             f"{field_dataclass.protobuf_field.full_name}'s default_factory attr value:{_class_name} "
                             f"is not generated and cannot be referenced now"
@@ -663,7 +828,10 @@ class M2P(object):
 
                     if (
                         get_origin(new_k_v_type) is Annotated
-                        or issubclass(new_k_v_type, raw_k_v_type)
+                        or (
+                            isinstance(raw_k_v_type, type)
+                            and issubclass(new_k_v_type, raw_k_v_type)
+                        )
                         or raw_k_v_type is datetime.datetime
                     ):
                         new_args_list[index] = new_k_v_type
@@ -704,6 +872,15 @@ class M2P(object):
             )
 
         message_key = (descriptor.full_name, class_name, skip_validate_rule)
+        if isinstance(self._creat_cache, ModelCache):
+            return self._creat_cache.get_or_create(
+                message_key,
+                lambda: self._create_pydantic_model(
+                    descriptor, class_name, skip_validate_rule, is_same_pkg
+                ),
+                file_name=descriptor.file.name,
+            )
+
         if message_key in self._creat_cache:
             if self._creat_cache[message_key] is None:
                 raise WaitingToCompleteException(
@@ -712,9 +889,23 @@ class M2P(object):
             return self._creat_cache[message_key]  # type: ignore[return-value]
         else:
             self._creat_cache[message_key] = None
+        pydantic_model = self._create_pydantic_model(
+            descriptor, class_name, skip_validate_rule, is_same_pkg
+        )
+        self._creat_cache[message_key] = pydantic_model
+        return pydantic_model
 
+    def _create_pydantic_model(
+        self,
+        descriptor: Descriptor,
+        class_name: str,
+        skip_validate_rule: bool,
+        is_same_pkg: bool,
+    ) -> Type[BaseModel]:
         annotation_dict: Dict[str, Tuple[Type, Any]] = {}
         validators: Dict[str, classmethod] = {}
+        lazy_model_ref_list: List[LazyModelRef] = []
+        unresolved_ref_list: List[str] = []
         pydantic_model_config_dict: Dict[str, Any] = {}
         nested_message_dict = self.get_nested_message_dict_by_message(descriptor)
         one_of_dict, optional_dict = self._one_of_handle(descriptor)
@@ -736,6 +927,8 @@ class M2P(object):
                 nested_message_dict=nested_message_dict,
                 descriptor=descriptor,
                 validators=validators,
+                lazy_model_ref_list=lazy_model_ref_list,
+                unresolved_ref_list=unresolved_ref_list,
             )
             if protobuf_field.type == FieldDescriptor.TYPE_MESSAGE:
                 self._protobuf_field_type_is_type_message_handler(field_dataclass)
@@ -843,16 +1036,172 @@ class M2P(object):
             validators=validators,
         )
         setattr(pydantic_model, "_one_of_dict", one_of_dict)
+        if lazy_model_ref_list:
+            # The forward references are resolved by pydantic when the model is rebuilt
+            setattr(pydantic_model, "_lazy_model_ref_list", lazy_model_ref_list)
+            setattr(
+                pydantic_model,
+                "__pydantic_parent_namespace__",
+                LazyModelNamespace(lazy_model_ref_list),
+            )
+        if unresolved_ref_list:
+            # The code of the model is incomplete, so it is not cached by `cache_dir`
+            setattr(pydantic_model, "_unresolved_ref_list", unresolved_ref_list)
+        # Used by `ProtobufCompatibleBaseModel.to_protobuf` to find the message class
+        setattr(pydantic_model, "_protobuf_descriptor", descriptor)
         if not is_same_pkg:
             class_doc = (
                 "Note: The current class does not belong to the package\n"
                 f"{class_name} protobuf path:{descriptor.file.name}"
             )
             setattr(pydantic_model, "__doc__", class_doc)
-        self._creat_cache[message_key] = pydantic_model
         return pydantic_model
 
 
+_gen_code_cache_dict: Dict[str, GenCodeCache] = {}
+# Key: the key of the cached code, so the same model is returned by the later calls
+_cache_dir_model_dict: Dict[str, Type[BaseModel]] = {}
+
+
+@lru_cache(maxsize=None)
+def _get_fd_dict(file_descriptor: Any) -> Dict[str, FileDescriptorProto]:
+    """Get the FileDescriptorProto of the file and its transitive dependency files"""
+    fd_dict: Dict[str, FileDescriptorProto] = {}
+    file_descriptor_list = [file_descriptor]
+    while file_descriptor_list:
+        file_descriptor = file_descriptor_list.pop()
+        if file_descriptor.name in fd_dict:
+            continue
+        fd = FileDescriptorProto()
+        file_descriptor.CopyToProto(fd)
+        fd_dict[file_descriptor.name] = fd
+        file_descriptor_list.extend(file_descriptor.dependencies)
+    return fd_dict
+
+
+def _get_source_file_list(
+    descriptor: Descriptor, parse_msg_desc_method: Any
+) -> List[str]:
+    """
+    Get the files that the comments of the message and its dependency files are parsed from,
+    they are resolved in the same way as `parse_msg_desc_method` resolves the file of the message
+    """
+    fd_name_list = sorted(_get_fd_dict(descriptor.file))
+    if isinstance(parse_msg_desc_method, str) and Path(parse_msg_desc_method).exists():
+        return [str(Path(parse_msg_desc_method) / name) for name in fd_name_list]
+    elif inspect.ismodule(parse_msg_desc_method):
+        module_file_name: str = parse_msg_desc_method.__file__  # type: ignore
+        # e.g: `path/example/demo.proto` -> `path/example/demo_pb2.py`
+        module_suffix = descriptor.file.name[: -len(".proto")] + "_pb2.py"
+        if not module_file_name.endswith(module_suffix):
+            return [module_file_name + "i"]
+        module_path = module_file_name[: -len(module_suffix)]
+        return [
+            module_path + name[: -len(".proto")] + "_pb2.pyi"
+            for name in fd_name_list
+            if name.endswith(".proto")
+        ]
+    return []
+
+
+def _get_option_digest(descriptor: Descriptor, option_dict: Dict[str, Any]) -> str:
+    """Get the digest of the options, and the files that the comments are parsed from"""
+    hash_obj = hashlib.sha256(stable_repr(option_dict).encode())
+    for source_file_name in _get_source_file_list(
+        descriptor, option_dict["parse_msg_desc_method"]
+    ):
+        try:
+            content = Path(source_file_name).read_bytes()
+        except OSError:
+            continue
+        hash_obj.update(source_file_name.encode())
+        hash_obj.update(content)
+    return hash_obj.hexdigest()
+
+
+def _iter_message_model(
+    model: Type[BaseModel], descriptor: Descriptor
+) -> Iterator[Tuple[Type[BaseModel], Descriptor]]:
+    """Iterate the model and the models of its message fields, with their descriptors"""
+    model_list = [(model, descriptor)]
+    seen_set: Set[Type[BaseModel]] = set()
+    while model_list:
+        model, descriptor = model_list.pop()
+        if model in seen_set:
+            continue
+        seen_set.add(model)
+        yield model, descriptor
+        for field in descriptor.fields:
+            message_type = field.message_type
+            if message_type is None or field.name not in model.model_fields:
+                continue
+            annotation = model.model_fields[field.name].annotation
+            if message_type.GetOptions().map_entry:
+                annotation = _get_item_annotation(annotation, 1)
+                message_type = message_type.fields_by_name["value"].message_type
+                if message_type is None:
+                    continue
+            elif field.label == FieldDescriptor.LABEL_REPEATED:
+                annotation = _get_item_annotation(annotation, 0)
+            annotation = _unwrap_annotation(annotation)
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                model_list.append((annotation, message_type))
+
+
+def _load_model_from_cache_dir(
+    gen_code_cache: GenCodeCache, key: str, descriptor: Descriptor
+) -> Optional[Type[BaseModel]]:
+    """Import the model from the code cached by `gen_code_cache`, None means not cached"""
+    module_name = f"_p2p_cache_{key}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        content = gen_code_cache.get(key)
+        if content is None:
+            return None
+        module = types.ModuleType(module_name)
+        sys.modules[module_name] = module
+        try:
+            exec(compile(content, module_name, "exec"), module.__dict__)
+        except Exception as e:
+            sys.modules.pop(module_name, None)
+            logger.warning(f"Load the cached model {module_name} error:{e}")
+            return None
+    model = getattr(module, descriptor.name, None)
+    if model is None:
+        return None
+    # Same as the attributes set by `M2P._create_pydantic_model`
+    for sub_model, sub_descriptor in _iter_message_model(model, descriptor):
+        one_of_private_attr = sub_model.__private_attributes__.get("_one_of_dict")
+        one_of_dict = getattr(one_of_private_attr, "default", None) or {}
+        setattr(sub_model, "_one_of_dict", one_of_dict)
+        setattr(sub_model, "_protobuf_descriptor", sub_descriptor)
+    return model
+
+
+def _dump_model_to_cache_dir(
+    gen_code_cache: GenCodeCache,
+    key: str,
+    model: Type[BaseModel],
+    descriptor: Descriptor,
+) -> None:
+    from protobuf_to_pydantic.gen_code import pydantic_model_to_py_code
+
+    for sub_model, _ in _iter_message_model(model, descriptor):
+        unresolved_ref_list = getattr(sub_model, "_unresolved_ref_list", None)
+        if unresolved_ref_list:
+            logger.warning(
+                f"Can not cache the code of {model}, "
+                f"the references of {unresolved_ref_list} are not resolved"
+            )
+            return
+    try:
+        content = pydantic_model_to_py_code(model)
+    except Exception as e:
+        logger.warning(f"Can not generate the code of {model} for cache:{e}")
+        return
+    gen_code_cache.set(key, content)
+
+
 def msg_to_pydantic_model(
     msg: Union[Type[Message], Descriptor],
     default_field: Type[FieldInfo] = FieldInfo,
@@ -866,6 +1215,8 @@ def msg_to_pydantic_model(
     message_default_factory_dict_by_type_name: Optional[Dict[str, Any]] = None,
     use_discriminated_unions_for_oneofs: bool = False,
     create_model_cache: Optional[CREATE_MODEL_CACHE_T] = None,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
 ) -> Type[BaseModel]:
     """
     Parse a message to a pydantic model
@@ -889,10 +1240,56 @@ def msg_to_pydantic_model(
     :param template: DescTemplate object, which can extend and modify template adaptation rules through inheritance
     :param message_type_dict_by_type_name: Define the Python type mapping corresponding to each Protobuf Type
     :param message_default_factory_dict_by_type_name: Define the default_factory corresponding to each Protobuf Type
-    :param create_model_cache: Cache the generated model
+    :param create_model_cache: Cache the generated model, it can be a dict or a `ModelCache`
+        (thread-safe, with the size and ttl limits), default is the module-level `ModelCache`
     :param use_discriminated_unions_for_oneofs: If true, generate discriminated unions for protobuf oneof fields
+    :param lazy: If true, the models of the message fields are referenced by forward references,
+        they are built and resolved when the model is first used (or `model_rebuild` is called).
+        Note: The lazy model can not be used to generate code
+    :param cache_dir: If set, the code of the generated model is cached in the directory,
+        and the later calls (e.g. after the process restarts) import the model from the cached code
+        instead of parsing the message again. The key of the cache is the hash of the message's
+        file descriptors, the parameters, the files that the comments are parsed from (including the
+        files of the dependencies) and the package versions. It is ignored in lazy mode.
+        The later calls in the same process return the same model, and the model whose references
+        are not resolved (e.g. the self-referencing message) is not cached
     """
-    return M2P(
+    descriptor = msg if isinstance(msg, Descriptor) else msg.DESCRIPTOR
+    gen_code_cache: Optional[GenCodeCache] = None
+    cache_key = ""
+    if cache_dir and not lazy:
+        if cache_dir not in _gen_code_cache_dict:
+            _gen_code_cache_dict[cache_dir] = GenCodeCache(cache_dir)
+        gen_code_cache = _gen_code_cache_dict[cache_dir]
+        option_dict = {
+            "default_field": default_field,
+            "comment_prefix": comment_prefix,
+            "parse_msg_desc_method": parse_msg_desc_method,
+            "local_dict": local_dict,
+            "pydantic_base": pydantic_base,
+            "pydantic_module": pydantic_module,
+            "template": template,
+            "message_type_dict_by_type_name": message_type_dict_by_type_name,
+            "message_default_factory_dict_by_type_name": message_default_factory_dict_by_type_name,
+            "use_discriminated_unions_for_oneofs": use_discriminated_unions_for_oneofs,
+        }
+        fd_dict = _get_fd_dict(descriptor.file)
+        cache_key = gen_code_cache.get_model_key(
+            fd_dict[descriptor.file.name],
+            fd_dict,
+            descriptor.full_name,
+            _get_option_digest(descriptor, option_dict),
+        )
+        cached_model = _cache_dir_model_dict.get(cache_key)
+        if cached_model is None:
+            cached_model = _load_model_from_cache_dir(
+                gen_code_cache, cache_key, descriptor
+            )
+        if cached_model is not None:
+            _cache_dir_model_dict[cache_key] = cached_model
+            return cached_model
+
+    model = M2P(
         msg=msg,
         default_field=default_field,
         comment_prefix=comment_prefix,
@@ -905,4 +1302,9 @@ def msg_to_pydantic_model(
         message_default_factory_dict_by_type_name=message_default_factory_dict_by_type_name,
         create_model_cache=create_model_cache,
         use_discriminated_unions_for_oneofs=use_discriminated_unions_for_oneofs,
+        lazy=lazy,
     ).model
+    if gen_code_cache is not None:
+        _dump_model_to_cache_dir(gen_code_cache, cache_key, model, descriptor)
+        _cache_dir_model_dict[cache_key] = model
+    return model
@@ -1,4 +1,8 @@
-from typing import TYPE_CHECKING, Dict, Optional
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 from protobuf_to_pydantic.util import get_dict_from_comment
 
@@ -8,7 +12,25 @@ if TYPE_CHECKING:
     from protobuf_to_pydantic.contrib.proto_parser import Message, ProtoFile
     from protobuf_to_pydantic.field_info_rule.types import MessageOptionTypedDict
 
-_filename_desc_dict: Dict[str, Dict[str, "MessageOptionTypedDict"]] = {}
+# The Protobuf file larger than it is parsed by streaming by default
+STREAM_PARSE_MIN_FILE_SIZE = 1024 * 1024
+# The max number of the cached Protobuf files
+MESSAGE_OPTION_CACHE_MAXSIZE = 128
+
+# Key: (filename, mtime, size, comment_prefix, stream)
+_filename_desc_dict: "OrderedDict[Tuple[Any, ...], Dict[str, MessageOptionTypedDict]]"
+_filename_desc_dict = OrderedDict()
+_filename_desc_dict_lock = Lock()
+
+_TOKEN_RE = re.compile(
+    r"""//.*|/\*|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[{}\[\];]|[^{}\[\];"'/]+|."""
+)
+_MESSAGE_RE = re.compile(r"^message\s+(\w+)$")
+_FIELD_RE = re.compile(
+    r"^(?:(?:repeated|optional|required)\s+)?"
+    r"(?:map\s*<[^>]*>\s*|[.\w]+\s+)(\w+)\s*=\s*\d"
+)
+_NOT_FIELD_KEYWORD_SET = {"option", "reserved", "extensions", "import", "package"}
 
 
 def _protobuf_msg_handler(
@@ -62,8 +84,150 @@ def _protobuf_msg_handler(
             )
 
 
-def get_message_option_dict_from_proto_file(
+def _iter_proto_statement(
+    line_iter: Iterator[str],
+) -> Iterator[Tuple[str, str, List[str], List[str]]]:
+    """
+    Iterate the statements of the Protobuf file line by line,
+    return (statement, terminator, leading comment list, trailing comment list),
+    the terminator is `;`, `{` or `}`, the `{`, `}` and `;` in `[...]` (the field
+    options) do not terminate the statement.
+    """
+    statement_list: List[str] = []
+    comment_list: List[str] = []
+    bracket_depth = 0
+    in_block_comment = False
+    # The statement of the current line, the comment behind it is a trailing comment
+    last_statement: Optional[Tuple[str, str, List[str], List[str]]] = None
+    for line in line_iter:
+        pos = 0
+        if in_block_comment:
+            if "*/" not in line:
+                continue
+            pos = line.index("*/") + 2
+            in_block_comment = False
+        while pos < len(line):
+            match = _TOKEN_RE.match(line, pos)
+            token = match.group()  # type: ignore[union-attr]
+            pos = match.end()  # type: ignore[union-attr]
+            if token.startswith("//"):
+                if last_statement is not None:
+                    last_statement[3].append(token)
+                else:
+                    comment_list.append(token + "\n")
+            elif token == "/*":
+                end_index = line.find("*/", pos)
+                if end_index == -1:
+                    in_block_comment = True
+                    break
+                pos = end_index + 2
+            elif token in ("{", "}", ";") and not bracket_depth:
+                if last_statement is not None:
+                    yield last_statement
+                last_statement = (
+                    " ".join("".join(statement_list).split()),
+                    token,
+                    comment_list,
+                    [],
+                )
+                statement_list, comment_list = [], []
+            elif not token.isspace():
+                if last_statement is not None:
+                    yield last_statement
+                    last_statement = None
+                if token == "[":
+                    bracket_depth += 1
+                elif token == "]":
+                    bracket_depth -= 1
+                statement_list.append(token)
+            elif statement_list:
+                statement_list.append(token)
+        if last_statement is not None:
+            yield last_statement
+            last_statement = None
+
+
+def _stream_parse_proto_file(
+    filename: str, comment_prefix: str
+) -> Dict[str, "MessageOptionTypedDict"]:
+    """
+    Only extract the comment rules of the messages and their fields,
+    the file is read line by line and the syntax tree is not built.
+
+    The result is the same as `_protobuf_msg_handler`,
+    except that the nested message is placed in the `nested` of its parent message.
+    """
+    message_field_dict: Dict[str, "MessageOptionTypedDict"] = {}
+    package: str = ""
+    # The container of the block, None is the block that is not a message
+    container_stack: List[Optional["MessageOptionTypedDict"]] = []
+    with open(filename, "r") as f:
+        statement_iter = _iter_proto_statement(f)
+        for statement, terminator, comment_list, tail_comment_list in statement_iter:
+            container = container_stack[-1] if container_stack else None
+            if terminator == "}":
+                if container_stack:
+                    container_stack.pop()
+                continue
+            elif terminator == "{":
+                match = _MESSAGE_RE.match(statement)
+                if not match or (container_stack and container is None):
+                    container_stack.append(None)
+                    continue
+                message_name = match.group(1)
+                new_container: "MessageOptionTypedDict" = {
+                    "message": {},
+                    "one_of": {},
+                    "nested": {},
+                    "metadata": {},
+                }
+                if container is None:
+                    message_field_dict[message_name] = new_container
+                else:
+                    container["nested"][message_name] = new_container
+                container_stack.append(new_container)
+                if comment_list:
+                    message_dict = get_dict_from_comment(
+                        comment_prefix, "".join(comment_list).replace("//", "")
+                    )
+                    rule_dict_handler(
+                        message_dict, new_container, f"{package}.{message_name}"
+                    )
+            elif not container_stack and statement.startswith("package "):
+                package = statement[len("package ") :].strip()
+            elif container is not None:
+                match = _FIELD_RE.match(statement)
+                if not match or statement.split(" ", 1)[0] in _NOT_FIELD_KEYWORD_SET:
+                    continue
+                comment = "".join(comment_list) + "".join(tail_comment_list)
+                container["message"][match.group(1)] = get_dict_from_comment(  # type: ignore[assignment]
+                    comment_prefix, comment.replace("//", "")
+                )
+    return message_field_dict
+
+
+def _parse_proto_file(
     filename: str, comment_prefix: str
+) -> Dict[str, "MessageOptionTypedDict"]:
+    try:
+        from protobuf_to_pydantic.contrib.proto_parser import ProtoFile, parse_from_file
+    except ImportError:
+        raise ImportError("Can not parse protobuf file, please install lark")
+
+    message_field_dict: Dict[str, "MessageOptionTypedDict"] = {}
+    _proto_file: Optional[ProtoFile] = parse_from_file(filename)
+    if _proto_file:
+        # Currently only used protobuf file message
+        for _, protobuf_msg in _proto_file.messages.items():
+            msg_cache: Dict[str, "MessageOptionTypedDict"] = {}
+            _protobuf_msg_handler(
+                protobuf_msg, _proto_file, message_field_dict, comment_prefix, msg_cache
+            )
+    return message_field_dict
+
+
+def get_message_option_dict_from_proto_file(
+    filename: str, comment_prefix: str, stream: Optional[bool] = None
 ) -> Dict[str, "MessageOptionTypedDict"]:
     """Obtain corresponding information through protobuf file
 
@@ -101,25 +265,37 @@ def get_message_option_dict_from_proto_file(
             }
         }
     }
+
+    If stream is True, the file is read line by line and only the comments of
+    the messages and their fields are extracted, without building the syntax tree.
+    By default, the file larger than `STREAM_PARSE_MIN_FILE_SIZE` is streamed.
+    The result is cached by (filename, mtime, size), the least recently used file is
+    evicted when the number of files exceeds `MESSAGE_OPTION_CACHE_MAXSIZE`.
     """
-    if filename in _filename_desc_dict:
-        # get protobuf message info by cache
-        return _filename_desc_dict[filename]
+    stat_result = os.stat(filename)
+    if stream is None:
+        stream = stat_result.st_size >= STREAM_PARSE_MIN_FILE_SIZE
+    key = (
+        filename,
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        comment_prefix,
+        stream,
+    )
+    with _filename_desc_dict_lock:
+        if key in _filename_desc_dict:
+            # get protobuf message info by cache
+            _filename_desc_dict.move_to_end(key)
+            return _filename_desc_dict[key]
 
-    try:
-        from protobuf_to_pydantic.contrib.proto_parser import ProtoFile, parse_from_file
-    except ImportError:
-        raise ImportError("Can not parse protobuf file, please install lark")
+    if stream:
+        message_field_dict = _stream_parse_proto_file(filename, comment_prefix)
+    else:
+        message_field_dict = _parse_proto_file(filename, comment_prefix)
 
-    message_field_dict: Dict[str, "MessageOptionTypedDict"] = {}
-    _proto_file: Optional[ProtoFile] = parse_from_file(filename)
-    if _proto_file:
-        # Currently only used protobuf file message
-        for _, protobuf_msg in _proto_file.messages.items():
-            msg_cache: Dict[str, "MessageOptionTypedDict"] = {}
-            _protobuf_msg_handler(
-                protobuf_msg, _proto_file, message_field_dict, comment_prefix, msg_cache
-            )
     # cache data and return
-    _filename_desc_dict[filename] = message_field_dict
+    with _filename_desc_dict_lock:
+        _filename_desc_dict[key] = message_field_dict
+        while len(_filename_desc_dict) > MESSAGE_OPTION_CACHE_MAXSIZE:
+            _filename_desc_dict.popitem(last=False)
     return message_field_dict
@@ -0,0 +1,186 @@
+"""The thread-safe, bounded cache of the models created by `M2P`"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Type
+
+from pydantic import BaseModel
+
+from protobuf_to_pydantic.exceptions import WaitingToCompleteException
+
+
+class ModelCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class _CacheEntry(object):
+    __slots__ = ("model", "file_name", "expire_time")
+
+    def __init__(
+        self, model: Type[BaseModel], file_name: str, expire_time: Optional[float]
+    ) -> None:
+        self.model = model
+        self.file_name = file_name
+        self.expire_time = expire_time
+
+
+class _PendingEntry(object):
+    """The model that is being created by the owner thread"""
+
+    __slots__ = ("owner", "event")
+
+    def __init__(self, owner: int) -> None:
+        self.owner = owner
+        self.event = threading.Event()
+
+
+class ModelCache(object):
+    """
+    The cache of the models created by `M2P`, it is passed by `create_model_cache`.
+
+    The cache is LRU, the least recently used model is evicted when the number of
+    models exceeds maxsize, and the model expires after ttl seconds,
+    maxsize and ttl are unlimited by default.
+
+    The model of a key is created by only one thread, the other threads wait for it.
+    If the model is requested again by the thread that is creating it (i.e. the
+    message refers to itself), or by a thread it is waiting for,
+    `WaitingToCompleteException` is raised, the caller uses a forward reference instead.
+    """
+
+    def __init__(
+        self, maxsize: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._entry_dict: "OrderedDict[Any, _CacheEntry]" = OrderedDict()
+        self._pending_dict: Dict[Any, _PendingEntry] = {}
+        # Key: the thread id, value: the pending entry that the thread is waiting for
+        self._waiting_dict: Dict[int, _PendingEntry] = {}
+
+    def _get_entry(self, key: Any) -> Optional[_CacheEntry]:
+        entry = self._entry_dict.get(key)
+        if entry is None:
+            return None
+        if entry.expire_time is not None and entry.expire_time <= time.monotonic():
+            del self._entry_dict[key]
+            self._evictions += 1
+            return None
+        self._entry_dict.move_to_end(key)
+        return entry
+
+    def _is_waiting_for(self, pending: _PendingEntry, thread_id: int) -> bool:
+        """Whether the owner of the pending entry is waiting for the thread"""
+        owner = pending.owner
+        while owner != thread_id:
+            waiting_pending = self._waiting_dict.get(owner)
+            if waiting_pending is None:
+                return False
+            owner = waiting_pending.owner
+        return True
+
+    def get_or_create(
+        self, key: Any, create_func: Callable[[], Type[BaseModel]], file_name: str = ""
+    ) -> Type[BaseModel]:
+        """Return the model of the key, create it by create_func if it is not cached"""
+        thread_id = threading.get_ident()
+        while True:
+            with self._lock:
+                entry = self._get_entry(key)
+                if entry is not None:
+                    self._hits += 1
+                    return entry.model
+                pending = self._pending_dict.get(key)
+                if pending is None:
+                    self._misses += 1
+                    pending = _PendingEntry(thread_id)
+                    self._pending_dict[key] = pending
+                    break
+                if self._is_waiting_for(pending, thread_id):
+                    raise WaitingToCompleteException(
+                        f"The model:{key} is being generated"
+                    )
+                self._waiting_dict[thread_id] = pending
+            pending.event.wait()
+            with self._lock:
+                self._waiting_dict.pop(thread_id, None)
+            # The model may fail to be created by the owner thread, so try again
+
+        try:
+            model = create_func()
+            with self._lock:
+                self._set(key, model, file_name)
+            return model
+        finally:
+            with self._lock:
+                self._pending_dict.pop(key, None)
+            pending.event.set()
+
+    def _set(self, key: Any, model: Type[BaseModel], file_name: str = "") -> None:
+        expire_time = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entry_dict[key] = _CacheEntry(model, file_name, expire_time)
+        self._entry_dict.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._entry_dict) > self.maxsize:
+                self._entry_dict.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_file(self, file_name: str) -> int:
+        """Remove the models of the messages in the Protobuf file, return the count"""
+        with self._lock:
+            key_list = [
+                key
+                for key, entry in self._entry_dict.items()
+                if entry.file_name == file_name
+            ]
+            for key in key_list:
+                del self._entry_dict[key]
+        return len(key_list)
+
+    def cache_info(self) -> ModelCacheInfo:
+        return ModelCacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self.maxsize,
+            len(self._entry_dict),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry_dict.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    # Compatible with the dict cache
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._get_entry(key)
+        return default if entry is None else entry.model
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: Any) -> Type[BaseModel]:
+        model = self.get(key)
+        if model is None:
+            raise KeyError(key)
+        return model
+
+    def __setitem__(self, key: Any, model: Type[BaseModel]) -> None:
+        with self._lock:
+            self._set(key, model)
+
+    def __len__(self) -> int:
+        return len(self._entry_dict)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._entry_dict))
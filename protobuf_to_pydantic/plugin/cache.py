@@ -0,0 +1,193 @@
+import hashlib
+import inspect
+import logging
+import os
+import pathlib
+import re
+import tempfile
+import types
+from collections import deque
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from protobuf_to_pydantic.grpc_types import FileDescriptorProto
+from protobuf_to_pydantic.util import get_formatter
+
+logger = logging.getLogger(__name__)
+
+# The generated code depends on these packages, so their versions are part of the cache key
+_VERSION_PACKAGE_LIST: List[str] = [
+    "protobuf_to_pydantic",
+    "pydantic",
+    "protobuf",
+    "black",
+    "isort",
+    "autoflake",
+    "ruff",
+]
+# Remove the memory address in the default repr of an object, e.g. `<Foo object at 0x7f...>`
+_ADDRESS_RE = re.compile(r" at 0x[0-9a-fA-F]+")
+# Fields that are derived from other fields, or that are not related to the generated code
+_IGNORE_CONFIG_FIELD_SET: Set[str] = {"template_instance", "max_workers", "cache_dir"}
+
+
+def _get_package_version(package_name: str) -> str:
+    try:
+        return version(package_name)
+    except PackageNotFoundError:
+        return ""
+
+
+def _get_source_digest(obj: Any) -> str:
+    """Get the digest of the source code of the object defined by the user, so that the cache is updated after the
+    user modifies the code"""
+    module_name = getattr(obj, "__module__", "") or ""
+    if module_name.split(".")[0] in ("protobuf_to_pydantic", "builtins", "typing"):
+        # The version of these modules is already part of the cache key
+        return ""
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        return ""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def stable_repr(obj: Any) -> str:
+    """
+    Generate a repr that is the same between different processes, used to calculate the cache key of the config.
+
+    Unlike `repr`, the order of `set` and `dict` is fixed, and classes and functions are represented by their
+    import path (and the digest of their source code)
+    """
+    if isinstance(obj, BaseModel):
+        field_list = [
+            f"{key}={stable_repr(getattr(obj, key))}"
+            for key in sorted(type(obj).model_fields)
+            if key not in _IGNORE_CONFIG_FIELD_SET
+        ]
+        return f"{stable_repr(type(obj))}({', '.join(field_list)})"
+    elif isinstance(obj, dict):
+        item_list = sorted(
+            f"{stable_repr(k)}: {stable_repr(v)}" for k, v in obj.items()
+        )
+        return "{" + ", ".join(item_list) + "}"
+    elif isinstance(obj, (set, frozenset)):
+        return "{" + ", ".join(sorted(stable_repr(i) for i in obj)) + "}"
+    elif isinstance(obj, (list, tuple, deque)):
+        return f"{type(obj).__name__}[" + ", ".join(stable_repr(i) for i in obj) + "]"
+    elif isinstance(
+        obj, (type, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+    ):
+        name = f"{obj.__module__}.{getattr(obj, '__qualname__', repr(obj))}"
+        digest = _get_source_digest(obj)
+        return f"{name}#{digest}" if digest else name
+    elif isinstance(obj, types.ModuleType):
+        return f"module:{obj.__name__}"
+    return _ADDRESS_RE.sub("", repr(obj))
+
+
+class GenCodeCache(object):
+    """
+    Content-addressed cache of the code generated by the plugin.
+
+    The key of the cache is the hash of the following content:
+        - The serialized FileDescriptorProto and its transitive dependency FileDescriptorProto
+        - The effective config of the file (the config of the pkg if it is set in `pkg_config`)
+        - The content of the pyproject file used to format the code
+        - The version of protobuf_to_pydantic, pydantic, protobuf and the formatters
+    So the cache does not need to be cleaned up manually, and the cache file is only read when everything is the same
+    """
+
+    def __init__(self, cache_dir: str, salt: str = "") -> None:
+        self.cache_dir: pathlib.Path = pathlib.Path(cache_dir).absolute()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._version_digest: str = hashlib.sha256(
+            ",".join(
+                [salt]
+                + [
+                    f"{name}={_get_package_version(name)}"
+                    for name in _VERSION_PACKAGE_LIST
+                ]
+            ).encode()
+        ).hexdigest()
+        self._config_digest_dict: Dict[int, str] = {}
+        self._fd_digest_dict: Dict[str, str] = {}
+
+    def get_config_digest(self, config: BaseModel) -> str:
+        config_id = id(config)
+        if config_id not in self._config_digest_dict:
+            hash_obj = hashlib.sha256(stable_repr(config).encode())
+            formatter = get_formatter(getattr(config, "pyproject_file_path", ""))
+            hash_obj.update(formatter.pyproject_content.encode())
+            self._config_digest_dict[config_id] = hash_obj.hexdigest()
+        return self._config_digest_dict[config_id]
+
+    def get_fd_digest(
+        self, fd: FileDescriptorProto, fd_dict: Dict[str, FileDescriptorProto]
+    ) -> str:
+        """Get the digest of the fd and its transitive dependency fd"""
+        if fd.name in self._fd_digest_dict:
+            return self._fd_digest_dict[fd.name]
+
+        hash_obj = hashlib.sha256(fd.SerializeToString(deterministic=True))
+        for dependency in sorted(fd.dependency):
+            if dependency in fd_dict:
+                hash_obj.update(
+                    self.get_fd_digest(fd_dict[dependency], fd_dict).encode()
+                )
+            else:
+                hash_obj.update(dependency.encode())
+        self._fd_digest_dict[fd.name] = hash_obj.hexdigest()
+        return self._fd_digest_dict[fd.name]
+
+    def get_key(
+        self,
+        fd: FileDescriptorProto,
+        fd_dict: Dict[str, FileDescriptorProto],
+        config: BaseModel,
+    ) -> str:
+        hash_obj = hashlib.sha256(self._version_digest.encode())
+        hash_obj.update(self.get_config_digest(config).encode())
+        hash_obj.update(self.get_fd_digest(fd, fd_dict).encode())
+        return hash_obj.hexdigest()
+
+    def get_model_key(
+        self,
+        fd: FileDescriptorProto,
+        fd_dict: Dict[str, FileDescriptorProto],
+        message_full_name: str,
+        option_digest: str,
+    ) -> str:
+        """Get the key of the model generated by `msg_to_pydantic_model` at runtime"""
+        hash_obj = hashlib.sha256(self._version_digest.encode())
+        hash_obj.update(option_digest.encode())
+        hash_obj.update(message_full_name.encode())
+        hash_obj.update(self.get_fd_digest(fd, fd_dict).encode())
+        return hash_obj.hexdigest()
+
+    def _get_path(self, key: str) -> pathlib.Path:
+        return self.cache_dir / key[:2] / f"{key}.py"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._get_path(key)
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Read cache file {path} error:{e}")
+            return None
+
+    def set(self, key: str, content: str) -> None:
+        path = self._get_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, then rename it, so that other processes never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Write cache file {path} error:{e}")
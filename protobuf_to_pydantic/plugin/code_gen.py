@@ -1,20 +1,23 @@
 import base64
 import importlib
 import logging
+import multiprocessing
+import os
 import pathlib
 import sys
 import traceback
 import types
-from typing import Callable, Dict, Generic, Optional, Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Generic, List, NamedTuple, Optional, Tuple, Type
 
-from google.protobuf.compiler.plugin_pb2 import (
-    CodeGeneratorRequest,
-    CodeGeneratorResponse,
-)
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest, CodeGeneratorResponse
 from mypy_protobuf.main import Descriptors, code_generation
 
+from protobuf_to_pydantic.grpc_types import FileDescriptorProto
+from protobuf_to_pydantic.plugin.cache import GenCodeCache
 from protobuf_to_pydantic.plugin.config import ConfigT, get_config_by_module
-from protobuf_to_pydantic.util import use_worker_dir_in_ctx
+from protobuf_to_pydantic.profiler import RecordDict, get_profile_output, profile_in_ctx, profiler
+from protobuf_to_pydantic.util import get_formatter, use_worker_dir_in_ctx
 
 # If want to parse option, need to import the corresponding file
 #   see details:https://stackoverflow.com/a/59301849
@@ -25,11 +28,39 @@ from protobuf_to_pydantic.protos.protos.validate_pb2 import *  # isort:skip
 logger = logging.getLogger(__name__)
 
 
+class GenFileResult(NamedTuple):
+    file_name: str
+    content: str
+    # If False, the content has not been formatted and needs to be formatted in batch
+    formatted: bool
+    cache_key: str
+    pyproject_file_path: str
+
+
+# The state shared with the worker processes created by `fork`,
+#   set by the parent process before the pool is created, so that the config and descriptors do not need to be pickled
+_fork_code_gen_state: Optional[Tuple["CodeGen", Descriptors]] = None
+
+
+def _gen_file_in_fork_worker(
+    fd_name: str,
+) -> Tuple[Optional[GenFileResult], RecordDict]:
+    """Generate the file in the worker process, return the result and the profile records of the file"""
+    if _fork_code_gen_state is None:
+        raise RuntimeError("The worker process does not inherit the state of CodeGen")
+    code_gen, descriptors = _fork_code_gen_state
+    # The records inherited from the parent process or of the previous file are dropped
+    profiler.pop_record_dict()
+    result = code_gen.gen_file(descriptors.files[fd_name], descriptors)
+    return result, profiler.pop_record_dict()
+
+
 class CodeGen(Generic[ConfigT]):
     config: ConfigT
 
     def __init__(self, config_class: Type[ConfigT]) -> None:
         self.config_class: Type[ConfigT] = config_class
+        self.gen_code_cache: Optional[GenCodeCache] = None
 
         with code_generation() as (request, response):
             self.param_dict = self.gen_param_from_request(request)
@@ -71,9 +102,7 @@ class CodeGen(Generic[ConfigT]):
         if not path_obj.exists():
             raise SystemError(f"Can not find config file at {path_obj}")
         if "config_worker_dir_path" in self.param_dict:
-            worker_dir_path_obj: pathlib.Path = pathlib.Path(
-                self.param_dict["config_worker_dir_path"]
-            ).absolute()
+            worker_dir_path_obj: pathlib.Path = pathlib.Path(self.param_dict["config_worker_dir_path"]).absolute()
             if not worker_dir_path_obj.exists():
                 raise SystemError(f"Can not find worker dir at {worker_dir_path_obj}")
             worker_dir_path = str(worker_dir_path_obj)
@@ -99,13 +128,9 @@ class CodeGen(Generic[ConfigT]):
 
             error_path_dict: dict = {}
             for module_path in try_import_module_path_list:
-                module_path = (
-                    module_path.replace("/", ".").replace("\\", ".").replace(".py", "")
-                )
+                module_path = module_path.replace("/", ".").replace("\\", ".").replace(".py", "")
                 try:
-                    self.config = get_config_by_module(
-                        importlib.import_module(module_path), self.config_class
-                    )
+                    self.config = get_config_by_module(importlib.import_module(module_path), self.config_class)
                     break
                 except ModuleNotFoundError as e:
                     error_path_dict[module_path] = {
@@ -113,9 +138,7 @@ class CodeGen(Generic[ConfigT]):
                         "traceback": traceback.format_exc(),
                     }
         if self.config == default_config:
-            raise SystemError(
-                f"Load config error. try use path and error:{error_path_dict}"
-            )
+            raise SystemError(f"Load config error. try use path and error:{error_path_dict}")
 
     def _get_config_by_py_code(self, key: str) -> None:
         """
@@ -124,9 +147,7 @@ class CodeGen(Generic[ConfigT]):
             Except in special cases such as buf, it is not recommended to use this form to get config
         """
         try:
-            plugin_config_module_name = self.param_dict.get(
-                "plugin_config_module_name", ""
-            )
+            plugin_config_module_name = self.param_dict.get("plugin_config_module_name", "")
             plugin_config_module: Optional[types.ModuleType] = None
             if plugin_config_module_name:
                 error_str_list = [".py", "/", "\\"]
@@ -151,15 +172,11 @@ class CodeGen(Generic[ConfigT]):
                 module_global_dict,
             )
             if plugin_config_module:
-                self.config = get_config_by_module(
-                    plugin_config_module, self.config_class
-                )
+                self.config = get_config_by_module(plugin_config_module, self.config_class)
             else:
                 for key in ["local_dict", "base_model_class"]:
                     if key in self.param_dict and not plugin_config_module_name:
-                        raise SystemError(
-                            f"When using config--{key}, must specify the plugin_config_module_name"
-                        )
+                        raise SystemError(f"When using config--{key}, must specify the plugin_config_module_name")
                 self.config = self.config_class(**module_global_dict)
         except Exception as e:
             raise SystemError(f"Load config error:{e}. try check code")
@@ -174,18 +191,178 @@ class CodeGen(Generic[ConfigT]):
             if param_name in self.param_dict:
                 param_func(param_name)
 
-    def generate_pydantic_model(
-        self, descriptors: Descriptors, response: CodeGeneratorResponse
-    ) -> None:
-        for name, fd in descriptors.to_generate.items():
-            config = self.config.pkg_config.get(fd.package, self.config)
-            if fd.package in config.ignore_pkg_list:
-                continue
+    def get_max_workers(self) -> int:
+        """
+        Get the number of processes used to generate files.
+
+        The `parallel` parameter passed by the command line has a higher priority than `config.max_workers`,
+        and 0 means use the number of CPUs
+            protoc -I. --protobuf-to-pydantic_out=parallel=8:. example.proto
+        """
+        if "parallel" in self.param_dict:
+            try:
+                max_workers = int(self.param_dict["parallel"])
+            except ValueError:
+                raise SystemError(f"parallel param must be int, not {self.param_dict['parallel']}")
+        else:
+            max_workers = self.config.max_workers
+        if max_workers <= 0:
+            max_workers = os.cpu_count() or 1
+        return max_workers
+
+    def get_gen_code_cache(self) -> Optional[GenCodeCache]:
+        """
+        Get the cache of the generated code, the cache is disabled if the cache dir is not set.
+
+        The `cache_dir` parameter passed by the command line has a higher priority than `config.cache_dir`
+            protoc -I. --protobuf-to-pydantic_out=cache_dir=.p2p_cache:. example.proto
+        """
+        cache_dir = self.param_dict.get("cache_dir", self.config.cache_dir)
+        if not cache_dir:
+            return None
+        print(f"Use cache dir: {cache_dir}", file=sys.stderr)
+        # The functions in the config loaded from py code have no source file,
+        # so the py code is also part of the cache key
+        return GenCodeCache(cache_dir, salt=self.param_dict.get("plugin_config_py_code_base64", ""))
+
+    def gen_file(
+        self,
+        fd: FileDescriptorProto,
+        descriptors: Descriptors,
+        format_content: Optional[bool] = None,
+    ) -> Optional[GenFileResult]:
+        """
+        Generate the file name and content of the fd, return None if the fd is ignored
+
+        :param format_content: Whether to format the content immediately,
+            if None, the content is formatted immediately only if the formatter does not support batch formatting
+        """
+        config = self.config.pkg_config.get(fd.package, self.config)
+        if fd.package in config.ignore_pkg_list:
+            return None
+        file_name = fd.name[:-6].replace("-", "_").replace(".", "/") + f"{config.file_name_suffix}.py"
+        with profiler.phase(f"file:{fd.name}"):
+            return self._gen_file(fd, descriptors, config, file_name, format_content)
+
+    def _gen_file(
+        self,
+        fd: FileDescriptorProto,
+        descriptors: Descriptors,
+        config: ConfigT,
+        file_name: str,
+        format_content: Optional[bool],
+    ) -> GenFileResult:
+        cache_key: str = ""
+        if self.gen_code_cache:
+            with profiler.phase("cache"):
+                cache_key = self.gen_code_cache.get_key(fd, descriptors.files, config)
+                content = self.gen_code_cache.get(cache_key)
+            if content is not None:
+                return GenFileResult(file_name, content, True, cache_key, config.pyproject_file_path)
+
+        with profiler.phase("descriptor walk"):
+            p2c = config.file_descriptor_proto_to_code(fd=fd, descriptors=descriptors, config=config)
+        if format_content is None:
+            format_content = not p2c.formatter.support_batch
+        if not format_content:
+            with profiler.phase("code assembly"):
+                raw_content = p2c.raw_content
+            return GenFileResult(file_name, raw_content, False, cache_key, config.pyproject_file_path)
+
+        # The formatting is recorded as the child phases of the code assembly
+        with profiler.phase("code assembly"):
+            content = p2c.content
+        if self.gen_code_cache:
+            self.gen_code_cache.set(cache_key, content)
+        return GenFileResult(file_name, content, True, cache_key, config.pyproject_file_path)
+
+    def format_gen_file_result(self, result_list: List[GenFileResult]) -> List[GenFileResult]:
+        """
+        Format the unformatted contents in batch,
+        the contents that use the same pyproject file are formatted together
+        """
+        index_dict: Dict[str, List[int]] = {}
+        for index, result in enumerate(result_list):
+            if not result.formatted:
+                index_dict.setdefault(result.pyproject_file_path, []).append(index)
+
+        result_list = list(result_list)
+        for pyproject_file_path, index_list in index_dict.items():
+            with profiler.phase("format"):
+                content_list = get_formatter(pyproject_file_path).format_many(
+                    [result_list[index].content for index in index_list]
+                )
+            for index, content in zip(index_list, content_list):
+                result = result_list[index]._replace(content=content, formatted=True)
+                if self.gen_code_cache:
+                    self.gen_code_cache.set(result.cache_key, content)
+                result_list[index] = result
+        return result_list
+
+    def _parallel_gen_file(
+        self,
+        fd_list: List[FileDescriptorProto],
+        descriptors: Descriptors,
+        max_workers: int,
+    ) -> List[Optional[GenFileResult]]:
+        """
+        Generate files by process pool, the order of result is the same as `fd_list`.
+
+        Worker processes are created by `fork` and inherit the loaded config and descriptors,
+        so only the file name and the generated content are transferred between processes
+        """
+        global _fork_code_gen_state
+
+        _fork_code_gen_state = (self, descriptors)
+        result_list: List[Optional[GenFileResult]] = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                for result, record_dict in executor.map(
+                    _gen_file_in_fork_worker,
+                    [fd.name for fd in fd_list],
+                    chunksize=max(1, len(fd_list) // (max_workers * 4)),
+                ):
+                    result_list.append(result)
+                    profiler.merge_record_dict(record_dict)
+            return result_list
+        finally:
+            _fork_code_gen_state = None
+
+    def get_profile_output(self) -> str:
+        """
+        Get the output of the profile report, the profiler is disabled if it is empty.
+
+        The `profile` parameter passed by the command line has a higher priority than
+        the `P2P_PROFILE` environment variable, `1` means write the JSON report to stderr,
+        other values are the path of the report file
+            protoc -I. --protobuf-to-pydantic_out=profile=1:. example.proto
+            protoc -I. --protobuf-to-pydantic_out=profile=p2p.folded:. example.proto
+        """
+        return get_profile_output(self.param_dict.get("profile"))
+
+    def generate_pydantic_model(self, descriptors: Descriptors, response: CodeGeneratorResponse) -> None:
+        with profile_in_ctx(self.get_profile_output(), "protobuf-to-pydantic"):
+            self._generate_pydantic_model(descriptors, response)
+
+    def _generate_pydantic_model(self, descriptors: Descriptors, response: CodeGeneratorResponse) -> None:
+        self.gen_code_cache = self.get_gen_code_cache()
+        fd_list: List[FileDescriptorProto] = list(descriptors.to_generate.values())
+        max_workers = min(self.get_max_workers(), len(fd_list))
+        if max_workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("The current platform does not support `fork`, parallel generation is disabled")
+            max_workers = 1
+
+        result_list: List[Optional[GenFileResult]]
+        if max_workers > 1:
+            print(f"Generate files with {max_workers} processes", file=sys.stderr)
+            result_list = self._parallel_gen_file(fd_list, descriptors, max_workers)
+        else:
+            # Collect the unformatted contents first, and then format them in batch
+            result_list = [self.gen_file(fd, descriptors, format_content=False) for fd in fd_list]
+
+        for result in self.format_gen_file_result([result for result in result_list if result is not None]):
             file = response.file.add()
-            file.name = (
-                fd.name[:-6].replace("-", "_").replace(".", "/")
-                + f"{config.file_name_suffix}.py"
-            )
-            file.content = config.file_descriptor_proto_to_code(
-                fd=fd, descriptors=descriptors, config=config
-            ).content
+            file.name = result.file_name
+            file.content = result.content
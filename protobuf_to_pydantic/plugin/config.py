@@ -1,27 +1,13 @@
 import copy
 from collections import deque
-from typing import (
-    Any,
-    Callable,
-    Deque,
-    Dict,
-    List,
-    Optional,
-    Self,
-    Set,
-    Tuple,
-    Type,
-    TypeVar,
-)
+from typing import Any, Callable, Deque, Dict, List, Optional, Self, Set, Tuple, Type, TypeVar
 from warnings import warn
 
 from pydantic import BaseModel, Field
 
 from protobuf_to_pydantic import _pydantic_adapter
 from protobuf_to_pydantic.default_base_model import ProtobufCompatibleBaseModel
-from protobuf_to_pydantic.plugin.field_desc_proto_to_code import (
-    FileDescriptorProtoToCode,
-)
+from protobuf_to_pydantic.plugin.field_desc_proto_to_code import FileDescriptorProtoToCode
 from protobuf_to_pydantic.template import Template
 from protobuf_to_pydantic.util import get_dict_from_comment
 
@@ -39,9 +25,7 @@ class ProtobufTypeConfigModel(BaseModel):
 
 class SubConfigModel(BaseModel):
     module: Any
-    use_root_config: bool = Field(
-        default=False, description="If True, the root configuration will be inherited"
-    )
+    use_root_config: bool = Field(default=False, description="If True, the root configuration will be inherited")
 
 
 def default_comment_handler(
@@ -68,12 +52,8 @@ def default_comment_handler(
 
 class ConfigModel(BaseModel):
     # output code config
-    customer_import_set: Set[str] = Field(
-        default_factory=set, description="customer import code set"
-    )
-    customer_deque: Deque = Field(
-        default_factory=deque, description="customer file content"
-    )
+    customer_import_set: Set[str] = Field(default_factory=set, description="customer import code set")
+    customer_deque: Deque = Field(default_factory=deque, description="customer file content")
     code_indent: int = Field(default=4, description="Code indent")
     module_path: str = Field(default="", description="protobuf project path")
     pyproject_file_path: str = Field(
@@ -89,15 +69,9 @@ class ConfigModel(BaseModel):
     )
 
     # gen message config
-    local_dict: dict = Field(
-        default_factory=dict, description="Dict for local variables"
-    )
-    template: Type[Template] = Field(
-        default=Template, description="Support more templates by customizing 'Template'"
-    )
-    comment_handler: Optional[
-        Callable[[str, str, "ConfigModel"], Tuple[dict, str, str]]
-    ] = Field(
+    local_dict: dict = Field(default_factory=dict, description="Dict for local variables")
+    template: Type[Template] = Field(default=Template, description="Support more templates by customizing 'Template'")
+    comment_handler: Optional[Callable[[str, str, "ConfigModel"], Tuple[dict, str, str]]] = Field(
         default=default_comment_handler,
         description="Customize the comment parsing function. if None, not parse the comment",
     )
@@ -115,6 +89,20 @@ class ConfigModel(BaseModel):
     )
 
     # other config
+    max_workers: int = Field(
+        default=1,
+        description=(
+            "Number of processes used to generate files (plugin only), 0 means use the number of CPUs. "
+            "Only the root config takes effect, and it can be overridden by the `parallel` plugin parameter"
+        ),
+    )
+    cache_dir: str = Field(
+        default="",
+        description=(
+            "The dir of the generated code cache (plugin only), if empty, the cache is disabled. "
+            "Only the root config takes effect, and it can be overridden by the `cache_dir` plugin parameter"
+        ),
+    )
     file_descriptor_proto_to_code: Type[FileDescriptorProtoToCode] = Field(
         default=FileDescriptorProtoToCode,
         description="If you have modified the resolution rules, then you can customize FileDescriptorProtoToCode",
@@ -163,9 +151,7 @@ class ConfigModel(BaseModel):
 
     @_pydantic_adapter.model_validator(mode="after")
     def after_init(cls, values: Self) -> Self:
-        values.template_instance = values.template(
-            values.local_dict, values.comment_prefix
-        )
+        values.template_instance = values.template(values.local_dict, values.comment_prefix)
         return values
 
     @_pydantic_adapter.model_validator(mode="before")
@@ -180,9 +166,7 @@ class ConfigModel(BaseModel):
             return get_config_by_module(_values.module, ConfigModel, root_dict).dict()
 
         if "pkg_config" in values:
-            values["pkg_config"] = {
-                k: _validator(v) for k, v in values.get("pkg_config", {}).items()
-            }
+            values["pkg_config"] = {k: _validator(v) for k, v in values.get("pkg_config", {}).items()}
         if "parse_comment" in values or "comment_handler" in values:
             warning_msg = (
                 "The 'parse_comment' and 'comment_handler' configuration items are deprecated, "
@@ -192,9 +176,7 @@ class ConfigModel(BaseModel):
         return values
 
 
-def get_config_by_module(
-    module: Any, config_class: Type[ConfigT], root_dict: Optional[dict] = None
-) -> ConfigT:
+def get_config_by_module(module: Any, config_class: Type[ConfigT], root_dict: Optional[dict] = None) -> ConfigT:
     if root_dict:
         param_dict: dict = copy.deepcopy(root_dict)
     else:
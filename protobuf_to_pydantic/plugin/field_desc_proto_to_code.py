@@ -1,7 +1,9 @@
 import importlib
 import inspect
 import logging
+from collections import deque
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Type
 
@@ -25,13 +27,8 @@ from protobuf_to_pydantic.field_info_rule.field_info_param import (
 from protobuf_to_pydantic.field_info_rule.protobuf_option_to_field_info.comment import (
     gen_field_rule_info_dict_from_field_comment_dict,
 )
-from protobuf_to_pydantic.field_info_rule.protobuf_option_to_field_info.desc import (
-    gen_field_info_dict_from_field_desc,
-)
-from protobuf_to_pydantic.field_info_rule.types import (
-    FieldInfoTypedDict,
-    OneOfTypedDict,
-)
+from protobuf_to_pydantic.field_info_rule.protobuf_option_to_field_info.desc import gen_field_info_dict_from_field_desc
+from protobuf_to_pydantic.field_info_rule.types import FieldInfoTypedDict, OneOfTypedDict
 from protobuf_to_pydantic.gen_code import BaseP2C, FormatContainer
 from protobuf_to_pydantic.grpc_types import (
     AnyMessage,
@@ -41,10 +38,9 @@ from protobuf_to_pydantic.grpc_types import (
     FileDescriptorProto,
 )
 from protobuf_to_pydantic.plugin.my_types import ProtobufTypeModel
-from protobuf_to_pydantic.util import (
-    camel_to_snake,
-    pydantic_allow_validation_field_handler,
-)
+from protobuf_to_pydantic.plugin.source_code_info import get_source_code_info_index, is_default_comment_handler
+from protobuf_to_pydantic.profiler import profiler
+from protobuf_to_pydantic.util import camel_to_snake, pydantic_allow_validation_field_handler
 
 if TYPE_CHECKING:
     from protobuf_to_pydantic.plugin.config import ConfigModel
@@ -68,15 +64,41 @@ def remove_comment_last_n(content: str) -> str:
     return return_content
 
 
+@lru_cache(maxsize=4096)
+def get_relative_module_name(fd_name: str, other_fd_name: str, file_name_suffix: str) -> str:
+    """
+    Get the relative module name of other_fd imported by fd,
+    the result is cached, so it is only computed once for each pair of files
+    e.g:
+      fd name:example_proto/demo/demo.proto
+      other_fd name: example_proto/common/single.proto
+      output: ..common.single_p2p
+    """
+    fd_path_list: Tuple[str, ...] = Path(fd_name).parts
+    message_path_list: Tuple[str, ...] = Path(other_fd_name).parts
+    index: int = -1
+    for _index in range(min(len(fd_path_list), len(message_path_list))):
+        if message_path_list[_index] == fd_path_list[_index]:
+            index = _index
+    # common/a/name.proto includes common/b/include.proto
+    # The basic name: include_p2p
+    module_name: str = message_path_list[-1].replace(".proto", "") + file_name_suffix
+    # Add non-shared parts: b.include_p2p
+    module_name = ".".join(message_path_list[index + 1 : -1] + (module_name,))
+
+    logger.info((fd_name, other_fd_name, index))
+    # Add relative parts: ..b.include_p2p
+    # Always use relative parts
+    return "." * (len(fd_path_list) - (index + 1)) + module_name
+
+
 class FileDescriptorProtoToCode(BaseP2C):
-    def __init__(
-        self, fd: FileDescriptorProto, descriptors: Descriptors, config: "ConfigModel"
-    ):
-        # Prevent mutable variables from being shared with other configs
-        config = config.copy(deep=True)
+    def __init__(self, fd: FileDescriptorProto, descriptors: Descriptors, config: "ConfigModel"):
+        # The config is shared by all files and is only read,
+        # only the output containers are created for each file
         super().__init__(
-            customer_import_set=config.customer_import_set,
-            customer_deque=config.customer_deque,
+            customer_import_set=set(config.customer_import_set),
+            customer_deque=deque(config.customer_deque),
             module_path=config.module_path,
             code_indent=config.code_indent,
             pyproject_file_path=config.pyproject_file_path,
@@ -86,22 +108,20 @@ class FileDescriptorProtoToCode(BaseP2C):
         self._descriptors = descriptors
         self._desc_template = config.template_instance
         self._fd_root_desc_dict = {m.name: m for m in self._fd.message_type}
-        self.source_code_info_by_scl = {
-            tuple(location.path): location for location in fd.source_code_info.location
-        }
+        # Shared by the files of the plugin run, only the locations with comments
+        # are indexed, unless the customized comment handler is used
+        self.source_code_info_by_scl = get_source_code_info_index(
+            fd, comment_only=is_default_comment_handler(config.comment_handler)
+        )
 
         if config.base_model_class is BaseModel:
             self._import_set.add("from pydantic import BaseModel")
         else:
-            self._add_import_code(
-                config.base_model_class.__module__, config.base_model_class.__name__
-            )
+            self._add_import_code(config.base_model_class.__module__, config.base_model_class.__name__)
         self._model_cache: Dict[str, str] = {}
         self._parse_field_descriptor()
 
-    def _add_other_module_pkg(
-        self, other_fd: FileDescriptorProto, type_str: str
-    ) -> None:
+    def _add_other_module_pkg(self, other_fd: FileDescriptorProto, type_str: str) -> None:
         """
         Generate the corresponding import statement
         e.g:
@@ -111,25 +131,7 @@ class FileDescriptorProtoToCode(BaseP2C):
         """
         if other_fd.name == self._fd.name:
             return
-
-        fd_path_list: Tuple[str, ...] = Path(self._fd.name).parts
-        message_path_list: Tuple[str, ...] = Path(other_fd.name).parts
-        index: int = -1
-        for _index in range(min(len(fd_path_list), len(message_path_list))):
-            if message_path_list[_index] == fd_path_list[_index]:
-                index = _index
-        # common/a/name.proto includes common/b/include.proto
-        # The basic name: include_p2p
-        module_name: str = (
-            message_path_list[-1].replace(".proto", "") + self.config.file_name_suffix
-        )
-        # Add non-shared parts: b.include_p2p
-        module_name = ".".join(message_path_list[index + 1 : -1] + (module_name,))
-
-        logger.info((self._fd.name, other_fd.name, index))
-        # Add relative parts: ..b.include_p2p
-        # Always use relative parts
-        module_name = "." * (len(fd_path_list) - (index + 1)) + module_name
+        module_name = get_relative_module_name(self._fd.name, other_fd.name, self.config.file_name_suffix)
         self._add_import_code(module_name, type_str)
 
     # def _comment_handler(self, leading_comments: str, trailing_comments: str) -> Tuple[dict, str, str]:
@@ -151,9 +153,7 @@ class FileDescriptorProtoToCode(BaseP2C):
     #         trailing_comments = "\n".join(trailing_comments_list)
     #     return comment_info_dict, leading_comments, trailing_comments
 
-    def add_class_desc(
-        self, scl_prefix: SourceCodeLocation, indent: int = 0
-    ) -> Tuple[dict, str, str]:
+    def add_class_desc(self, scl_prefix: SourceCodeLocation, indent: int = 0) -> Tuple[dict, str, str]:
         desc_content = ""
         comment_content = ""
         comment_info_dict: dict = {}
@@ -163,12 +163,11 @@ class FileDescriptorProtoToCode(BaseP2C):
         scl = self.source_code_info_by_scl[tuple(scl_prefix)]
         if scl:
             if self.config.comment_handler:
-                comment_info_dict, leading_comments, trailing_comments = (
-                    self.config.comment_handler(
-                        scl.leading_comments,
-                        scl.trailing_comments,
-                        self.config,
-                    )
+                comment_info_dict, leading_comments, trailing_comments = self.source_code_info_by_scl.handle_comment(
+                    self.config.comment_handler,
+                    scl.leading_comments,
+                    scl.trailing_comments,
+                    self.config,
                 )
             else:
                 leading_comments = scl.leading_comments
@@ -210,29 +209,20 @@ class FileDescriptorProtoToCode(BaseP2C):
         if not enums:
             return []
         self._add_import_code("enum", "IntEnum")
-        self._add_import_code(
-            "protobuf_to_pydantic.flexible_enum_mixin", "FlexibleEnumMixin"
-        )
+        self._add_import_code("protobuf_to_pydantic.flexible_enum_mixin", "FlexibleEnumMixin")
 
         content_list = []
         for i, enum in enumerate(enums):
-            class_name = (
-                enum.name if enum.name not in PYTHON_RESERVED else "_r_" + enum.name
-            )
+            class_name = enum.name if enum.name not in PYTHON_RESERVED else "_r_" + enum.name
 
             content = " " * indent + f"class {class_name}(IntEnum, FlexibleEnumMixin):"
 
-            _, desc_content, comment_content = self.add_class_desc(
-                scl_prefix + [i], indent
-            )
+            _, desc_content, comment_content = self.add_class_desc(scl_prefix + [i], indent)
             if comment_content:
                 content += comment_content
             content += "\n" + desc_content
             for enum_item in enum.value:
-                content += (
-                    " " * (self.code_indent + indent)
-                    + f"{enum_item.name} = {enum_item.number}\n"
-                )
+                content += " " * (self.code_indent + indent) + f"{enum_item.name} = {enum_item.number}\n"
             content_list.append(content)
         return content_list
 
@@ -251,9 +241,9 @@ class FileDescriptorProtoToCode(BaseP2C):
             if nested_message.options.map_entry:
                 # Some data of Map Entry in nested type array
                 continue
-            skip_validate_rule = skip_validate_rule or nested_message_config_dict.get(
-                nested_message.name, {}
-            ).get("skip", False)
+            skip_validate_rule = skip_validate_rule or nested_message_config_dict.get(nested_message.name, {}).get(
+                "skip", False
+            )
             content_list.append(
                 self._message(
                     desc=nested_message,
@@ -348,21 +338,15 @@ class FileDescriptorProtoToCode(BaseP2C):
                 rule_type_str = protobuf_type_model.rule_type_str
                 nested_message_name = type_str
                 use_custom_type = protobuf_type_model.use_custom_type
-                field_info_default_factory_value = FormatContainer(
-                    protobuf_type_model.type_factory
-                )
+                field_info_default_factory_value = FormatContainer(protobuf_type_model.type_factory)
 
-                message_fd: FileDescriptorProto = self._descriptors.message_to_fd[
-                    field.type_name
-                ]
+                message_fd: FileDescriptorProto = self._descriptors.message_to_fd[field.type_name]
                 self._add_other_module_pkg(message_fd, type_str)
                 root_desc_nested_type_name = {i.name for i in root_desc.nested_type}
                 desc_nested_type_name = {i.name for i in desc.nested_type}
                 if message == desc:
                     # if self-referencing, need use Python type hints postponed annotations
-                    field_info_default_factory_value = FormatContainer(
-                        f"lambda : {type_str}()"
-                    )
+                    field_info_default_factory_value = FormatContainer(f"lambda : {type_str}()")
                     type_str = f'"{type_str}"'
                 elif (
                     message_fd.name == self._fd.name
@@ -387,14 +371,10 @@ class FileDescriptorProtoToCode(BaseP2C):
                             )
                         )
                     except WaitingToCompleteException:
-                        field_info_default_factory_value = FormatContainer(
-                            f"lambda : {type_str}()"
-                        )
+                        field_info_default_factory_value = FormatContainer(f"lambda : {type_str}()")
                         type_str = f'"{type_str}"'
                 elif type_str in root_desc_nested_type_name:
-                    field_info_default_factory_value = FormatContainer(
-                        f"lambda : {root_desc.name}.{type_str}()"
-                    )
+                    field_info_default_factory_value = FormatContainer(f"lambda : {root_desc.name}.{type_str}()")
                     # I don't want to maintain complex dependencies, so I'll just use strings type hints here
                     type_str = f'"{root_desc.name}.{type_str}"'
         elif field.type == 14:
@@ -413,17 +393,13 @@ class FileDescriptorProtoToCode(BaseP2C):
             logger.error(f"Not found {field.type} in type_dict")
             return None
         else:
-            field_info_default_value = python_type_default_value_dict[
-                protobuf_desc_python_type_dict[field.type]
-            ]
+            field_info_default_value = python_type_default_value_dict[protobuf_desc_python_type_dict[field.type]]
             protobuf_type_model = self._get_protobuf_type_model(field)
             use_custom_type = protobuf_type_model.use_custom_type
             type_str = protobuf_type_model.py_type_str
             rule_type_str = protobuf_type_model.rule_type_str
 
-        if field.label == field.LABEL_REPEATED and not field.type_name.endswith(
-            "Entry"
-        ):
+        if field.label == field.LABEL_REPEATED and not field.type_name.endswith("Entry"):
             # repeated support
             self._add_import_code("typing")
             type_str = f"typing.List[{type_str}]"
@@ -433,12 +409,11 @@ class FileDescriptorProtoToCode(BaseP2C):
 
         field_info_dict: FieldInfoTypedDict = {}  # type: ignore[typeddict-item]
         if self.config.comment_handler:
-            comment_field_info_dict, leading_comments, trailing_comments = (
-                self.config.comment_handler(
-                    leading_comments,
-                    trailing_comments,
-                    self.config,
-                )
+            comment_field_info_dict, leading_comments, trailing_comments = self.source_code_info_by_scl.handle_comment(
+                self.config.comment_handler,
+                leading_comments,
+                trailing_comments,
+                self.config,
             )
         else:
             comment_field_info_dict = {}
@@ -447,18 +422,11 @@ class FileDescriptorProtoToCode(BaseP2C):
             field_info_dict.update(comment_field_info_dict)  # type: ignore[typeddict-item]
             if len(field.options.ListFields()) != 0 and rule_type_str:
                 # protobuf option support
-                field_info_dict.update(
-                    gen_field_info_dict_from_field_desc(
-                        rule_type_str, field.name, field
-                    )
-                )
-                field_info_dict = self._desc_template.handle_template_var(
-                    field_info_dict
-                )
+                with profiler.phase("option parsing"):
+                    field_info_dict.update(gen_field_info_dict_from_field_desc(rule_type_str, field.name, field))
+                field_info_dict = self._desc_template.handle_template_var(field_info_dict)
             elif field_info_dict:
-                field_info_dict = self._desc_template.handle_template_var(
-                    field_info_dict
-                )
+                field_info_dict = self._desc_template.handle_template_var(field_info_dict)
                 field_info_dict = gen_field_rule_info_dict_from_field_comment_dict(
                     field_info_dict,
                     field,
@@ -513,7 +481,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             # Note: we specifically check for 'default' and 'default_factory' keys,
             # not just any content in field_info_dict (which may include alias settings)
             has_explicit_default = (
-                "default" in field_info_dict 
+                "default" in field_info_dict
                 or "default_factory" in field_info_dict
                 or "default_template" in field_info_dict
             )
@@ -521,7 +489,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                 # No user-provided default, so use None for optional fields
                 field_info_default_value = None
                 field_info_default_factory_value = None
-                    
+
         if (
             field_info_dict
             or field_info_default_value is not _pydantic_adapter.PydanticUndefined
@@ -560,9 +528,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             #           'shim': None
             #       }
             #   }
-            validator_handle_content += self._validator_handle(
-                raw_validator_dict, self.code_indent + indent
-            )
+            validator_handle_content += self._validator_handle(raw_validator_dict, self.code_indent + indent)
 
         # type support
         type_: Any = field_info_dict.pop("type_", None)
@@ -579,15 +545,11 @@ class FileDescriptorProtoToCode(BaseP2C):
             if "keys" in map_type_dict:
                 key_type_str = self._get_value_code(map_type_dict["keys"])
             else:
-                key_type_str = self._get_protobuf_type_model(
-                    message.field[0]
-                ).py_type_str
+                key_type_str = self._get_protobuf_type_model(message.field[0]).py_type_str
             if "values" in map_type_dict:
                 value_type_str = self._get_value_code(map_type_dict["values"])
             else:
-                value_type_str = self._get_protobuf_type_model(
-                    message.field[1]
-                ).py_type_str
+                value_type_str = self._get_protobuf_type_model(message.field[1]).py_type_str
             self._add_import_code("typing")
             type_str = f"typing.Dict[{key_type_str}, {value_type_str}]"
 
@@ -632,7 +594,6 @@ class FileDescriptorProtoToCode(BaseP2C):
                         field.name, alias, sub_one_of_dict["fields"], model_config_dict
                     )
 
-            
         field_info_str: str = (
             ", ".join(
                 [
@@ -644,8 +605,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             or ""
         )
         class_field_content: str = (
-            " " * (self.code_indent + indent)
-            + f"{field.name}: {type_str} = {field_name}({field_info_str})"
+            " " * (self.code_indent + indent) + f"{field.name}: {type_str} = {field_name}({field_info_str})"
         )
         leading_comments = remove_comment_last_n(leading_comments)
         trailing_comments = remove_comment_last_n(trailing_comments)
@@ -737,10 +697,7 @@ class FileDescriptorProtoToCode(BaseP2C):
 
         for index, one_of_item in enumerate(desc.oneof_decl):
             # if field is proto3_optional, ignore
-            if (
-                one_of_item.name.startswith("_")
-                and one_of_item.name[1:] in optional_dict
-            ):
+            if one_of_item.name.startswith("_") and one_of_item.name[1:] in optional_dict:
                 continue
 
             option_dict: OneOfTypedDict = {}  # type: ignore[typeddict-item]
@@ -760,18 +717,15 @@ class FileDescriptorProtoToCode(BaseP2C):
                     ) in option_value.ListFields():
                         if one_of_extend_field_descriptor.name == "optional":
                             for one_of_optional_name in result:
-                                optional_dict[one_of_optional_name] = {
-                                    "is_proto3_optional": True
-                                }
+                                optional_dict[one_of_optional_name] = {"is_proto3_optional": True}
 
             scl = self.source_code_info_by_scl.get(tuple(scl_prefix + [index]))
             if scl and self.config.comment_handler:
-                comment_info_dict, leading_comments, trailing_comments = (
-                    self.config.comment_handler(
-                        scl.leading_comments,
-                        scl.trailing_comments,
-                        self.config,
-                    )
+                comment_info_dict, leading_comments, trailing_comments = self.source_code_info_by_scl.handle_comment(
+                    self.config.comment_handler,
+                    scl.leading_comments,
+                    scl.trailing_comments,
+                    self.config,
                 )
             else:
                 comment_info_dict = {}
@@ -790,9 +744,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                     ) in one_of_comment_option_value.items():
                         if one_of_extend_key == "optional":
                             for one_of_optional_name in one_of_extend_value:
-                                optional_dict[one_of_optional_name] = {
-                                    "is_proto3_optional": True
-                                }
+                                optional_dict[one_of_optional_name] = {"is_proto3_optional": True}
             # if self.config.parse_comment and comment:
             #     for line in comment.leading_comments.split("\n"):
             #         one_of_comment_dict = get_dict_from_comment(self.config.comment_prefix, line)
@@ -856,10 +808,10 @@ class FileDescriptorProtoToCode(BaseP2C):
                     continue
 
                 field = field_map[field_name]
-                variant_class_name = (
-                    f"{desc.name}{oneof_name.title()}{field_name.title()}"
+                variant_class_name = f"{desc.name}{oneof_name.title()}{field_name.title()}"
+                variant_content = (
+                    f"\n{' ' * indent}class {variant_class_name}({self.config.base_model_class.__name__}):\n"
                 )
-                variant_content = f"\n{' ' * indent}class {variant_class_name}({self.config.base_model_class.__name__}):\n"
                 variant_content += f'{" " * (indent + self.code_indent)}"""Variant when \'{field_name}\' is set in {oneof_name} oneof."""\n'
                 variant_content += f'{" " * (indent + self.code_indent)}{discriminator_name}: Literal["{field_name}"] = Field(default="{field_name}", exclude=True)\n'
 
@@ -886,9 +838,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                             pass  # Import already handled by _get_protobuf_type_model
                         else:
                             # Add import for custom message types
-                            message_fd = self._descriptors.message_to_fd[
-                                field.type_name
-                            ]
+                            message_fd = self._descriptors.message_to_fd[field.type_name]
                             # Check if it's in the same file - if so, use string annotation to handle forward references
                             if message_fd.name == self._fd.name:
                                 field_type = f'"{field_type}"'
@@ -908,9 +858,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                     # Primitive types
                     field_type = self._get_field_type_str(field)
 
-                variant_content += (
-                    f"{' ' * (indent + self.code_indent)}{field_name}: {field_type}\n"
-                )
+                variant_content += f"{' ' * (indent + self.code_indent)}{field_name}: {field_type}\n"
 
                 union_classes_content += variant_content
                 variant_types.append(variant_class_name)
@@ -919,7 +867,9 @@ class FileDescriptorProtoToCode(BaseP2C):
             if not oneof_config.get("required", False):
                 none_variant_name = f"{desc.name}{oneof_name.title()}None"
                 none_content = f"\n{' ' * indent}class {none_variant_name}({self.config.base_model_class.__name__}):\n"
-                none_content += f'{" " * (indent + self.code_indent)}"""Variant when no field is set in {oneof_name} oneof."""\n'
+                none_content += (
+                    f'{" " * (indent + self.code_indent)}"""Variant when no field is set in {oneof_name} oneof."""\n'
+                )
                 none_content += f"{' ' * (indent + self.code_indent)}{discriminator_name}: Literal[None] = None\n"
 
                 union_classes_content += none_content
@@ -1000,9 +950,7 @@ class FileDescriptorProtoToCode(BaseP2C):
         indent: int = 0,
         skip_validate_rule: bool = False,
     ) -> str:
-        class_name = (
-            desc.name if desc.name not in PYTHON_RESERVED else "_r_" + desc.name
-        )
+        class_name = desc.name if desc.name not in PYTHON_RESERVED else "_r_" + desc.name
         if class_name in self._fd_root_desc_dict:
             use_model_cache = self._model_cache
         else:
@@ -1010,18 +958,14 @@ class FileDescriptorProtoToCode(BaseP2C):
 
         if class_name in use_model_cache:
             if not use_model_cache[class_name]:
-                raise WaitingToCompleteException(
-                    f"The model:{class_name} is being generated"
-                )
+                raise WaitingToCompleteException(f"The model:{class_name} is being generated")
             return use_model_cache[class_name]
         else:
             use_model_cache[class_name] = ""
 
         this_level_model_cache: Dict[str, str] = {}
         self._add_import_code("google.protobuf.message", "Message")
-        comment_info_dict, desc_content, comment_content = self.add_class_desc(
-            scl_prefix, indent
-        )
+        comment_info_dict, desc_content, comment_content = self.add_class_desc(scl_prefix, indent)
 
         # We'll determine base classes after one_of_dict is defined
         class_name_content = None  # Will be set later
@@ -1071,9 +1015,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                     # Proto3 optional fields create synthetic oneofs with a single field that is marked as proto3_optional
                     if len(oneof_fields) == 1:
                         field_name = next(iter(oneof_fields))
-                        if optional_dict.get(field_name, {}).get(
-                            "is_proto3_optional", False
-                        ):
+                        if optional_dict.get(field_name, {}).get("is_proto3_optional", False):
                             continue  # Skip this oneof - it's a proto3 optional synthetic oneof
 
                     one_of_dict[oneof_key] = {"required": False, "fields": oneof_fields}
@@ -1086,21 +1028,17 @@ class FileDescriptorProtoToCode(BaseP2C):
                 # Skip proto3 optional synthetic oneofs
                 if len(oneof_fields) == 1:
                     field_name = next(iter(oneof_fields))
-                    if optional_dict.get(field_name, {}).get(
-                        "is_proto3_optional", False
-                    ):
+                    if optional_dict.get(field_name, {}).get("is_proto3_optional", False):
                         continue  # Skip this oneof - it's a proto3 optional synthetic oneof
                 filtered_one_of_dict[oneof_key] = oneof_config
 
-            union_classes_content, union_types_content, exclude_map = (
-                self._generate_discriminated_union_classes(
-                    desc,
-                    root_desc,
-                    filtered_one_of_dict,
-                    optional_dict,
-                    indent,
-                    field_map,
-                )
+            union_classes_content, union_types_content, exclude_map = self._generate_discriminated_union_classes(
+                desc,
+                root_desc,
+                filtered_one_of_dict,
+                optional_dict,
+                indent,
+                field_map,
             )
 
             # Collect all fields to exclude from main class
@@ -1110,9 +1048,7 @@ class FileDescriptorProtoToCode(BaseP2C):
         # Now we can set the class name content with proper base classes
         base_classes = [self.config.base_model_class.__name__]
 
-        class_name_content = (
-            " " * indent + f"class {class_name}({', '.join(base_classes)}):"
-        )
+        class_name_content = " " * indent + f"class {class_name}({', '.join(base_classes)}):"
         if comment_content_to_add:
             class_name_content += comment_content_to_add
 
@@ -1165,9 +1101,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             # Pydantic V2 output:
             #   model_config = ConfigDict(arbitrary_types_allowed=False)
             attr_str = ", ".join([f"{k}={v}" for k, v in pydantic_config_dict.items()])
-            class_var_str_list.append(
-                f"{' ' * (indent + self.code_indent)}model_config = ConfigDict({attr_str})"
-            )
+            class_var_str_list.append(f"{' ' * (indent + self.code_indent)}model_config = ConfigDict({attr_str})")
             self._add_import_code("pydantic", "ConfigDict")
 
         class_head_content += "\n".join(class_sub_c_str_list)
@@ -1220,41 +1154,30 @@ class FileDescriptorProtoToCode(BaseP2C):
                             # Found the main class, now find where to insert union fields
                             j = i + 1
                             while j < len(content_lines):
-                                if content_lines[j].strip().startswith(
-                                    '"""'
-                                ) or content_lines[j].strip().startswith("'''"):
+                                if content_lines[j].strip().startswith('"""') or content_lines[j].strip().startswith(
+                                    "'''"
+                                ):
                                     # Skip docstring
-                                    quote = (
-                                        '"""'
-                                        if content_lines[j].strip().startswith('"""')
-                                        else "'''"
-                                    )
-                                    if (
-                                        content_lines[j].strip().endswith(quote)
-                                        and len(content_lines[j].strip()) > 3
-                                    ):
+                                    quote = '"""' if content_lines[j].strip().startswith('"""') else "'''"
+                                    if content_lines[j].strip().endswith(quote) and len(content_lines[j].strip()) > 3:
                                         # Single line docstring
                                         j += 1
                                         break
                                     else:
                                         # Multi-line docstring
                                         j += 1
-                                        while j < len(
-                                            content_lines
-                                        ) and not content_lines[j].strip().endswith(
-                                            quote
-                                        ):
+                                        while j < len(content_lines) and not content_lines[j].strip().endswith(quote):
                                             j += 1
                                         j += 1
                                         break
-                                elif content_lines[j].strip() and content_lines[
-                                    j
-                                ].startswith(" " * (indent + self.code_indent)):
+                                elif content_lines[j].strip() and content_lines[j].startswith(
+                                    " " * (indent + self.code_indent)
+                                ):
                                     # Found a class member, insert before it
                                     break
-                                elif content_lines[j].strip() and not content_lines[
-                                    j
-                                ].startswith(" " * (indent + self.code_indent)):
+                                elif content_lines[j].strip() and not content_lines[j].startswith(
+                                    " " * (indent + self.code_indent)
+                                ):
                                     # Hit something that's not properly indented for class content (next class)
                                     break
                                 j += 1
@@ -1262,9 +1185,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                             break
 
                     if insertion_point >= 0:
-                        content_lines.insert(
-                            insertion_point, union_fields_content.rstrip()
-                        )
+                        content_lines.insert(insertion_point, union_fields_content.rstrip())
 
                         # Add discriminated union field configuration
                         union_fields = {}
@@ -1281,9 +1202,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                                 # Simple conversion: location_value -> locationValue
                                 parts = field.split("_")
                                 if len(parts) > 1:
-                                    camel_case = parts[0] + "".join(
-                                        word.capitalize() for word in parts[1:]
-                                    )
+                                    camel_case = parts[0] + "".join(word.capitalize() for word in parts[1:])
                                     aliases[camel_case] = field
 
                             union_fields[oneof_name] = {
@@ -1300,9 +1219,7 @@ class FileDescriptorProtoToCode(BaseP2C):
                             # Find the end of the class to add the configuration
                             end_of_class = len(content_lines)
                             for i in range(insertion_point + 1, len(content_lines)):
-                                if content_lines[i].strip() and not content_lines[
-                                    i
-                                ].startswith(" " * indent):
+                                if content_lines[i].strip() and not content_lines[i].startswith(" " * indent):
                                     # Found the next class or top-level code
                                     end_of_class = i
                                     break
@@ -1310,12 +1227,8 @@ class FileDescriptorProtoToCode(BaseP2C):
                             # Insert configuration after union fields
                             if end_of_class > insertion_point:
                                 # Insert config first, then validator
-                                content_lines.insert(
-                                    insertion_point + 1, config_content
-                                )
-                                content_lines.insert(
-                                    insertion_point + 2, validator_content
-                                )
+                                content_lines.insert(insertion_point + 1, config_content)
+                                content_lines.insert(insertion_point + 2, validator_content)
 
                         content = "\n".join(content_lines)
         else:
@@ -1337,9 +1250,7 @@ class FileDescriptorProtoToCode(BaseP2C):
         use_model_cache[class_name] = content
         return content
 
-    def _get_protobuf_type_model(
-        self, field: FieldDescriptorProto
-    ) -> ProtobufTypeModel:
+    def _get_protobuf_type_model(self, field: FieldDescriptorProto) -> ProtobufTypeModel:
         def _get_type_factory(module_name: str, message_name: str) -> Any:
             try:
                 return getattr(importlib.import_module(module_name), message_name)
@@ -1370,15 +1281,9 @@ class FileDescriptorProtoToCode(BaseP2C):
             if protobuf_type_config_key in self.config.protobuf_type_config:
                 # Through configuration, users can define the type of Protobuf they want
                 rule_type_str = "any"
-                use_custom_type = self.config.protobuf_type_config[
-                    protobuf_type_config_key
-                ].is_custom
-                type_module_name = self.config.protobuf_type_config[
-                    protobuf_type_config_key
-                ].module_name
-                _type_str = self.config.protobuf_type_config[
-                    protobuf_type_config_key
-                ].message_name
+                use_custom_type = self.config.protobuf_type_config[protobuf_type_config_key].is_custom
+                type_module_name = self.config.protobuf_type_config[protobuf_type_config_key].module_name
+                _type_str = self.config.protobuf_type_config[protobuf_type_config_key].message_name
                 py_type_str = _type_str  # rewrite py_type_str
                 type_factory = _get_type_factory(type_module_name, _type_str)
                 self._add_import_code(type_module_name, _type_str)
@@ -1421,13 +1326,9 @@ class FileDescriptorProtoToCode(BaseP2C):
                 if field.type_name in self._descriptors.message_to_fd:
                     message_fd = self._descriptors.message_to_fd[field.type_name]
                     # google/protobuf/wrappers.proto -> google.protobuf.wrappers_pb2
-                    type_module_name = (
-                        message_fd.name.split(".")[0].replace("/", ".") + "_pb2"
-                    )
+                    type_module_name = message_fd.name.split(".")[0].replace("/", ".") + "_pb2"
                 else:
-                    type_module_name = (
-                        "google.protobuf." + camel_to_snake(_type_str) + "_pb2"
-                    )
+                    type_module_name = "google.protobuf." + camel_to_snake(_type_str) + "_pb2"
 
                 type_factory = _get_type_factory(type_module_name, _type_str)
                 self._add_import_code(type_module_name, _type_str)
@@ -1483,11 +1384,7 @@ class FileDescriptorProtoToCode(BaseP2C):
         # print(DescriptorProto.RESERVED_RANGE_FIELD_NUMBER, file=sys.stderr)
         # print(DescriptorProto.RESERVED_NAME_FIELD_NUMBER, file=sys.stderr)
         self._content_deque.append(
-            "\n\n".join(
-                self._enum(
-                    self._fd.enum_type, [FileDescriptorProto.ENUM_TYPE_FIELD_NUMBER]
-                )
-            )
+            "\n\n".join(self._enum(self._fd.enum_type, [FileDescriptorProto.ENUM_TYPE_FIELD_NUMBER]))
         )
         for index, desc in enumerate(self._fd.message_type):
             self._content_deque.append(
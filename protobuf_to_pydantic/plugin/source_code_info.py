@@ -0,0 +1,135 @@
+"""The index of the source code info of the file, shared by the whole plugin run"""
+
+import copy
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from protobuf_to_pydantic.grpc_types import FileDescriptorProto
+from protobuf_to_pydantic.profiler import profiler
+
+if TYPE_CHECKING:
+    from google.protobuf.descriptor_pb2 import SourceCodeInfo
+
+    from protobuf_to_pydantic.plugin.config import ConfigModel
+
+    Location = SourceCodeInfo.Location
+
+# The max number of the cached file index
+SOURCE_CODE_INFO_INDEX_CACHE_MAXSIZE = 1024
+
+CommentHandler = Callable[[str, str, "ConfigModel"], Tuple[dict, str, str]]
+
+
+def is_default_comment_handler(comment_handler: Optional[CommentHandler]) -> bool:
+    """
+    Whether the comment handler does nothing for the location without comments,
+    i.e. `default_comment_handler` or no comment handler
+    """
+    # The config module imports this module, so it is imported here
+    from protobuf_to_pydantic.plugin.config import default_comment_handler
+
+    return comment_handler is None or comment_handler is default_comment_handler
+
+
+class SourceCodeInfoIndex(object):
+    """
+    The index of the source code info of the file, the key is the tuple of the path.
+    If comment_only is True, only the locations with comments are indexed, it is used
+    when the comment handler does nothing for the location without comments
+    (e.g. `default_comment_handler`), the customized comment handler gets all locations.
+
+    The result of `default_comment_handler` is cached alongside, keyed by the comments
+    and the comment config, so each comment is parsed only once per file.
+    """
+
+    def __init__(self, fd: FileDescriptorProto, comment_only: bool = True) -> None:
+        self.comment_only = comment_only
+        self._location_dict: Dict[Tuple[int, ...], "Location"] = {
+            tuple(location.path): location
+            for location in fd.source_code_info.location
+            if not comment_only
+            or location.leading_comments
+            or location.trailing_comments
+        }
+        self._comment_info_dict: Dict[Tuple[str, str, str, bool], Tuple[dict, str, str]]
+        self._comment_info_dict = {}
+
+    def get(self, path: Tuple[int, ...]) -> Optional["Location"]:
+        return self._location_dict.get(path)
+
+    def __contains__(self, path: Tuple[int, ...]) -> bool:
+        return path in self._location_dict
+
+    def __getitem__(self, path: Tuple[int, ...]) -> "Location":
+        return self._location_dict[path]
+
+    def __len__(self) -> int:
+        return len(self._location_dict)
+
+    def handle_comment(
+        self,
+        comment_handler: CommentHandler,
+        leading_comments: str,
+        trailing_comments: str,
+        config: "ConfigModel",
+    ) -> Tuple[dict, str, str]:
+        """
+        Call the comment_handler, the result of `default_comment_handler` is cached,
+        the customized comment_handler may depend on any config, so it is not cached.
+        """
+        if not is_default_comment_handler(comment_handler):
+            with profiler.phase("comment parsing"):
+                return comment_handler(leading_comments, trailing_comments, config)
+
+        key = (
+            leading_comments,
+            trailing_comments,
+            config.comment_prefix,
+            config.parse_comment,
+        )
+        result = self._comment_info_dict.get(key)
+        if result is None:
+            with profiler.phase("comment parsing"):
+                result = comment_handler(leading_comments, trailing_comments, config)
+            self._comment_info_dict[key] = result
+        comment_info_dict, leading_comments, trailing_comments = result
+        # The comment info dict may be modified by the caller
+        if comment_info_dict:
+            comment_info_dict = copy.deepcopy(comment_info_dict)
+        else:
+            comment_info_dict = {}
+        return comment_info_dict, leading_comments, trailing_comments
+
+
+# Key: (file name, comment_only)
+_index_dict: (
+    "OrderedDict[Tuple[str, bool], Tuple[FileDescriptorProto, SourceCodeInfoIndex]]"
+)
+_index_dict = OrderedDict()
+_index_dict_lock = Lock()
+
+
+def get_source_code_info_index(
+    fd: FileDescriptorProto, comment_only: bool = True
+) -> SourceCodeInfoIndex:
+    """
+    Return the index of the fd, the index is built only once per file in the plugin run.
+
+    The index is cached by the file name and comment_only, and is rebuilt if the fd
+    is not the same object (e.g. the fd of another request).
+    """
+    key = (fd.name, comment_only)
+    with _index_dict_lock:
+        item = _index_dict.get(key)
+        if item is not None and item[0] is fd:
+            _index_dict.move_to_end(key)
+            return item[1]
+
+    index = SourceCodeInfoIndex(fd, comment_only=comment_only)
+    with _index_dict_lock:
+        _index_dict[key] = (fd, index)
+        _index_dict.move_to_end(key)
+        while len(_index_dict) > SOURCE_CODE_INFO_INDEX_CACHE_MAXSIZE:
+            _index_dict.popitem(last=False)
+    return index
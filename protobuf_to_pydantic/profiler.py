@@ -0,0 +1,205 @@
+"""
+Record the time of each phase of the code generation, e.g:
+the descriptor walk, comment parsing, option parsing, code assembly and formatting.
+
+The profiler is disabled by default, it is enabled by the `profile` param of the plugin:
+    protoc -I. --protobuf-to-pydantic_out=profile=1:. example.proto
+or by the `P2P_PROFILE` environment variable for `pydantic_model_to_py_code`:
+    P2P_PROFILE=1 python gen_code.py
+
+The value `1` means that the JSON report is written to stderr, other values are the path of
+the report file, if the path ends with `.folded`, the report is written in the folded stack format,
+which can be converted to a flamegraph by `flamegraph.pl` or speedscope.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+PROFILE_ENV_NAME = "P2P_PROFILE"
+# The values that mean the report is written to stderr
+_STDERR_OUTPUT_SET = {"1", "true", "stderr"}
+# The values that mean the profiler is disabled
+_DISABLE_OUTPUT_SET = {"", "0", "false"}
+
+# Key: the stack of the phase names, value: [total seconds, count]
+RecordDict = Dict[Tuple[str, ...], List[Any]]
+
+
+class _NullPhase(object):
+    """The phase used when the profiler is disabled, do nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+
+_null_phase = _NullPhase()
+
+
+class _Phase(object):
+    __slots__ = ("profiler", "name", "stack", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.stack = self.profiler._get_stack()
+        self.stack.append(self.name)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        key = tuple(self.stack)
+        self.stack.pop()
+        self.profiler._add_record(key, elapsed, 1)
+
+
+class Profiler(object):
+    """
+    Record the total time and the call count of each stack of phases.
+
+    The phase entered in another phase is its child, e.g:
+    `("file:demo.proto", "descriptor walk", "comment parsing")`,
+    so the time of the child is also part of the time of its parent.
+    The stack of the phases is kept per thread.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._record_dict: RecordDict = {}
+
+    def _get_stack(self) -> List[str]:
+        stack: Optional[List[str]] = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add_record(self, key: Tuple[str, ...], seconds: float, count: int) -> None:
+        with self._lock:
+            record = self._record_dict.get(key)
+            if record is None:
+                self._record_dict[key] = [seconds, count]
+            else:
+                record[0] += seconds
+                record[1] += count
+
+    def phase(self, name: str) -> Any:
+        """Return the context manager that records the time of the phase"""
+        if not self.enabled:
+            return _null_phase
+        return _Phase(self, name)
+
+    def pop_record_dict(self) -> RecordDict:
+        """Return the records and clear them, e.g: send the records of the worker process to the parent"""
+        with self._lock:
+            record_dict, self._record_dict = self._record_dict, {}
+        return record_dict
+
+    def merge_record_dict(self, record_dict: RecordDict) -> None:
+        for key, (seconds, count) in record_dict.items():
+            self._add_record(key, seconds, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._record_dict = {}
+
+    def get_report(self) -> dict:
+        """
+        Return the report, the `self` time of the phase does not include the time of its children
+        e.g:
+            {
+                "phases": [
+                    {"stack": ["file:demo.proto"], "total": 0.1, "self": 0.02, "count": 1},
+                    {"stack": ["file:demo.proto", "descriptor walk"], "total": 0.08, "self": 0.08, "count": 1},
+                ],
+                "total": 0.1
+            }
+        """
+        with self._lock:
+            record_dict = dict(self._record_dict)
+        child_seconds_dict: Dict[Tuple[str, ...], float] = {}
+        for key, (seconds, _) in record_dict.items():
+            if len(key) > 1:
+                child_seconds_dict[key[:-1]] = (
+                    child_seconds_dict.get(key[:-1], 0.0) + seconds
+                )
+        phase_list = [
+            {
+                "stack": list(key),
+                "total": seconds,
+                "self": max(seconds - child_seconds_dict.get(key, 0.0), 0.0),
+                "count": count,
+            }
+            for key, (seconds, count) in sorted(record_dict.items())
+        ]
+        return {
+            "phases": phase_list,
+            "total": sum(
+                seconds for key, (seconds, _) in record_dict.items() if len(key) == 1
+            ),
+        }
+
+    def get_folded_report(self) -> str:
+        """Return the report in the folded stack format, the value is the self time in microseconds"""
+        return "\n".join(
+            f"{';'.join(phase['stack'])} {round(phase['self'] * 1_000_000)}"
+            for phase in self.get_report()["phases"]
+        )
+
+    def dump(self, output: str) -> None:
+        """Write the report to stderr or the file of the output"""
+        if output.lower() in _STDERR_OUTPUT_SET:
+            print(json.dumps(self.get_report(), indent=2), file=sys.stderr)
+            return
+        if output.endswith(".folded"):
+            content = self.get_folded_report() + "\n"
+        else:
+            content = json.dumps(self.get_report(), indent=2)
+        with open(output, "w") as f:
+            f.write(content)
+        print(f"Write profile report to {output}", file=sys.stderr)
+
+
+def get_profile_output(output: Optional[str] = None) -> str:
+    """Return the output of the report, if output is None, get it from the `P2P_PROFILE` environment variable,
+    an empty string means the profiler is disabled"""
+    if output is None:
+        output = os.environ.get(PROFILE_ENV_NAME, "")
+    output = output.strip()
+    if output.lower() in _DISABLE_OUTPUT_SET:
+        return ""
+    return output
+
+
+profiler = Profiler()
+
+
+@contextmanager
+def profile_in_ctx(output: str, name: str) -> Generator[None, None, None]:
+    """Enable the profiler in the context, and write the report when exiting the context.
+    If output is empty, do nothing"""
+    if not output or profiler.enabled:
+        # The profiler is disabled, or the report is written by the outer context
+        with profiler.phase(name):
+            yield
+        return
+    profiler.enabled = True
+    try:
+        with profiler.phase(name):
+            yield
+    finally:
+        profiler.enabled = False
+        profiler.dump(output)
+        profiler.clear()
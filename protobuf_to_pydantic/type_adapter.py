@@ -0,0 +1,153 @@
+"""The cached `TypeAdapter` of the types, and the batch validation based on them."""
+
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Type, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import ErrorDetails, from_json, to_json
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TypeAdapterCache(object):
+    """
+    The bounded LRU cache of `TypeAdapter` keyed by type,
+    e.g: `List[Model]`, `Dict[str, Model]` or the con type of `customer_con_type`.
+
+    The core schema of each type is built only once (until it is evicted), the type
+    that can not be hashed (e.g: `Annotated` with a list) is not cached.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+        self._type_adapter_dict: "OrderedDict[Any, TypeAdapter]" = OrderedDict()
+
+    def get(self, type_: Any) -> TypeAdapter:
+        try:
+            hash(type_)
+        except TypeError:
+            with self._lock:
+                self._misses += 1
+            return TypeAdapter(type_)
+
+        with self._lock:
+            type_adapter = self._type_adapter_dict.get(type_)
+            if type_adapter is not None:
+                self._type_adapter_dict.move_to_end(type_)
+                self._hits += 1
+                return type_adapter
+            self._misses += 1
+
+        # Build outside the lock, the other `TypeAdapter` may be got while building
+        type_adapter = TypeAdapter(type_)
+        with self._lock:
+            self._type_adapter_dict[type_] = type_adapter
+            while len(self._type_adapter_dict) > self.maxsize:
+                self._type_adapter_dict.popitem(last=False)
+        return type_adapter
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._type_adapter_dict))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._type_adapter_dict.clear()
+            self._hits = self._misses = 0
+
+
+type_adapter_cache = TypeAdapterCache()
+
+
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    """Return the `TypeAdapter` of the type from the `type_adapter_cache`"""
+    return type_adapter_cache.get(type_)
+
+
+class ValidateManyResult(NamedTuple):
+    # The validated models in the order of the data, the invalid item is None
+    model_list: List[Any]
+    # The errors of the invalid items by their index, the `loc` of the errors
+    # does not include the index
+    error_dict: Dict[int, List[ErrorDetails]]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.error_dict
+
+
+def get_list_type_adapter(model_class: Type[BaseModel]) -> TypeAdapter:
+    """Return the cached `TypeAdapter(List[model_class])`"""
+    return get_type_adapter(List[model_class])  # type: ignore[valid-type]
+
+
+def _get_item_error_list(exc: ValidationError) -> List[ErrorDetails]:
+    """Return the errors of the items, the error of the whole data is raised"""
+    error_list = exc.errors()
+    for error in error_list:
+        if not error["loc"] or not isinstance(error["loc"][0], int):
+            # e.g: the data is not an array, or is not a valid JSON
+            raise exc
+    return error_list
+
+
+def validate_many(
+    model_class: Type[BaseModel],
+    data: Union[Iterable[Any], str, bytes, bytearray],
+    *,
+    strict: Optional[bool] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> ValidateManyResult:
+    """
+    Validate a batch of data into the models of model_class.
+
+    The whole batch is validated by one call of the cached list `TypeAdapter`,
+    if data is a JSON array, it is parsed and validated in the same call.
+    The invalid items do not abort the batch, their errors are collected in
+    `ValidateManyResult.error_dict`, and the remaining items are validated again.
+    """
+    type_adapter = get_list_type_adapter(model_class)
+    is_json = isinstance(data, (str, bytes, bytearray))
+    validate_func: Callable[..., List[Any]] = partial(
+        type_adapter.validate_json if is_json else type_adapter.validate_python,
+        strict=strict,
+        context=context,
+    )
+    if not is_json and not isinstance(data, list):
+        data = list(data)  # type: ignore[arg-type]
+    try:
+        return ValidateManyResult(validate_func(data), {})
+    except ValidationError as e:
+        error_list = _get_item_error_list(e)
+
+    item_list: List[Any] = from_json(data) if is_json else data  # type: ignore
+    error_dict: Dict[int, List[ErrorDetails]] = {}
+    index_list: List[int] = list(range(len(item_list)))
+    while True:
+        for error in error_list:
+            # The index of the error is the index of the remaining items
+            index = index_list[error["loc"][0]]  # type: ignore[index]
+            error["loc"] = error["loc"][1:]
+            error_dict.setdefault(index, []).append(error)
+        index_list = [index for index in index_list if index not in error_dict]
+        remaining_item_list = [item_list[index] for index in index_list]
+        try:
+            # The JSON items are dumped back to be validated in JSON mode again
+            valid_model_list = validate_func(to_json(remaining_item_list) if is_json else remaining_item_list)
+            break
+        except ValidationError as e:
+            error_list = _get_item_error_list(e)
+
+    model_list: List[Any] = [None] * len(item_list)
+    for index, model in zip(index_list, valid_model_list):
+        model_list[index] = model
+    return ValidateManyResult(model_list, error_dict)
@@ -3,41 +3,36 @@ import json
 import logging
 import os
 import re
+import shutil
+import subprocess
 import sys
-from pydantic import AliasGenerator
+import tempfile
 from contextlib import contextmanager
 from dataclasses import MISSING
 from datetime import datetime, timedelta, timezone
-from typing import (
-    TYPE_CHECKING,
-    Any,
-    Callable,
-    Dict,
-    Generator,
-    List,
-    Optional,
-    Set,
-    Tuple,
-    Type,
-    Union,
-)
-
-from pydantic import (
-    BaseConfig,
-    BaseModel,
-    create_model,
-    BeforeValidator,
-    PlainSerializer,
-)
-from typing_extensions import Annotated
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, List, Optional, Set, Tuple, Type, Union
 
+from pydantic import AliasGenerator, BaseConfig, BaseModel, BeforeValidator, PlainSerializer, create_model
+from typing_extensions import Annotated
 
 if TYPE_CHECKING:
     from pydantic.main import Model
     from pydantic.typing import AnyClassMethod
 
 from google.protobuf import struct_pb2
+
 from protobuf_to_pydantic.grpc_types import Duration, ProtobufRepeatedType, Timestamp
+from protobuf_to_pydantic.profiler import profiler
+
+_fast_json_loads: Optional[Callable[[str], Any]]
+try:
+    from orjson import loads as _fast_json_loads
+except ImportError:
+    try:
+        from msgspec.json import decode as _fast_json_loads  # type: ignore
+    except ImportError:
+        _fast_json_loads = None
 
 
 class Timedelta(timedelta):
@@ -140,9 +135,7 @@ def timestamp_serializer(dt: datetime) -> str:
     return iso_str
 
 
-TimestampType = Annotated[
-    datetime, PlainSerializer(timestamp_serializer, return_type=str, when_used="json")
-]
+TimestampType = Annotated[datetime, PlainSerializer(timestamp_serializer, return_type=str, when_used="json")]
 
 
 def value_validator(v: Any) -> Any:
@@ -220,144 +213,375 @@ def replace_protobuf_type_to_python_type(value: Any) -> Any:
         return value
 
 
-def get_dict_from_comment(comment_prefix: str, comment: str) -> dict:
+def _json_loads(content: str) -> Any:
+    """Load the JSON by orjson or msgspec if installed, otherwise by json"""
+    if _fast_json_loads is not None:
+        try:
+            return _fast_json_loads(content)
+        except Exception:
+            # e.g: `NaN` or the big int, they are only supported by json
+            pass
+    return json.loads(content)
+
+
+def _copy_json_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy_json_value(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [_copy_json_value(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _parse_dict_from_comment(comment_prefix: str, comment: str) -> dict:
     _dict: dict = {}
+    prefix = f"{comment_prefix}:"
     try:
         for line in comment.split("\n"):
             if line.startswith("#"):
                 line = line[1:]
             line = line.strip()
-            if not line.startswith(f"{comment_prefix}:"):
+            if not line.startswith(prefix):
                 continue
-            line = line.replace(f"{comment_prefix}:", "")
-            for key, value in json.loads(line.replace("\\\\", "\\")).items():
+            line = line.replace(prefix, "")
+            for key, value in _json_loads(line.replace("\\\\", "\\")).items():
                 if not _dict.get(key):
                     _dict[key] = value
                 else:
                     if not isinstance(value, type(_dict[key])):
-                        raise TypeError(
-                            f"Two different types of values were detected for Key:{key}"
-                        )
+                        raise TypeError(f"Two different types of values were detected for Key:{key}")
                     elif isinstance(value, list):
                         _dict[key].extend(value)
                     elif isinstance(value, dict):
                         _dict[key].update(value)
                     else:
-                        raise TypeError(
-                            f"A key:{key} that does not support merging has been detected"
-                        )
+                        raise TypeError(f"A key:{key} that does not support merging has been detected")
     except Exception as e:
         logging.warning(f"Can not gen dict by desc:{comment}, error: {e}")
     return _dict  # type: ignore
 
 
-def get_pyproject_content(pyproject_file_path: str) -> str:
+def get_dict_from_comment(comment_prefix: str, comment: str) -> dict:
+    """
+    Return the rule dict of the `<comment_prefix>:<json>` lines in the comment.
+
+    The comment is parsed only once for each prefix, the caller gets a copy of the
+    cached dict and can modify it.
+    """
+    if f"{comment_prefix}:" not in comment:
+        return {}
+    return _copy_json_value(_parse_dict_from_comment(comment_prefix, comment))
+
+
+def get_pyproject_file_path(pyproject_file_path: str) -> str:
+    """Return the pyproject file path, if not specified, find it in `sys.path`"""
     if not pyproject_file_path:
         for path in sys.path:
             pyproject_file_path = os.path.join(path, "pyproject.toml")
             if os.path.exists(pyproject_file_path):
                 break
             pyproject_file_path = ""
+    return pyproject_file_path
+
 
+def get_pyproject_content(pyproject_file_path: str) -> str:
+    pyproject_file_path = get_pyproject_file_path(pyproject_file_path)
     if pyproject_file_path:
         with open(pyproject_file_path, "r") as f:
             return "".join(f.readlines())
     return ""
 
 
-# flake8: noqa: C901
-def format_content(content_str: str, pyproject_file_path: str = "") -> str:
-    pyproject_dict: dict = {}
-    toml = None  # type: ignore
+def sort_import(content_str: str) -> str:
+    """
+    A deterministic import sorter without third-party dependencies.
 
-    try:
-        import tomllib as toml  # type: ignore
-    except ImportError:
+    The single-line `import` statements at the top of the module are deduplicated and sorted
+    (`__future__` first, then `import x`, then `from x import y`), and the `from` statements of the same module
+    are merged. The import block ends at the first code line, comment line or statement marked with `isort:skip`,
+    these lines and the lines after them are not changed.
+    """
+    line_list: List[str] = content_str.split("\n")
+    import_index_list: List[int] = []
+    import_module_set: Set[str] = set()
+    from_import_dict: Dict[str, Set[str]] = {}
+    comment_line_list: List[Tuple[bool, str, str]] = []
+    for index, line in enumerate(line_list):
+        stripped_line = line.strip()
+        if not stripped_line:
+            continue
+        if stripped_line.startswith("#") or "isort:skip" in line:
+            # The lines before the import block are kept in place,
+            # and the lines in the import block end it, so they are also kept in place
+            if import_index_list:
+                break
+            continue
+        if line != stripped_line or "(" in line or "\\" in line or ";" in line:
+            break
+        if "#" in line:
+            # The statement with comment (e.g. `# type: ignore`) is not merged
+            module_name = line.split()[1]
+            is_from = line.startswith("from ")
+            if not is_from and not line.startswith("import "):
+                break
+            comment_line_list.append((is_from, module_name, line))
+        elif line.startswith("import "):
+            import_module_set.update(i.strip() for i in line[7:].split(","))
+        elif line.startswith("from ") and " import " in line:
+            module_name, name_str = line[5:].split(" import ", 1)
+            from_import_dict.setdefault(module_name.strip(), set()).update(i.strip() for i in name_str.split(","))
+        else:
+            break
+        import_index_list.append(index)
+
+    if not import_index_list:
+        return content_str
+
+    # sort key: (not `__future__`, is `from` statement, module name, statement)
+    import_line_list: List[Tuple[bool, bool, str, str]] = [
+        (module_name != "__future__", is_from, module_name, line) for is_from, module_name, line in comment_line_list
+    ]
+    import_line_list.extend((True, False, module_name, f"import {module_name}") for module_name in import_module_set)
+    import_line_list.extend(
+        (
+            module_name != "__future__",
+            True,
+            module_name,
+            f"from {module_name} import {', '.join(sorted(name_set))}",
+        )
+        for module_name, name_set in from_import_dict.items()
+    )
+
+    import_index_set: Set[int] = set(import_index_list)
+    first_import_index: int = import_index_list[0]
+    last_import_index: int = import_index_list[-1]
+    new_line_list: List[str] = line_list[:first_import_index]
+    new_line_list.extend(i[-1] for i in sorted(set(import_line_list)))
+    # The blank lines between the import statements are removed
+    new_line_list.extend(
+        line
+        for index, line in enumerate(line_list[first_import_index:], first_import_index)
+        if index not in import_index_set and (index > last_import_index or line.strip())
+    )
+    return "\n".join(new_line_list)
+
+
+class Formatter(object):
+    """
+    Format the generated code, the backend is selected by `[tool.protobuf-to-pydantic.format] backend`:
+        - black(default): use isort, autoflake and black (if installed)
+        - ruff: use `ruff check --fix --select I,F401` and `ruff format`, all contents are formatted in one call
+        - none: do not use any formatter, only sort the import statements by the built-in import sorter
+
+    The pyproject.toml is read and the config of formatters is built only once when the Formatter is created,
+    so the same Formatter can be used to format many contents
+    """
+
+    backend_set: Set[str] = {"black", "ruff", "none"}
+
+    def __init__(self, pyproject_file_path: str = "") -> None:
+        self.pyproject_file_path: str = pyproject_file_path
+        self.pyproject_content: str = get_pyproject_content(pyproject_file_path)
+        self.pyproject_dict: dict = self._load_pyproject_dict(self.pyproject_content)
+        try:
+            self.p2p_format_dict: dict = self.pyproject_dict["tool"]["protobuf-to-pydantic"]["format"]
+        except KeyError:
+            self.p2p_format_dict = {}
+        self.backend: str = self.p2p_format_dict.get("backend", "black")
+        if self.backend not in self.backend_set:
+            raise ValueError(f"Not support format backend:{self.backend}, only support {sorted(self.backend_set)}")
+
+        self._isort_func: Optional[Callable[[str], str]] = None
+        self._autoflake_func: Optional[Callable[[str], str]] = None
+        self._black_func: Optional[Callable[[str], str]] = None
+        self._ruff_cmd_list: List[List[str]] = []
+        if self.backend == "black":
+            self._isort_func = self._init_isort()
+            self._autoflake_func = self._init_autoflake()
+            self._black_func = self._init_black()
+        elif self.backend == "ruff":
+            self._ruff_cmd_list = self._init_ruff()
+
+    @staticmethod
+    def _load_pyproject_dict(pyproject_content: str) -> dict:
+        toml = None  # type: ignore
         try:
-            import toml  # type: ignore
+            import tomllib as toml  # type: ignore
         except ImportError:
-            logging.warning(
-                "The toml module is not installed and the configuration information cannot be obtained through"
-                " pyproject.toml"
-            )
+            try:
+                import toml  # type: ignore
+            except ImportError:
+                logging.warning(
+                    "The toml module is not installed and the configuration information cannot be obtained through"
+                    " pyproject.toml"
+                )
 
-    if toml:
-        pyproject_content = get_pyproject_content(pyproject_file_path)
-        if pyproject_content:
-            pyproject_dict = toml.loads(pyproject_content)
-    try:
-        p2p_format_dict: dict = pyproject_dict["tool"]["protobuf-to-pydantic"]["format"]
-    except KeyError:
-        p2p_format_dict = {}
+        if toml and pyproject_content:
+            return toml.loads(pyproject_content)
+        return {}
 
-    try:
-        import isort  # type: ignore
-    except ImportError:
-        pass
-    else:
-        if p2p_format_dict.get("isort", True):
-            if pyproject_file_path:
-                content_str = isort.code(
-                    content_str, config=isort.Config(settings_file=pyproject_file_path)
-                )
-            else:
-                content_str = isort.code(content_str)
+    def _init_isort(self) -> Optional[Callable[[str], str]]:
+        try:
+            import isort  # type: ignore
+        except ImportError:
+            return None
+        if not self.p2p_format_dict.get("isort", True):
+            return None
+
+        if self.pyproject_file_path:
+            isort_config = isort.Config(settings_file=self.pyproject_file_path)
+            return lambda content_str: isort.code(content_str, config=isort_config)
+        return isort.code
+
+    def _init_autoflake(self) -> Optional[Callable[[str], str]]:
+        try:
+            import autoflake  # type: ignore
+        except ImportError:
+            return None
+        if not self.p2p_format_dict.get("autoflake", True):
+            return None
 
-    try:
-        import autoflake  # type: ignore
-    except ImportError:
-        pass
-    else:
         autoflake_dict: dict = {}
         try:
-            for k, v in pyproject_dict["tool"]["autoflake"].items():
+            param_key_set = inspect.signature(autoflake.fix_code).parameters.keys()
+            for k, v in self.pyproject_dict["tool"]["autoflake"].items():
                 k = k.replace("-", "_")
-                if k not in inspect.signature(autoflake.fix_code).parameters.keys():
+                if k not in param_key_set:
                     continue
                 autoflake_dict[k] = v
-
         except KeyError:
             pass
-        if p2p_format_dict.get("autoflake", True):
-            if autoflake_dict:
-                content_str = autoflake.fix_code(content_str, **autoflake_dict)
-            else:
-                content_str = autoflake.fix_code(content_str)
+        return lambda content_str: autoflake.fix_code(content_str, **autoflake_dict)
+
+    def _init_black(self) -> Optional[Callable[[str], str]]:
+        try:
+            import black  # type: ignore
+        except ImportError:
+            return None
+        if not self.p2p_format_dict.get("black", True):
+            return None
 
-    try:
-        import black  # type: ignore
-    except ImportError:
-        pass
-    else:
         black_config_dict: dict = {}
         try:
-            black_config_dict = {
-                k.replace("-", "_"): v
-                for k, v in pyproject_dict["tool"]["black"].items()
-            }
+            black_config_dict = {k.replace("-", "_"): v for k, v in self.pyproject_dict["tool"]["black"].items()}
             # target_version param replace
             target_versions = {
-                getattr(black.TargetVersion, i.upper())
-                for i in black_config_dict.pop("target_version", [])
+                getattr(black.TargetVersion, i.upper()) for i in black_config_dict.pop("target_version", [])
             }
             if target_versions:
                 black_config_dict["target_versions"] = target_versions
 
-            black_config_dict = {
-                k: v
-                for k, v in black_config_dict.items()
-                if k in black.Mode.__annotations__
-            }
+            black_config_dict = {k: v for k, v in black_config_dict.items() if k in black.Mode.__annotations__}
         except KeyError:
             pass
-        if p2p_format_dict.get("black", True):
-            if black_config_dict:
-                content_str = black.format_str(
-                    content_str, mode=black.Mode(**black_config_dict)
-                )
-            else:
-                content_str = black.format_str(content_str, mode=black.Mode())
-    return content_str
+        mode = black.Mode(**black_config_dict)
+        return lambda content_str: black.format_str(content_str, mode=mode)
+
+    def _init_ruff(self) -> List[List[str]]:
+        try:
+            from ruff.__main__ import find_ruff_bin  # type: ignore
+
+            ruff_bin: Optional[str] = find_ruff_bin()
+        except (ImportError, FileNotFoundError):
+            ruff_bin = shutil.which("ruff")
+        if not ruff_bin:
+            logging.warning(
+                "The ruff is not installed, only the import statements are sorted by the built-in import sorter"
+            )
+            return []
+
+        pyproject_file_path = get_pyproject_file_path(self.pyproject_file_path)
+        if pyproject_file_path and "ruff" in self.pyproject_dict.get("tool", {}):
+            config_arg_list = ["--config", pyproject_file_path]
+        else:
+            # Do not use the config of the temp dir's parents, but keep the line length same as black
+            config_arg_list = ["--isolated"]
+            line_length = self.pyproject_dict.get("tool", {}).get("black", {}).get("line-length")
+            if line_length:
+                config_arg_list.extend(["--line-length", str(line_length)])
+
+        cmd_list: List[List[str]] = []
+        select_list: List[str] = []
+        if self.p2p_format_dict.get("isort", True):
+            select_list.append("I")
+        if self.p2p_format_dict.get("autoflake", True):
+            select_list.append("F401")
+        if select_list:
+            cmd_list.append(
+                [
+                    ruff_bin,
+                    "check",
+                    "--fix",
+                    "--quiet",
+                    "--exit-zero",
+                    "--select",
+                    ",".join(select_list),
+                ]
+                + config_arg_list
+            )
+        if self.p2p_format_dict.get("black", True):
+            cmd_list.append([ruff_bin, "format", "--quiet"] + config_arg_list)
+        return cmd_list
+
+    def _format_by_ruff(self, content_list: List[str]) -> List[str]:
+        with tempfile.TemporaryDirectory(prefix="protobuf_to_pydantic_") as temp_dir:
+            file_path_list: List[str] = []
+            for index, content_str in enumerate(content_list):
+                file_path = os.path.join(temp_dir, f"p2p_{index}.py")
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(content_str)
+                file_path_list.append(file_path)
+            for cmd in self._ruff_cmd_list:
+                result = subprocess.run(cmd + file_path_list, capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(f"Run {' '.join(cmd)} error:{result.stderr}")
+
+            new_content_list: List[str] = []
+            for file_path in file_path_list:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    new_content_list.append(f.read())
+            return new_content_list
+
+    @property
+    def support_batch(self) -> bool:
+        """If True, formatting the contents in one `format_many` call is faster than formatting them one by one"""
+        return self.backend == "ruff" and bool(self._ruff_cmd_list)
+
+    def format_many(self, content_list: List[str]) -> List[str]:
+        """Format the contents, the ruff backend formats all contents in one call"""
+        if not content_list:
+            return []
+        if self.support_batch:
+            with profiler.phase("ruff"):
+                return self._format_by_ruff(content_list)
+        return [self.format(content_str) for content_str in content_list]
+
+    def format(self, content_str: str) -> str:
+        if self.support_batch:
+            with profiler.phase("ruff"):
+                return self._format_by_ruff([content_str])[0]
+        elif self.backend != "black":
+            with profiler.phase("sort_import"):
+                return sort_import(content_str)
+        for name, format_func in (
+            ("isort", self._isort_func),
+            ("autoflake", self._autoflake_func),
+            ("black", self._black_func),
+        ):
+            if format_func:
+                with profiler.phase(name):
+                    content_str = format_func(content_str)
+        return content_str
+
+
+@lru_cache(maxsize=None)
+def get_formatter(pyproject_file_path: str = "") -> Formatter:
+    """Get the Formatter of the pyproject file, the Formatter is created only once per process"""
+    return Formatter(pyproject_file_path)
+
+
+def format_content(content_str: str, pyproject_file_path: str = "") -> str:
+    return get_formatter(pyproject_file_path).format(content_str)
 
 
 def check_dict_one_of(desc_dict: dict, key_list: List[str]) -> bool:
@@ -367,8 +591,7 @@ def check_dict_one_of(desc_dict: dict, key_list: List[str]) -> bool:
             [
                 desc_dict.get(key, None)
                 for key in key_list
-                if desc_dict.get(key, None)
-                and desc_dict[key].__class__ != MISSING.__class__
+                if desc_dict.get(key, None) and desc_dict[key].__class__ != MISSING.__class__
             ]
         )
         > 1
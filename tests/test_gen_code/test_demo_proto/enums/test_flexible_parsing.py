@@ -7,8 +7,12 @@ Tests the custom enum parsing behavior that allows:
 - Integer values (1)
 """
 
+import sys
+
 import pytest
 from pydantic import ValidationError
+
+from protobuf_to_pydantic import flexible_enum_mixin
 from example.proto_pydanticv2.example.example_proto.demo import enum_types_roundtrip_p2p
 
 
@@ -209,3 +213,77 @@ class TestFlexibleEnumParsing:
         assert json_data["status"] == "ACTIVE"
         assert json_data["priority"] == "HIGH"
         assert json_data["errorCode"] == "ERROR_TIMEOUT"  # Note: camelCase due to alias
+
+    def test_json_string_validation_with_flexible_parsing(self):
+        """Test that names and integers are accepted by validate_json."""
+        model = enum_types_roundtrip_p2p.EnumMessage.model_validate_json(
+            '{"status": "ACTIVE", "priorityList": ["LOW", 3],'
+            ' "statusMap": {"task1": "PENDING", "task2": 4}}'
+        )
+
+        assert model.status == enum_types_roundtrip_p2p.Status.ACTIVE
+        assert model.priority_list == [
+            enum_types_roundtrip_p2p.Priority.LOW,
+            enum_types_roundtrip_p2p.Priority.URGENT,
+        ]
+        assert model.status_map == {
+            "task1": enum_types_roundtrip_p2p.Status.PENDING,
+            "task2": enum_types_roundtrip_p2p.Status.COMPLETED,
+        }
+
+    def test_json_schema(self):
+        """Test that the JSON schema accepts both the names and the integer values."""
+        schema = enum_types_roundtrip_p2p.EnumMessage.model_json_schema()
+
+        status_schema_list = schema["properties"]["status"]["anyOf"]
+        name_list = ["UNKNOWN", "ACTIVE", "INACTIVE", "PENDING", "COMPLETED"]
+        assert {"enum": name_list, "type": "string"} in status_schema_list
+        assert {"$ref": "#/$defs/Status"} in status_schema_list
+
+    def test_invalid_value_error_output(self):
+        """Test that an invalid value reports a single value error."""
+        for value, msg in [
+            (
+                "UNKNOWN_NAME",
+                "Value error, 'UNKNOWN_NAME' is not a valid name for Status",
+            ),
+            (999, "Value error, 999 is not a valid Status"),
+        ]:
+            with pytest.raises(ValidationError) as exc_info:
+                enum_types_roundtrip_p2p.EnumMessage(status=value)
+            error_list = exc_info.value.errors()
+            assert len(error_list) == 1
+            assert error_list[0]["type"] == "value_error"
+            assert error_list[0]["loc"] == ("status",)
+            assert error_list[0]["msg"] == msg
+            assert error_list[0]["input"] == value
+
+    def test_numeric_string_rejected(self):
+        """Test that numeric strings are not accepted as integer values."""
+        with pytest.raises(ValidationError) as exc_info:
+            enum_types_roundtrip_p2p.EnumMessage(status="1")
+        assert "'1' is not a valid name for Status" in str(exc_info.value)
+
+        with pytest.raises(ValidationError):
+            enum_types_roundtrip_p2p.EnumMessage.model_validate_json('{"status": "1"}')
+
+    def test_member_and_int_skip_python_fallback(self):
+        """Test that members and integer values are validated without calling Python."""
+        call_list = []
+
+        def profile(frame, event, arg):
+            if event == "call" and frame.f_code.co_filename == flexible_enum_mixin.__file__:
+                call_list.append(frame.f_code.co_name)
+
+        sys.setprofile(profile)
+        try:
+            enum_types_roundtrip_p2p.EnumMessage(
+                status=enum_types_roundtrip_p2p.Status.ACTIVE, priority=2, priority_list=[1, 3]
+            )
+            enum_types_roundtrip_p2p.EnumMessage.model_validate_json('{"status": 1, "statusMap": {"task": 4}}')
+            assert call_list == []
+
+            enum_types_roundtrip_p2p.EnumMessage(status="ACTIVE")
+            assert call_list == ["fallback"]
+        finally:
+            sys.setprofile(None)
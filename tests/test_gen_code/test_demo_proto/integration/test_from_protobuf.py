@@ -0,0 +1,140 @@
+"""Test converting protobuf messages to the generated models by `from_protobuf`.
+
+The result of `from_protobuf` should be the same as validating the dict of `MessageToDict`,
+except that the bytes fields are kept as raw bytes
+"""
+
+from datetime import timedelta, timezone
+from typing import Type
+
+import pytest
+from google.protobuf import json_format
+from google.protobuf.message import Message
+
+from example.proto_pydanticv2.example.example_proto.demo import (
+    basic_types_roundtrip_p2p,
+    basic_types_roundtrip_pb2,
+    demo_p2p,
+    demo_pb2,
+    enum_types_roundtrip_p2p,
+    enum_types_roundtrip_pb2,
+    well_known_types_roundtrip_p2p,
+    well_known_types_roundtrip_pb2,
+)
+from protobuf_to_pydantic.default_base_model import ProtobufCompatibleBaseModel
+
+
+def _gen_nested_message() -> Message:
+    message = demo_pb2.RepeatedMessage(str_list=["a", "b", "c"], int_list=[1, 2])
+    message.user_list.add(uid="1", user_name="so1n", sex=demo_pb2.SexType.women, height=1.5)
+    return message
+
+
+def _gen_map_message() -> Message:
+    message = demo_pb2.MapMessage(user_flag={"a": True, "b": False})
+    message.user_map["a"].uid = "uid"
+    message.user_map["a"].user_name = "so1n"
+    return message
+
+
+def _gen_enum_message() -> Message:
+    message = enum_types_roundtrip_pb2.ComplexEnumMessage(
+        primary_status=enum_types_roundtrip_pb2.Status.ACTIVE,
+        status_history=[enum_types_roundtrip_pb2.Status.ACTIVE, enum_types_roundtrip_pb2.Status.PENDING],
+        task_priorities={"a": enum_types_roundtrip_pb2.Priority.HIGH},
+        last_error=enum_types_roundtrip_pb2.ErrorCode.ERROR_TIMEOUT,
+    )
+    message.nested.nested_status = enum_types_roundtrip_pb2.Status.INACTIVE
+    message.nested_list.add(nested_priority=enum_types_roundtrip_pb2.Priority.MEDIUM)
+    return message
+
+
+def _gen_well_known_message() -> Message:
+    message = well_known_types_roundtrip_pb2.WellKnownTypesMessage()
+    message.created_at.FromSeconds(1700000000)
+    message.updated_at.FromSeconds(1700000001)
+    message.expires_at.FromSeconds(1700000002)
+    message.timeout.FromTimedelta(timedelta(seconds=3, microseconds=500))
+    message.optional_timestamp.FromSeconds(1)
+    message.event_timestamps.add(seconds=2)
+    message.intervals.add(seconds=-4)
+    message.timestamp_map["a"].FromSeconds(5)
+    message.duration_map["a"].FromSeconds(6)
+    return message
+
+
+message_list = [
+    (demo_p2p.RepeatedMessage, _gen_nested_message()),
+    (demo_p2p.MapMessage, _gen_map_message()),
+    (demo_p2p.OptionalMessage, demo_pb2.OptionalMessage(x="x", name="name", item=demo_pb2.InvoiceItem(name="i"))),
+    (demo_p2p.OptionalMessage, demo_pb2.OptionalMessage(y=1, str_list=["a"], int_map={"a": 1})),
+    (demo_p2p.WithOptionalOneofMsgEntry, demo_pb2.WithOptionalOneofMsgEntry()),
+    (demo_p2p.WithOptionalOneofMsgEntry, demo_pb2.WithOptionalOneofMsgEntry(y=0)),
+    (demo_p2p.WithOptionalEnumMsgEntry, demo_pb2.WithOptionalEnumMsgEntry(enum=demo_pb2.OptionalEnum.BAZ)),
+    (
+        demo_p2p.InvoiceItem,
+        demo_pb2.InvoiceItem(name="a", items=[demo_pb2.InvoiceItem(name="b", items=[demo_pb2.InvoiceItem(name="c")])]),
+    ),
+    (
+        basic_types_roundtrip_p2p.BasicTypesMessage,
+        basic_types_roundtrip_pb2.BasicTypesMessage(
+            int64_field=2**62, uint64_field=2**63, double_field=1.5, string_field="s", optional_int32=0
+        ),
+    ),
+    (enum_types_roundtrip_p2p.ComplexEnumMessage, _gen_enum_message()),
+    (well_known_types_roundtrip_p2p.WellKnownTypesMessage, _gen_well_known_message()),
+]
+
+
+class TestFromProtobuf:
+    @pytest.mark.parametrize("validate", [True, False])
+    @pytest.mark.parametrize("model_class, message", message_list)
+    def test_same_as_message_to_dict(
+        self, model_class: Type[ProtobufCompatibleBaseModel], message: Message, validate: bool
+    ) -> None:
+        expected = model_class.model_validate(json_format.MessageToDict(message, preserving_proto_field_name=True))
+        model = model_class.from_protobuf(message, validate=validate)
+        assert isinstance(model, model_class)
+        assert model.model_dump() == expected.model_dump()
+        assert model.model_dump_json() == expected.model_dump_json()
+        if validate:
+            assert model == expected
+
+    @pytest.mark.parametrize("validate", [True, False])
+    def test_bytes_are_not_base64_encoded(self, validate: bool) -> None:
+        message = basic_types_roundtrip_pb2.BasicTypesMessage(
+            bytes_field=b"\x00\x01", repeated_bytes=[b"a"], int64_field=2**62
+        )
+        model = basic_types_roundtrip_p2p.BasicTypesMessage.from_protobuf(message, validate=validate)
+        assert model.bytes_field == b"\x00\x01"
+        assert model.repeated_bytes == [b"a"]
+        assert model.int64_field == 2**62
+        assert model.to_protobuf(basic_types_roundtrip_pb2.BasicTypesMessage) == message
+
+        # `MessageToDict` encodes the bytes to the base64 string, which is validated as bytes without decoding
+        message_dict = json_format.MessageToDict(message, preserving_proto_field_name=True)
+        assert message_dict["bytes_field"] == "AAE="
+        expected = basic_types_roundtrip_p2p.BasicTypesMessage.model_validate(message_dict)
+        assert expected.bytes_field == b"AAE="
+        assert model.bytes_field != expected.bytes_field
+
+    def test_construct_converts_value(self) -> None:
+        model = enum_types_roundtrip_p2p.ComplexEnumMessage.from_protobuf(_gen_enum_message(), validate=False)
+        assert model.primary_status is enum_types_roundtrip_p2p.Status.ACTIVE
+        assert model.task_priorities["a"] is enum_types_roundtrip_p2p.Priority.HIGH
+        assert isinstance(model.nested, enum_types_roundtrip_p2p.ComplexEnumMessage.NestedEnum)
+
+        model = well_known_types_roundtrip_p2p.WellKnownTypesMessage.from_protobuf(
+            _gen_well_known_message(), validate=False
+        )
+        assert model.created_at.timestamp() == 1700000000
+        assert model.created_at.tzinfo == timezone.utc
+        assert model.timeout == timedelta(seconds=3, microseconds=500)
+
+        model = demo_p2p.RepeatedMessage.from_protobuf(_gen_nested_message(), validate=False)
+        assert model.int_list == {1, 2}
+
+    def test_validate_error(self) -> None:
+        # user_name min_length is 1
+        with pytest.raises(ValueError):
+            demo_p2p.RepeatedMessage.from_protobuf(demo_pb2.RepeatedMessage(user_list=[demo_pb2.UserMessage(uid="1")]))
@@ -0,0 +1,69 @@
+"""Test that the wrap serializers of `ProtobufCompatibleBaseModel` are only kept by the models that need them."""
+
+from typing import Any, List, Optional, Type
+
+from pydantic import BaseModel, field_serializer
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_p2p, enum_types_roundtrip_p2p
+from protobuf_to_pydantic.default_base_model import ProtobufCompatibleBaseModel
+
+
+def get_serializer_name_list(model_class: Type[BaseModel]) -> List[str]:
+    decorators = model_class.__pydantic_decorators__
+    return sorted([*decorators.field_serializers, *decorators.model_serializers])
+
+
+class TestSerializer:
+    def test_generated_model(self) -> None:
+        assert get_serializer_name_list(demo_p2p.MapMessage) == []
+        assert get_serializer_name_list(demo_p2p.InvoiceItem) == []
+        assert get_serializer_name_list(demo_p2p.UserMessage) == ["_serialize_enums"]
+        assert get_serializer_name_list(demo_p2p.WithOptionalEnumMsgEntry) == ["_serialize_enums"]
+        assert get_serializer_name_list(demo_p2p.OptionalMessage) == ["serialize_model"]
+        assert get_serializer_name_list(ProtobufCompatibleBaseModel) == ["_serialize_enums", "serialize_model"]
+
+    def test_output(self) -> None:
+        assert demo_p2p.UserMessage(uid="1", user_name="a", sex=1).model_dump_json() == (
+            '{"uid":"1","sex":"women","user_name":"a"}'
+        )
+        assert demo_p2p.OptionalMessage(x="x", name="name").model_dump() == {"x": "x", "name": "name"}
+        model = enum_types_roundtrip_p2p.ComplexEnumMessage(primary_status=1, status_history=[1, 2])
+        assert model.model_dump_json() == '{"primary_status":"ACTIVE","status_history":[1,2]}'
+
+    def test_subclass(self) -> None:
+        class ScalarModel(ProtobufCompatibleBaseModel):
+            a: int = 0
+
+        class EnumModel(ScalarModel):
+            sex: Optional[demo_p2p.SexType] = None
+
+        class AnyModel(ProtobufCompatibleBaseModel):
+            value: Any = None
+
+        assert get_serializer_name_list(ScalarModel) == []
+        assert get_serializer_name_list(EnumModel) == ["_serialize_enums"]
+        assert get_serializer_name_list(AnyModel) == ["_serialize_enums"]
+        assert EnumModel(sex=1).model_dump_json() == '{"sex":"women"}'
+        assert AnyModel(value=demo_p2p.SexType.women).model_dump_json() == '{"value":"women"}'
+
+    def test_forward_ref(self) -> None:
+        class ForwardRefModel(ProtobufCompatibleBaseModel):
+            sex: "Optional[LaterEnum]" = None
+
+        class LaterEnum(demo_p2p.SexType.__base__):  # type: ignore
+            man = 0
+
+        ForwardRefModel.model_rebuild(_types_namespace={"LaterEnum": LaterEnum})
+        assert get_serializer_name_list(ForwardRefModel) == ["_serialize_enums"]
+        assert ForwardRefModel(sex=0).model_dump_json() == '{"sex":"man"}'
+
+    def test_overridden_serializer_is_kept(self) -> None:
+        class OverrideModel(ProtobufCompatibleBaseModel):
+            a: int = 0
+
+            @field_serializer("*", when_used="json", mode="wrap")
+            def _serialize_enums(self, value: Any, nxt: Any, info: Any) -> Any:
+                return nxt(value) + 1
+
+        assert get_serializer_name_list(OverrideModel) == ["_serialize_enums"]
+        assert OverrideModel(a=1).model_dump_json() == '{"a":2}'
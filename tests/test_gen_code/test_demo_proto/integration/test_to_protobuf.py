@@ -0,0 +1,48 @@
+"""Test converting the generated models to protobuf messages by `to_protobuf`."""
+
+from typing import Type
+
+import pytest
+from google.protobuf import json_format
+from google.protobuf.message import Message
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_p2p, demo_pb2
+from protobuf_to_pydantic import msg_to_pydantic_model
+from protobuf_to_pydantic.default_base_model import ProtobufCompatibleBaseModel
+from tests.test_gen_code.test_demo_proto.integration.test_from_protobuf import message_list
+
+
+class TestToProtobuf:
+    @pytest.mark.parametrize("model_class, message", message_list)
+    def test_round_trip(self, model_class: Type[ProtobufCompatibleBaseModel], message: Message) -> None:
+        model = model_class.from_protobuf(message)
+        assert model.to_protobuf(type(message)) == message
+
+    @pytest.mark.parametrize("model_class, message", message_list)
+    def test_same_as_parse_dict(self, model_class: Type[ProtobufCompatibleBaseModel], message: Message) -> None:
+        model = model_class.model_validate(json_format.MessageToDict(message, preserving_proto_field_name=True))
+        expected = json_format.ParseDict(model.model_dump(mode="json"), type(message)())
+        assert model.to_protobuf(type(message)) == expected
+
+    def test_oneof(self) -> None:
+        message = demo_p2p.OptionalMessage(y=0).to_protobuf(demo_pb2.OptionalMessage)
+        assert message.WhichOneof("a") == "y"
+        assert demo_p2p.OptionalMessage(x="x").to_protobuf(demo_pb2.OptionalMessage) == demo_pb2.OptionalMessage(x="x")
+
+    def test_unset_field_is_skipped(self) -> None:
+        message = demo_p2p.OptionalMessage(x="x", name=None).to_protobuf(demo_pb2.OptionalMessage)
+        assert not message.HasField("name")
+        assert not message.HasField("item")
+        message = demo_p2p.OptionalMessage(x="x", item=demo_p2p.InvoiceItem()).to_protobuf(demo_pb2.OptionalMessage)
+        assert message.HasField("item")
+
+    def test_runtime_model(self) -> None:
+        model_class = msg_to_pydantic_model(demo_pb2.OptionalMessage, parse_msg_desc_method="ignore")
+        message = demo_pb2.OptionalMessage(x="x", name="name", str_list=["a"], item=demo_pb2.InvoiceItem(name="i"))
+        message_from_model = model_class.from_protobuf(message).to_protobuf()  # type: ignore[attr-defined]
+        assert isinstance(message_from_model, demo_pb2.OptionalMessage)
+        assert message_from_model == message
+
+    def test_message_class_is_required(self) -> None:
+        with pytest.raises(TypeError):
+            demo_p2p.OptionalMessage(x="x").to_protobuf()
@@ -0,0 +1,62 @@
+"""Test validating a batch of data by `validate_many`."""
+
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_p2p, demo_pb2
+from protobuf_to_pydantic import msg_to_pydantic_model
+from protobuf_to_pydantic.type_adapter import get_list_type_adapter, validate_many
+
+data_list = [
+    {"uid": "1", "user_name": "a", "sex": "women"},
+    {"uid": "2", "user_name": ""},
+    {"uid": "3", "user_name": "c", "age": "x"},
+    {"uid": "4", "user_name": "d"},
+]
+
+
+class TestValidateMany:
+    def test_valid_data(self) -> None:
+        result = demo_p2p.UserMessage.validate_many(data_list[:1] + data_list[3:])
+        assert result.is_valid
+        assert result.model_list == [
+            demo_p2p.UserMessage.model_validate(data_list[0]),
+            demo_p2p.UserMessage(uid="4", user_name="d"),
+        ]
+        # Any iterable can be validated
+        assert demo_p2p.UserMessage.validate_many(iter(data_list[:1])).model_list[0].sex == demo_p2p.SexType.women
+
+    @pytest.mark.parametrize("is_json", [True, False])
+    def test_invalid_item(self, is_json: bool) -> None:
+        result = demo_p2p.UserMessage.validate_many(json.dumps(data_list) if is_json else data_list)
+        assert not result.is_valid
+        assert [model and model.uid for model in result.model_list] == ["1", None, None, "4"]
+        assert sorted(result.error_dict) == [1, 2]
+        assert result.error_dict[1][0]["loc"] == ("user_name",)
+        assert result.error_dict[2][0]["loc"] == ("age",)
+
+    def test_invalid_data(self) -> None:
+        with pytest.raises(ValidationError):
+            demo_p2p.UserMessage.validate_many('{"uid": "1"}')
+        with pytest.raises(ValidationError):
+            demo_p2p.UserMessage.validate_many("[")
+
+    def test_json_mode(self) -> None:
+        class DatetimeModel(BaseModel):
+            value: datetime
+
+        # The remaining JSON items are still validated in JSON mode, the datetime string is valid in strict mode
+        json_data = json.dumps([{"value": "2023-11-14T22:13:20Z"}, {"value": []}])
+        result = validate_many(DatetimeModel, json_data, strict=True)
+        assert result.model_list[0].value.timestamp() == 1700000000
+        assert list(result.error_dict) == [1]
+
+    def test_msg_to_pydantic_model(self) -> None:
+        model_class = msg_to_pydantic_model(demo_pb2.UserMessage)
+        result = validate_many(model_class, [{"uid": "1", "user_name": "a"}, {"uid": 1}])
+        assert result.model_list[0] == model_class(uid="1", user_name="a")
+        assert result.model_list[1] is None
+        assert get_list_type_adapter(model_class) is get_list_type_adapter(model_class)
@@ -124,3 +124,19 @@ class TestOneofFieldNaming:
         ts.GetCurrentTime()
         with pytest.raises(ValueError, match="Multiple fields"):
             ReportData.model_validate({"location_value": geo, "time_value": ts})
+
+    def test_oneof_alias_index(self):
+        """Test the alias index built once at class creation."""
+        index = ReportData.__protobuf_oneof_alias_index__
+        assert index["locationValue"] == ("data", "location_value")
+        assert index["location_value"] == ("data", "location_value")
+        # The class without oneof has an empty index and the input is returned as is
+        assert GeoLocation.__protobuf_oneof_alias_index__ == {}
+
+        with pytest.raises(ValueError, match="specified multiple times"):
+            ReportData.model_validate(
+                {"location_value": {"latitude": 1.0}, "locationValue": {"latitude": 1.0}}
+            )
+        # None value is ignored
+        report_data = ReportData.model_validate({"locationValue": None, "location_value": {"latitude": 1.0}})
+        assert report_data.data.data_case == "location_value"
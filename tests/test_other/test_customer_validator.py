@@ -0,0 +1,169 @@
+from datetime import datetime
+from typing import Any
+
+import pytest
+from pydantic import AliasGenerator, BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+from pydantic.alias_generators import to_camel
+from typing_extensions import Annotated
+
+from protobuf_to_pydantic.customer_validator.v2 import (
+    check_one_of,
+    in_validator,
+    not_in_validator,
+    prefix_validator,
+    suffix_validator,
+    timestamp_gt_validator,
+)
+from protobuf_to_pydantic.field_info_rule.protobuf_option_to_field_info.base import get_native_constraint_dict
+from protobuf_to_pydantic.gen_code import P2C
+
+
+class OneOfDemo(BaseModel):
+    model_config = ConfigDict(alias_generator=AliasGenerator(validation_alias=to_camel), populate_by_name=True)
+
+    _one_of_dict = {"demo.OneOfDemo.id": {"fields": {"x_value", "y_value"}, "required": True}}
+
+    x_value: str = ""
+    y_value: int = 0
+    header: str = ""
+
+    one_of_validator = model_validator(mode="before")(check_one_of)
+
+
+class TestCheckOneOf:
+    def test_check_one_of(self) -> None:
+        OneOfDemo(x_value="1")
+        OneOfDemo(yValue=1)
+        # The field name and the alias of the same field are counted once
+        OneOfDemo.model_validate({"x_value": "1", "xValue": "1"})
+        with pytest.raises(ValidationError, match="has 2 value"):
+            OneOfDemo.model_validate({"x_value": "1", "yValue": 1})
+        with pytest.raises(ValidationError, match="must set value"):
+            OneOfDemo(header="1")
+
+    def test_dynamic_one_of_dict(self) -> None:
+        class DynamicDemo(BaseModel):
+            x: str = ""
+            y: str = ""
+
+            one_of_validator = model_validator(mode="before")(check_one_of)
+
+        DynamicDemo(x="1", y="1")
+        # The model created by `msg_to_pydantic_model` sets `_one_of_dict` after the model is created
+        setattr(DynamicDemo, "_one_of_dict", {"demo.DynamicDemo.id": {"fields": {"x", "y"}, "required": False}})
+        with pytest.raises(ValidationError):
+            DynamicDemo(x="1", y="1")
+        DynamicDemo(x="1")
+
+
+class RuleDemo(BaseModel):
+    in_test: Any = Field(default="a", json_schema_extra={"in_": ["a", "b"]})
+    not_in_test: Any = Field(default="a", json_schema_extra={"not_in": ["c"]})
+    prefix_test: str = Field(default="pre", json_schema_extra={"prefix": "pre"})
+    none_test: str = Field(default="", json_schema_extra={"prefix": None})
+    timestamp_test: Any = Field(default=None, json_schema_extra={"timestamp_gt": 1600000000.0})
+
+    in_test_in_validator = field_validator("in_test")(in_validator)
+    not_in_test_not_in_validator = field_validator("not_in_test")(not_in_validator)
+    prefix_test_prefix_validator = field_validator("prefix_test", "none_test")(prefix_validator)
+    timestamp_test_timestamp_gt_validator = field_validator("timestamp_test")(timestamp_gt_validator)
+
+
+class TestRuleValidator:
+    def test_rule_validator(self) -> None:
+        for _ in range(2):
+            RuleDemo(in_test="b", not_in_test="a", prefix_test="prefix", none_test="a")
+            with pytest.raises(ValidationError, match=r"in_test:c must in \['a', 'b'\]"):
+                RuleDemo(in_test="c")
+            with pytest.raises(ValidationError, match=r"not_in_test:c must not in \['c'\]"):
+                RuleDemo(not_in_test="c")
+            with pytest.raises(ValidationError, match="prefix_test does not start with prefix pre"):
+                RuleDemo(prefix_test="a")
+        # The value that can not be hashed is checked by the rule
+        with pytest.raises(ValidationError, match="must in"):
+            RuleDemo(in_test=["a"])
+
+        # The check functions are bound once and cached in the model class
+        check_func_dict = RuleDemo.__dict__["__rule_check_func_dict__"]
+        assert set(check_func_dict) == {
+            ("in_", "in_test"),
+            ("not_in", "not_in_test"),
+            ("prefix", "prefix_test"),
+            ("prefix", "none_test"),
+        }
+
+    def test_timestamp_rule_validator(self) -> None:
+        RuleDemo(timestamp_test=1600000001.0)
+        RuleDemo(timestamp_test=datetime.fromtimestamp(1600000001))
+        with pytest.raises(ValidationError, match="must >"):
+            RuleDemo(timestamp_test=1500000000.0)
+        with pytest.raises(ValidationError, match="must >"):
+            RuleDemo(timestamp_test=datetime.fromtimestamp(1500000000))
+
+
+class TestNativeConstraint:
+    def test_get_native_constraint_dict(self) -> None:
+        assert get_native_constraint_dict("string", "prefix", "a.b", {"prefix": "a.b"}) == {"regex": r"^a\.b"}
+        # `$` of python-re also matches before the trailing newline
+        assert get_native_constraint_dict("string", "suffix", "b", {"suffix": "b"}) is None
+        assert get_native_constraint_dict("string", "contains", "b", {"contains": "b"}) == {"regex": "b"}
+        assert get_native_constraint_dict("bytes", "len", 3, {"len": 3}) == {"min_length": 3, "max_length": 3}
+        assert get_native_constraint_dict("map", "min_pairs", 1, {"min_pairs": 1}) == {"min_length": 1}
+        # Only one pattern can be set for each field
+        assert get_native_constraint_dict("string", "prefix", "a", {"prefix": "a", "suffix": "b"}) is None
+        assert get_native_constraint_dict("string", "prefix", "a", {"prefix": "a", "pattern": "b"}) is None
+        assert get_native_constraint_dict("string", "len", 3, {"len": 3, "min_len": 1}) is None
+        # The pattern of bytes is not supported
+        assert get_native_constraint_dict("bytes", "prefix", b"a", {"prefix": b"a"}) is None
+        assert get_native_constraint_dict("string", "in", ["a"], {"in": ["a"]}) is None
+
+    @pytest.mark.parametrize("regex_engine", ["rust-regex", "python-re"])
+    def test_pattern_semantics(self, regex_engine: Any) -> None:
+        for rule_name, rule_value, value_list, bad_value_list in [
+            ("prefix", "a.b", ["a.b", "a.bc"], ["axb", "ca.b", "\na.b", ""]),
+            ("contains", "[x]", ["[x]", "a[x]b", "[x]\n"], ["x", "[y]"]),
+        ]:
+            pattern = get_native_constraint_dict("string", rule_name, rule_value, {rule_name: rule_value})["regex"]
+
+            class Demo(BaseModel):
+                model_config = ConfigDict(regex_engine=regex_engine)
+
+                value: str = Field(pattern=pattern)
+
+            for value in value_list:
+                Demo(value=value)
+            for value in bad_value_list:
+                with pytest.raises(ValidationError):
+                    Demo(value=value)
+
+    @pytest.mark.parametrize("regex_engine", ["rust-regex", "python-re"])
+    def test_suffix_trailing_newline(self, regex_engine: Any) -> None:
+        # The suffix rule is validated by the Python validator, `$` of python-re matches before the trailing newline
+        assert get_native_constraint_dict("string", "suffix", "a.b", {"suffix": "a.b"}) is None
+
+        class Demo(BaseModel):
+            model_config = ConfigDict(regex_engine=regex_engine)
+
+            value: str = Field(default="", json_schema_extra={"suffix": "a.b"})
+
+            value_suffix_validator = field_validator("value")(suffix_validator)
+
+        Demo(value="ca.b")
+        for value in ["a.b\n", "a.bc", "axb"]:
+            with pytest.raises(ValidationError, match="value does not end with suffix a.b"):
+                Demo(value=value)
+
+    def test_gen_code_of_general_metadata(self) -> None:
+        class SlotMetadata(object):
+            __slots__ = ("pattern", "unknown")
+
+            def __init__(self) -> None:
+                self.pattern = "^a"
+                self.unknown = 1
+
+        class Demo(BaseModel):
+            dict_value: str = Field(default="", pattern="^b")
+            slot_value: Annotated[str, SlotMetadata()] = Field(default="")
+
+        assert P2C()._field_info_handle(Demo.model_fields["dict_value"]) == 'Field(default="", pattern="^b")'
+        assert P2C()._field_info_handle(Demo.model_fields["slot_value"]) == 'Field(default="", pattern="^a")'
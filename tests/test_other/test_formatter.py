@@ -0,0 +1,125 @@
+import pathlib
+import shutil
+
+import pytest
+
+from protobuf_to_pydantic import msg_to_pydantic_model, pydantic_model_to_py_code, pydantic_model_to_py_files
+from protobuf_to_pydantic.util import Formatter, format_content, get_formatter, sort_import
+
+project_path: pathlib.Path = pathlib.Path(__file__).parent.parent.parent
+
+unformatted_content: str = "import typing\nimport os\nfrom os import path\nx = {  'a':37,'b':42}\n"
+
+
+class TestFormatter:
+    def test_formatter_is_shared(self) -> None:
+        pyproject_file_path = str(project_path / "pyproject.toml")
+        assert get_formatter(pyproject_file_path) is get_formatter(pyproject_file_path)
+        assert get_formatter(pyproject_file_path).pyproject_content
+
+    def test_format(self) -> None:
+        pyproject_file_path = str(project_path / "pyproject.toml")
+        content = Formatter(pyproject_file_path).format(unformatted_content)
+        assert content == format_content(unformatted_content, pyproject_file_path=pyproject_file_path)
+        assert content == get_formatter(pyproject_file_path).format(unformatted_content)
+        assert "x = {\"a\": 37, \"b\": 42}" in content
+
+    def test_disable_formatter(self, tmp_path: pathlib.Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text(
+            "[tool.protobuf-to-pydantic.format]\nblack = false\nisort = false\nautoflake = false\n"
+        )
+        assert Formatter(str(pyproject_file)).format(unformatted_content) == unformatted_content
+
+    def test_sort_import(self) -> None:
+        content = (
+            "# head\n"
+            "from b import y\n"
+            "import os\n"
+            "\n"
+            "from __future__ import annotations\n"
+            "import typing, os\n"
+            "from b import x\n"
+            "from c import z  # type: ignore\n"
+            "\n"
+            "\n"
+            "class A:\n"
+            "    import sys\n"
+        )
+        assert sort_import(content) == (
+            "# head\n"
+            "from __future__ import annotations\n"
+            "import os\n"
+            "import typing\n"
+            "from b import x, y\n"
+            "from c import z  # type: ignore\n"
+            "\n"
+            "\n"
+            "class A:\n"
+            "    import sys\n"
+        )
+
+    def test_sort_import_keep_skip_and_comment_line(self) -> None:
+        content = (
+            "import sys  # isort:skip\n"
+            "import typing\n"
+            "import os\n"
+            "from p2p_validate_pb2 import *  # isort:skip\n"
+            "import abc\n"
+            "# comment\n"
+            "import json\n"
+            "\n"
+            "x = 1\n"
+        )
+        assert sort_import(content) == (
+            "import sys  # isort:skip\n"
+            "import os\n"
+            "import typing\n"
+            "from p2p_validate_pb2 import *  # isort:skip\n"
+            "import abc\n"
+            "# comment\n"
+            "import json\n"
+            "\n"
+            "x = 1\n"
+        )
+        comment_content = "import typing\nimport os\n# comment\nimport abc\n"
+        assert sort_import(comment_content) == "import os\nimport typing\n# comment\nimport abc\n"
+
+    def test_none_backend(self, tmp_path: pathlib.Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text('[tool.protobuf-to-pydantic.format]\nbackend = "none"\n')
+        formatter = Formatter(str(pyproject_file))
+        assert formatter.format(unformatted_content) == sort_import(unformatted_content)
+        assert formatter.format_many([unformatted_content]) == [sort_import(unformatted_content)]
+
+    def test_unknown_backend(self, tmp_path: pathlib.Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text('[tool.protobuf-to-pydantic.format]\nbackend = "yapf"\n')
+        with pytest.raises(ValueError):
+            Formatter(str(pyproject_file))
+
+    @pytest.mark.skipif(not shutil.which("ruff"), reason="ruff is not installed")
+    def test_ruff_backend(self, tmp_path: pathlib.Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text('[tool.protobuf-to-pydantic.format]\nbackend = "ruff"\n')
+        formatter = Formatter(str(pyproject_file))
+        content_list = formatter.format_many([unformatted_content, "import sys\nimport os\nos.getcwd()\n"])
+        assert content_list == [
+            'x = {"a": 37, "b": 42}\n',
+            "import os\n\nos.getcwd()\n",
+        ]
+        assert formatter.format(unformatted_content) == content_list[0]
+
+
+class TestBatchFormat:
+    def test_pydantic_model_to_py_files(self, tmp_path: pathlib.Path) -> None:
+        from example.proto_pydanticv2.example.example_proto.demo import alias_demo_pb2, demo_pb2
+
+        file_model_dict = {
+            str(tmp_path / "alias_demo.py"): [msg_to_pydantic_model(alias_demo_pb2.Report)],
+            str(tmp_path / "demo.py"): [msg_to_pydantic_model(demo_pb2.UserMessage)],
+        }
+        pydantic_model_to_py_files(file_model_dict)
+        for filename, model_list in file_model_dict.items():
+            with open(filename) as f:
+                assert f.read() == pydantic_model_to_py_code(*model_list)
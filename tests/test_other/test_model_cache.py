@@ -0,0 +1,204 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Type
+
+import pytest
+from pydantic import BaseModel
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_pb2
+from protobuf_to_pydantic import gen_model, model_cache, msg_to_pydantic_model
+from protobuf_to_pydantic.exceptions import WaitingToCompleteException
+from protobuf_to_pydantic.model_cache import ModelCache
+
+
+class DemoModel(BaseModel):
+    pass
+
+
+class TestModelCache:
+    def test_lru(self) -> None:
+        cache = ModelCache(maxsize=2)
+        cache.get_or_create("a", lambda: DemoModel)
+        cache.get_or_create("b", lambda: DemoModel)
+        assert cache.get_or_create("a", lambda: BaseModel) is DemoModel
+        cache.get_or_create("c", lambda: DemoModel)
+        assert "a" in cache and "b" not in cache and "c" in cache
+        assert cache.cache_info() == (1, 3, 1, 2, 2)
+
+        cache.clear()
+        assert cache.cache_info() == (0, 0, 0, 2, 0)
+
+    def test_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = time.monotonic()
+        monkeypatch.setattr(model_cache.time, "monotonic", lambda: now)
+        cache = ModelCache(ttl=10)
+        cache.get_or_create("a", lambda: DemoModel)
+        assert cache.get("a") is DemoModel
+        now += 10
+        assert cache.get("a") is None
+        assert cache.cache_info().evictions == 1
+
+    def test_invalidate_file(self) -> None:
+        cache = ModelCache()
+        cache.get_or_create("a", lambda: DemoModel, file_name="a.proto")
+        cache.get_or_create("b", lambda: DemoModel, file_name="b.proto")
+        assert cache.invalidate_file("a.proto") == 1
+        assert list(cache) == ["b"]
+
+    def test_recursive_create(self) -> None:
+        cache = ModelCache()
+        with pytest.raises(WaitingToCompleteException):
+            cache.get_or_create("a", lambda: cache.get_or_create("a", lambda: DemoModel))
+        # The failed creation does not block the key
+        assert cache.get_or_create("a", lambda: DemoModel) is DemoModel
+
+    def test_concurrent_create(self) -> None:
+        cache = ModelCache()
+        create_event = threading.Event()
+        create_count = 0
+        result_list: List[Type[BaseModel]] = []
+
+        def create() -> Type[BaseModel]:
+            nonlocal create_count
+            create_count += 1
+            create_event.wait()
+            return DemoModel
+
+        def target() -> None:
+            result_list.append(cache.get_or_create("a", create))
+
+        thread_list = [threading.Thread(target=target) for _ in range(4)]
+        for thread in thread_list:
+            thread.start()
+        time.sleep(0.05)
+        create_event.set()
+        for thread in thread_list:
+            thread.join()
+        assert create_count == 1
+        assert result_list == [DemoModel] * 4
+
+    def test_cross_thread_cycle(self) -> None:
+        cache = ModelCache()
+        barrier = threading.Barrier(2)
+        error_list: List[Any] = []
+
+        def create(other_key: str) -> Type[BaseModel]:
+            barrier.wait()
+            try:
+                cache.get_or_create(other_key, lambda: DemoModel)
+            except WaitingToCompleteException as e:
+                error_list.append(e)
+            return DemoModel
+
+        thread_list = [
+            threading.Thread(target=lambda: cache.get_or_create("a", lambda: create("b"))),
+            threading.Thread(target=lambda: cache.get_or_create("b", lambda: create("a"))),
+        ]
+        for thread in thread_list:
+            thread.start()
+        for thread in thread_list:
+            thread.join(timeout=5)
+        # One of the threads breaks the cycle instead of waiting forever
+        assert not any(thread.is_alive() for thread in thread_list)
+        assert len(error_list) == 1
+
+    def test_msg_to_pydantic_model(self) -> None:
+        cache = ModelCache()
+        model_class = msg_to_pydantic_model(demo_pb2.InvoiceItem2, create_model_cache=cache)
+        assert msg_to_pydantic_model(demo_pb2.InvoiceItem2, create_model_cache=cache) is model_class
+        assert cache.cache_info().hits > 0
+        assert cache.invalidate_file(demo_pb2.DESCRIPTOR.name) > 0
+        assert len(cache) == 0
+        assert msg_to_pydantic_model(demo_pb2.InvoiceItem2, create_model_cache=cache) is not model_class
+
+
+class TestCacheDir:
+    @staticmethod
+    def _load_model(msg: Any, cache_dir: str, monkeypatch: pytest.MonkeyPatch) -> Type[BaseModel]:
+        """Simulate the call after the process restarts"""
+        monkeypatch.setattr(gen_model, "_cache_dir_model_dict", {})
+        return msg_to_pydantic_model(msg, cache_dir=cache_dir)
+
+    def test_cache_dir(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache_dir = str(tmp_path)
+        model_class = msg_to_pydantic_model(demo_pb2.UserMessage, cache_dir=cache_dir)
+        assert len(list(tmp_path.glob("*/*.py"))) == 1
+
+        # The later calls in the same process return the same model
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, cache_dir=cache_dir) is model_class
+
+        # The calls after the process restarts import the model from the cached code
+        cached_model_class = self._load_model(demo_pb2.UserMessage, cache_dir, monkeypatch)
+        assert cached_model_class.__module__.startswith("_p2p_cache_")
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, cache_dir=cache_dir) is cached_model_class
+        assert cached_model_class.model_fields.keys() == model_class.model_fields.keys()
+        assert (
+            cached_model_class(uid="1", user_name="a").model_dump() == model_class(uid="1", user_name="a").model_dump()
+        )
+
+        # The cache key contains the parameters
+        msg_to_pydantic_model(demo_pb2.UserMessage, cache_dir=cache_dir, comment_prefix="aha")
+        assert len(list(tmp_path.glob("*/*.py"))) == 2
+
+    def test_cache_dir_dependency_file_changed(self, tmp_path: Path) -> None:
+        proto_path = tmp_path / "proto"
+        shutil.copytree(
+            Path(__file__).parents[2] / "example" / "example_proto", proto_path / "example" / "example_proto"
+        )
+        cache_dir = tmp_path / "cache"
+        msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=str(proto_path), cache_dir=str(cache_dir))
+        assert len(list(cache_dir.glob("*/*.py"))) == 1
+
+        # The comments of the dependency file are changed, so the cached code is not used
+        dependency_file = proto_path / "example" / "example_proto" / "common" / "single.proto"
+        content = dependency_file.read_text()
+        dependency_file.write_text(
+            content.replace("string earth = 1;", '// p2p: {"min_length": 1}\n  string earth = 1;')
+        )
+        msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=str(proto_path), cache_dir=str(cache_dir))
+        assert len(list(cache_dir.glob("*/*.py"))) == 2
+
+    def test_cache_dir_to_protobuf(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache_dir = str(tmp_path)
+        message = demo_pb2.MapMessage(
+            user_map={"a": demo_pb2.UserMessage(uid="1", age=18, user_name="a")},
+            user_flag={"a": True},
+        )
+        model_class = msg_to_pydantic_model(demo_pb2.MapMessage, cache_dir=cache_dir)
+        cached_model_class = self._load_model(demo_pb2.MapMessage, cache_dir, monkeypatch)
+        assert cached_model_class is not model_class
+        for _model_class in (model_class, cached_model_class):
+            model = _model_class.from_protobuf(message)
+            assert model.to_protobuf() == message
+            # The models of the message fields also know their message
+            assert model.user_map["a"].to_protobuf() == message.user_map["a"]
+
+    def test_cache_dir_one_of(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache_dir = str(tmp_path)
+        message = demo_pb2.WithOptionalOneofMsgEntry(x="1")
+        model_class = msg_to_pydantic_model(demo_pb2.WithOptionalOneofMsgEntry, cache_dir=cache_dir)
+        cached_model_class = self._load_model(demo_pb2.WithOptionalOneofMsgEntry, cache_dir, monkeypatch)
+        assert cached_model_class.__module__.startswith("_p2p_cache_")
+        assert cached_model_class._one_of_dict == model_class._one_of_dict  # type: ignore[attr-defined]
+        for _model_class in (model_class, cached_model_class):
+            assert _model_class.from_protobuf(message).to_protobuf() == message
+            with pytest.raises(ValueError):
+                _model_class(x="1", y=1)
+
+    @pytest.mark.parametrize("msg", [demo_pb2.InvoiceItem, demo_pb2.OptionalMessage])
+    def test_cache_dir_unresolved_ref(self, msg: Any, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        # The self-referencing `InvoiceItem.items` is not resolved, so the code is not cached
+        cache_dir = str(tmp_path)
+        model_class = msg_to_pydantic_model(msg, cache_dir=cache_dir)
+        assert not list(tmp_path.glob("*/*.py"))
+        assert msg_to_pydantic_model(msg, cache_dir=cache_dir) is model_class
+        assert self._load_model(msg, cache_dir, monkeypatch).__module__ == model_class.__module__
+
+        item = demo_pb2.InvoiceItem(name="a", items=[demo_pb2.InvoiceItem(name="b", amount=1)])
+        if msg is demo_pb2.InvoiceItem:
+            message = item
+        else:
+            message = demo_pb2.OptionalMessage(x="1", name="a", item=item, str_list=["a"], int_map={"a": 1})
+        assert model_class.from_protobuf(message).to_protobuf() == message
@@ -0,0 +1,191 @@
+import filecmp
+import pathlib
+import subprocess
+import sys
+from typing import List
+
+import pytest
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest
+from mypy_protobuf.main import Descriptors
+
+from protobuf_to_pydantic.grpc_types import DescriptorProto, FieldDescriptorProto, FileDescriptorProto
+from protobuf_to_pydantic.plugin import cache as cache_module
+from protobuf_to_pydantic.plugin.cache import GenCodeCache
+from protobuf_to_pydantic.plugin.config import ConfigModel
+from protobuf_to_pydantic.plugin.field_desc_proto_to_code import get_relative_module_name
+from protobuf_to_pydantic.plugin.source_code_info import get_source_code_info_index
+
+project_path: pathlib.Path = pathlib.Path(__file__).parent.parent.parent
+
+
+def run_plugin(out_path: pathlib.Path, param: str = "") -> None:
+    out_path.mkdir(parents=True, exist_ok=True)
+    proto_list: List[str] = [
+        str(path.relative_to(project_path))
+        for path in sorted((project_path / "example" / "example_proto" / "demo").glob("*.proto"))
+    ]
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "grpc_tools.protoc",
+            f"--protobuf-to-pydantic_out=config_path=example/plugin_config.py{param}:{out_path}",
+            "-I.",
+            *proto_list,
+        ],
+        cwd=project_path,
+        check=True,
+        capture_output=True,
+    )
+
+
+def assert_same_output(path: pathlib.Path, other_path: pathlib.Path) -> None:
+    file_list = sorted(i.relative_to(path) for i in path.rglob("*.py"))
+    other_file_list = sorted(i.relative_to(other_path) for i in other_path.rglob("*.py"))
+    assert file_list
+    assert file_list == other_file_list
+    for file_path in file_list:
+        assert filecmp.cmp(path / file_path, other_path / file_path, shallow=False)
+
+
+class TestParallelCodeGen:
+    def test_parallel_output_is_same_as_serial(self, tmp_path: pathlib.Path) -> None:
+        serial_path = tmp_path / "serial"
+        parallel_path = tmp_path / "parallel"
+        run_plugin(serial_path)
+        run_plugin(parallel_path, ",parallel=2")
+        assert_same_output(serial_path, parallel_path)
+
+
+class TestGenCodeCache:
+    def test_cached_output_is_same_as_uncached(self, tmp_path: pathlib.Path) -> None:
+        cache_path = tmp_path / "cache"
+        run_plugin(tmp_path / "uncached")
+        run_plugin(tmp_path / "cold", f",cache_dir={cache_path}")
+        cache_file_list = sorted(cache_path.rglob("*.py"))
+        assert cache_file_list
+        run_plugin(tmp_path / "warm", f",cache_dir={cache_path},parallel=2")
+        assert sorted(cache_path.rglob("*.py")) == cache_file_list
+
+        assert_same_output(tmp_path / "uncached", tmp_path / "cold")
+        assert_same_output(tmp_path / "uncached", tmp_path / "warm")
+
+    def test_cache_key(self, tmp_path: pathlib.Path) -> None:
+        dep_fd = FileDescriptorProto(name="dep.proto", package="dep")
+        fd = FileDescriptorProto(name="demo.proto", package="demo", dependency=["dep.proto"])
+        fd_dict = {fd.name: fd, dep_fd.name: dep_fd}
+        config = ConfigModel()
+        key = GenCodeCache(str(tmp_path)).get_key(fd, fd_dict, config)
+
+        # same content, different instance
+        assert GenCodeCache(str(tmp_path)).get_key(fd, fd_dict, ConfigModel()) == key
+        # config changed
+        assert GenCodeCache(str(tmp_path)).get_key(fd, fd_dict, ConfigModel(code_indent=2)) != key
+        # config that is not related to the generated code changed
+        assert GenCodeCache(str(tmp_path)).get_key(fd, fd_dict, ConfigModel(max_workers=4)) == key
+        # transitive dependency changed
+        new_dep_fd = FileDescriptorProto(name="dep.proto", package="dep_v2")
+        assert (
+            GenCodeCache(str(tmp_path)).get_key(fd, {fd.name: fd, new_dep_fd.name: new_dep_fd}, config) != key
+        )
+
+        cache = GenCodeCache(str(tmp_path))
+        assert cache.get(key) is None
+        cache.set(key, "content")
+        assert cache.get(key) == "content"
+
+    def test_cache_key_formatter_version(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        fd = FileDescriptorProto(name="demo.proto", package="demo")
+        config = ConfigModel()
+        key = GenCodeCache(str(tmp_path)).get_key(fd, {fd.name: fd}, config)
+
+        # e.g: the ruff used by the `ruff` format backend is upgraded
+        get_package_version = cache_module._get_package_version
+        monkeypatch.setattr(
+            cache_module,
+            "_get_package_version",
+            lambda name: get_package_version(name) + ("-new" if name == "ruff" else ""),
+        )
+        assert GenCodeCache(str(tmp_path)).get_key(fd, {fd.name: fd}, config) != key
+
+class TestFileDescriptorProtoToCode:
+    def test_config_is_not_modified(self) -> None:
+        fd = FileDescriptorProto(name="demo.proto", package="demo", message_type=[DescriptorProto(name="Demo")])
+        descriptors = Descriptors(CodeGeneratorRequest(file_to_generate=[fd.name], proto_file=[fd]))
+        config = ConfigModel(customer_import_set={"import os"}, customer_deque=["# customer content"])
+
+        content_list = []
+        for _ in range(2):
+            p2c = config.file_descriptor_proto_to_code(fd=fd, descriptors=descriptors, config=config)
+            # The config is shared, not copied for each file
+            assert p2c.config is config
+            content_list.append(p2c.raw_content)
+        assert content_list[0] == content_list[1]
+        assert "import os" in content_list[0] and "# customer content" in content_list[0]
+        assert config.customer_import_set == {"import os"}
+        assert list(config.customer_deque) == ["# customer content"]
+
+    def test_source_code_info_index(self) -> None:
+        fd = FileDescriptorProto(
+            name="index_demo.proto",
+            package="demo",
+            message_type=[
+                DescriptorProto(
+                    name="Demo",
+                    field=[
+                        FieldDescriptorProto(name="a", number=1, type=9, label=1),
+                        FieldDescriptorProto(name="b", number=2, type=9, label=1),
+                    ],
+                )
+            ],
+        )
+        fd.source_code_info.location.add(path=[4, 0], leading_comments=" Demo message\n")
+        fd.source_code_info.location.add(path=[4, 0, 2, 0], trailing_comments=' p2p: {"min_length": 1}\n')
+        fd.source_code_info.location.add(path=[4, 0, 2, 1])
+        descriptors = Descriptors(CodeGeneratorRequest(file_to_generate=[fd.name], proto_file=[fd]))
+        config = ConfigModel()
+
+        index = get_source_code_info_index(fd)
+        # Only the locations with comments are indexed, and the index is built once
+        assert len(index) == 2
+        assert (4, 0, 2, 1) not in index
+        assert get_source_code_info_index(fd) is index
+
+        p2c = config.file_descriptor_proto_to_code(fd=fd, descriptors=descriptors, config=config)
+        assert p2c.source_code_info_by_scl is index
+        assert "Demo message" in p2c.raw_content
+        assert "min_length=1" in p2c.raw_content
+
+        # The cached comment info dict can not be modified by the caller
+        comment_info_dict, _, _ = index.handle_comment(config.comment_handler, "", 'p2p: {"gt": 1}', config)
+        comment_info_dict["gt"] = 2
+        assert index.handle_comment(config.comment_handler, "", 'p2p: {"gt": 1}', config)[0] == {"gt": 1}
+
+    def test_custom_comment_handler_gets_all_locations(self) -> None:
+        fd = FileDescriptorProto(
+            name="custom_handler_demo.proto", package="demo", message_type=[DescriptorProto(name="Demo")]
+        )
+        fd.source_code_info.location.add(path=[4, 0])
+        descriptors = Descriptors(CodeGeneratorRequest(file_to_generate=[fd.name], proto_file=[fd]))
+        comment_list = []
+
+        def comment_handler(leading_comments: str, trailing_comments: str, config: ConfigModel) -> tuple:
+            comment_list.append((leading_comments, trailing_comments))
+            return {}, "Demo message\n", ""
+
+        config = ConfigModel(comment_handler=comment_handler)
+        p2c = config.file_descriptor_proto_to_code(fd=fd, descriptors=descriptors, config=config)
+        assert not p2c.source_code_info_by_scl.comment_only
+        assert comment_list == [("", "")]
+        assert "Demo message" in p2c.raw_content
+        # The index of the default comment handler is compact
+        assert len(get_source_code_info_index(fd)) == 0
+
+    def test_relative_module_name(self) -> None:
+        assert get_relative_module_name("demo/demo.proto", "common/single.proto", "_p2p") == "..common.single_p2p"
+        assert get_relative_module_name("demo/demo.proto", "demo/single.proto", "_p2p") == ".single_p2p"
+        assert get_relative_module_name("a/b/demo.proto", "a/c/single.proto", "_model") == "..c.single_model"
+        # The result is computed once for each pair of files
+        cache_info = get_relative_module_name.cache_info()
+        get_relative_module_name("a/b/demo.proto", "a/c/single.proto", "_model")
+        assert get_relative_module_name.cache_info().hits == cache_info.hits + 1
@@ -0,0 +1,82 @@
+import json
+import pathlib
+
+import pytest
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_pb2
+from protobuf_to_pydantic import msg_to_pydantic_model, pydantic_model_to_py_code
+from protobuf_to_pydantic.profiler import (
+    PROFILE_ENV_NAME,
+    Profiler,
+    get_profile_output,
+    profile_in_ctx,
+    profiler,
+)
+
+
+class TestProfiler:
+    def test_disabled(self) -> None:
+        demo_profiler = Profiler()
+        with demo_profiler.phase("a"):
+            pass
+        assert demo_profiler.get_report() == {"phases": [], "total": 0}
+
+    def test_report(self) -> None:
+        demo_profiler = Profiler(enabled=True)
+        for _ in range(2):
+            with demo_profiler.phase("file"):
+                with demo_profiler.phase("walk"):
+                    pass
+        with demo_profiler.phase("format"):
+            pass
+
+        report = demo_profiler.get_report()
+        assert [phase["stack"] for phase in report["phases"]] == [["file"], ["file", "walk"], ["format"]]
+        file_phase, walk_phase, format_phase = report["phases"]
+        assert file_phase["count"] == walk_phase["count"] == 2
+        assert file_phase["self"] == pytest.approx(file_phase["total"] - walk_phase["total"])
+        assert report["total"] == pytest.approx(file_phase["total"] + format_phase["total"])
+        assert demo_profiler.get_folded_report().splitlines()[1].startswith("file;walk ")
+
+        record_dict = demo_profiler.pop_record_dict()
+        assert demo_profiler.get_report()["phases"] == []
+        demo_profiler.merge_record_dict(record_dict)
+        demo_profiler.merge_record_dict(record_dict)
+        assert demo_profiler.get_report()["phases"][0]["count"] == 4
+
+    def test_get_profile_output(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv(PROFILE_ENV_NAME, raising=False)
+        assert get_profile_output() == ""
+        monkeypatch.setenv(PROFILE_ENV_NAME, "0")
+        assert get_profile_output() == ""
+        monkeypatch.setenv(PROFILE_ENV_NAME, "1")
+        assert get_profile_output() == "1"
+        # The plugin param has a higher priority
+        assert get_profile_output("report.json") == "report.json"
+
+    def test_profile_in_ctx(self, tmp_path: pathlib.Path) -> None:
+        report_path = tmp_path / "report.folded"
+        with profile_in_ctx(str(report_path), "root"):
+            with profiler.phase("child"):
+                pass
+            # The inner context does not write the report
+            with profile_in_ctx(str(tmp_path / "inner.json"), "inner"):
+                pass
+        assert not profiler.enabled
+        assert profiler.get_report()["phases"] == []
+        assert not (tmp_path / "inner.json").exists()
+        assert [line.split(" ")[0] for line in report_path.read_text().splitlines()] == [
+            "root",
+            "root;child",
+            "root;inner",
+        ]
+
+    def test_pydantic_model_to_py_code(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        report_path = tmp_path / "report.json"
+        monkeypatch.setenv(PROFILE_ENV_NAME, str(report_path))
+        content = pydantic_model_to_py_code(msg_to_pydantic_model(demo_pb2.UserMessage))
+        assert "class UserMessage(" in content
+
+        stack_list = [phase["stack"] for phase in json.loads(report_path.read_text())["phases"]]
+        assert ["pydantic_model_to_py_code", "model walk"] in stack_list
+        assert ["pydantic_model_to_py_code", "code assembly"] in stack_list
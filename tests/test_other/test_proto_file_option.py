@@ -0,0 +1,81 @@
+import os
+import pathlib
+
+from protobuf_to_pydantic.get_message_option import from_proto_file
+from protobuf_to_pydantic.get_message_option.from_proto_file import get_message_option_dict_from_proto_file
+
+project_path: pathlib.Path = pathlib.Path(__file__).parent.parent.parent
+
+PROTO_CONTENT = """
+syntax = "proto3";
+package stream_demo;
+
+/* block comment { */
+// p2p: {"oneof:id": {"required": true}}
+message Demo {
+  // p2p: {"ge": 1}
+  int32 age = 1; // p2p: {"le": 10}
+  map<string, int32>tag_map = 2 [(option.demo) = {a: 1}];
+  // p2p: {"required": true}
+  oneof id {
+    // p2p: {"ge": 1}
+    int32 x = 3;
+  }
+  enum State {
+    // p2p: {"ge": 1}
+    ON = 0;
+  }
+  message Nested {
+    // p2p: {"min_length": 1}
+    string name = 1;
+  }
+}
+"""
+
+
+class TestStreamParse:
+    def test_stream_parse(self, tmp_path: pathlib.Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(PROTO_CONTENT)
+        option_dict = get_message_option_dict_from_proto_file(str(proto_file), "p2p", stream=True)
+        assert option_dict["Demo"]["message"] == {"age": {"ge": 1, "le": 10}, "tag_map": {}}
+        assert option_dict["Demo"]["one_of"] == {"stream_demo.Demo.id": {"required": True}}
+        assert option_dict["Demo"]["nested"]["Nested"]["message"] == {"name": {"min_length": 1}}
+
+    def test_same_as_parse(self) -> None:
+        def _get_field_dict(option_dict: dict, prefix: str = "") -> dict:
+            field_dict = {}
+            for message_name, message_option_dict in option_dict.items():
+                for field_name, field_option_dict in message_option_dict["message"].items():
+                    field_dict[f"{prefix}{message_name}.{field_name}"] = field_option_dict
+                field_dict.update(_get_field_dict(message_option_dict["nested"], f"{prefix}{message_name}."))
+            return field_dict
+
+        filename = str(project_path / "example/example_proto/p2p_validate_by_comment/demo.proto")
+        option_dict = get_message_option_dict_from_proto_file(filename, "p2p", stream=False)
+        stream_option_dict = get_message_option_dict_from_proto_file(filename, "p2p", stream=True)
+        assert option_dict.keys() == stream_option_dict.keys()
+        field_dict = _get_field_dict(option_dict)
+        stream_field_dict = _get_field_dict(stream_option_dict)
+        # The field of the message that is declared in the message
+        for key, value in stream_field_dict.items():
+            assert field_dict[key] == value
+
+    def test_cache(self, tmp_path: pathlib.Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(PROTO_CONTENT)
+        option_dict = get_message_option_dict_from_proto_file(str(proto_file), "p2p", stream=True)
+        assert get_message_option_dict_from_proto_file(str(proto_file), "p2p", stream=True) is option_dict
+
+        # The modified file is parsed again
+        proto_file.write_text(PROTO_CONTENT.replace('"ge": 1', '"ge": 2'))
+        stat_result = proto_file.stat()
+        os.utime(proto_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1))
+        new_option_dict = get_message_option_dict_from_proto_file(str(proto_file), "p2p", stream=True)
+        assert new_option_dict["Demo"]["message"]["age"] == {"ge": 2, "le": 10}
+
+        for index in range(from_proto_file.MESSAGE_OPTION_CACHE_MAXSIZE + 1):
+            other_proto_file = tmp_path / f"demo_{index}.proto"
+            other_proto_file.write_text(PROTO_CONTENT)
+            get_message_option_dict_from_proto_file(str(other_proto_file), "p2p", stream=True)
+        assert len(from_proto_file._filename_desc_dict) == from_proto_file.MESSAGE_OPTION_CACHE_MAXSIZE
@@ -0,0 +1,31 @@
+from typing import Dict, List
+
+from typing_extensions import Annotated
+
+from example.proto_pydanticv2.example.example_proto.demo import demo_p2p
+from protobuf_to_pydantic.customer_con_type.v2 import conint
+from protobuf_to_pydantic.type_adapter import TypeAdapterCache
+
+
+class TestTypeAdapterCache:
+    def test_cache(self) -> None:
+        cache = TypeAdapterCache(maxsize=2)
+        type_adapter = cache.get(List[demo_p2p.UserMessage])
+        assert cache.get(List[demo_p2p.UserMessage]) is type_adapter
+        assert cache.get(conint(gt=1)) is cache.get(conint(gt=1))
+        assert cache.cache_info() == (2, 2, 2, 2)
+        assert cache.get(conint(gt=1)).validate_python(2) == 2
+
+        # The least recently used type is evicted
+        cache.get(Dict[str, demo_p2p.UserMessage])
+        assert cache.cache_info().currsize == 2
+        assert cache.get(List[demo_p2p.UserMessage]) is not type_adapter
+
+        cache.cache_clear()
+        assert cache.cache_info() == (0, 0, 2, 0)
+
+    def test_unhashable_type(self) -> None:
+        cache = TypeAdapterCache()
+        unhashable_type = Annotated[int, ["metadata"]]
+        assert cache.get(unhashable_type).validate_python(1) == 1
+        assert cache.cache_info() == (0, 1, 512, 0)
@@ -0,0 +1,38 @@
+import logging
+
+import pytest
+
+from protobuf_to_pydantic import util
+from protobuf_to_pydantic.util import get_dict_from_comment
+
+
+class TestGetDictFromComment:
+    def test_get_dict_from_comment(self) -> None:
+        comment = '# p2p: {"gt": 1}\ndoc\n p2p: {"in": [1]}\np2p: {"in": [2], "extra": {"a": 1}}'
+        assert get_dict_from_comment("p2p", comment) == {"gt": 1, "in": [1, 2], "extra": {"a": 1}}
+        assert get_dict_from_comment("p2p", "doc") == {}
+        assert get_dict_from_comment("aha", comment) == {}
+
+    def test_cache(self) -> None:
+        comment = 'p2p: {"in": [1], "extra": {"a": 1}}'
+        util._parse_dict_from_comment.cache_clear()
+        # The comment without the prefix is not parsed
+        get_dict_from_comment("p2p", "doc")
+        assert util._parse_dict_from_comment.cache_info().currsize == 0
+
+        rule_dict = get_dict_from_comment("p2p", comment)
+        rule_dict["in"].append(2)
+        rule_dict["extra"]["b"] = 2
+        # The cached dict is not modified by the caller
+        assert get_dict_from_comment("p2p", comment) == {"in": [1], "extra": {"a": 1}}
+        assert util._parse_dict_from_comment.cache_info().hits == 1
+
+    def test_json_backend(self) -> None:
+        # The value that is only supported by json
+        assert get_dict_from_comment("p2p", "p2p: {\"gt\": NaN, \"lt\": 18446744073709551616}")["lt"] == 2**64
+        assert get_dict_from_comment("p2p", r'p2p: {"pattern": "^\\\\d+$"}') == {"pattern": r"^\d+$"}
+
+    def test_invalid_comment(self, caplog: pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.WARNING):
+            assert get_dict_from_comment("p2p", 'p2p: {"gt": 1}\np2p: {"gt": 2}\np2p: {') == {"gt": 1}
+        assert "Can not gen dict by desc" in caplog.text
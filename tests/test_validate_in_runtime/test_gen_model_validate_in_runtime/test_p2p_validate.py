@@ -1,3 +1,4 @@
+from functools import partial
 from typing import Callable
 
 from example.proto_pydanticv2.example.example_proto.p2p_validate import demo_pb2 as p2p_demo_pb2
@@ -53,3 +54,20 @@ class TestP2pModelValidator(BaseTestP2pModelValidator):
 
     def test_optional_message(self) -> None:
         self._test_optional_message(p2p_demo_pb2.OptionalMessage)
+
+
+class TestP2pLazyModelValidator(TestP2pModelValidator):
+    # Use a separate cache, so that the models are not shared with the eager mode
+    replace_message_fn: Callable = staticmethod(  # type: ignore
+        partial(msg_to_pydantic_model, lazy=True, create_model_cache={})
+    )
+
+    def test_lazy_model(self) -> None:
+        model_class = self.replace_message_fn(p2p_demo_pb2.NestedMessage, local_dict=local_dict, create_model_cache={})
+        # The nested models are built and resolved on first use
+        assert not model_class.__pydantic_complete__
+        assert all(ref._model is None for ref in model_class._lazy_model_ref_list)
+        model_class.model_rebuild()
+        assert model_class.__pydantic_complete__
+        assert model_class.model_fields["after_refer"].annotation.__name__ == "AfterReferMessage"
+        assert model_class.model_fields["after_refer"].default_factory().age == 0